@@ -3,34 +3,120 @@
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
 
+from .alert_triggers import AlertTriggers
+from .archive import AlertArchive
 from .const import (
+    AWARENESS_LEVEL_ORANGE,
+    AWARENESS_LEVEL_RED,
+    AWARENESS_LEVEL_YELLOW,
     CHMI_FEED_URL,
+    CONF_ARCHIVE,
+    CONF_ARCHIVE_RETENTION,
     CONF_AREA_FILTER,
+    CONF_AREAS,
+    CONF_FEED_URLS,
     CONF_LANGUAGE_FILTER,
+    CONF_LOCATION_LEVELS,
+    CONF_MAX_BODY_SIZE,
+    CONF_REGION,
+    CONF_ZONE,
+    CONF_ZONES,
+    DATA_GEOJSON_VIEW,
+    DATA_TRIGGERS,
+    DEFAULT_ARCHIVE_RETENTION,
+    DEFAULT_MAX_BODY_SIZE,
     DOMAIN,
+    HISTORY_MODE_AGGREGATE,
+    HISTORY_MODE_RECORDS,
+    SERVICE_QUERY_HISTORY,
 )
 from .coordinator import CAPAlertsCoordinator
+from .geojson import CHMIAlertsGeoJSONView
+from .history import summarize
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR]
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.CALENDAR,
+    Platform.GEO_LOCATION,
+    Platform.SENSOR,
+]
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("config_entry_id"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("geocode"): cv.string,
+        vol.Optional("event_type"): cv.string,
+        vol.Optional("awareness_level"): vol.In(
+            [AWARENESS_LEVEL_YELLOW, AWARENESS_LEVEL_ORANGE, AWARENESS_LEVEL_RED]
+        ),
+        vol.Optional("mode", default=HISTORY_MODE_AGGREGATE): vol.In(
+            [HISTORY_MODE_AGGREGATE, HISTORY_MODE_RECORDS]
+        ),
+        vol.Optional("limit", default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up CHMI Alerts from a config entry."""
     area_filter = entry.data.get(CONF_AREA_FILTER)
+    region = entry.data.get(CONF_REGION)
     language_filter = entry.data.get(CONF_LANGUAGE_FILTER)
+    zone = entry.data.get(CONF_ZONE)
+    zones = entry.data.get(CONF_ZONES, [])
+    areas = entry.data.get(CONF_AREAS, [])
+    feed_urls = [CHMI_FEED_URL, *entry.data.get(CONF_FEED_URLS, [])]
+    max_body_size = int(entry.data.get(CONF_MAX_BODY_SIZE, DEFAULT_MAX_BODY_SIZE))
+
+    archive = None
+    if entry.data.get(CONF_ARCHIVE):
+        archive = AlertArchive(
+            Path(hass.config.path(DOMAIN, entry.entry_id)),
+            int(entry.data.get(CONF_ARCHIVE_RETENTION, DEFAULT_ARCHIVE_RETENTION)),
+        )
+        await hass.async_add_executor_job(archive.load)
+
+    # Shared with the trigger platform, automations may attach before setup
+    triggers = hass.data.setdefault(DATA_TRIGGERS, {}).setdefault(
+        entry.entry_id, AlertTriggers()
+    )
 
     coordinator = CAPAlertsCoordinator(
         hass,
-        feed_url=CHMI_FEED_URL,
+        feed_urls=feed_urls,
         area_filter=area_filter,
+        region=region,
         language_filter=language_filter,
+        zone=zone,
+        zones=zones,
+        areas=areas,
+        track_location_levels=bool(entry.data.get(CONF_LOCATION_LEVELS)),
+        archive=archive,
+        triggers=triggers,
+        max_body_size=max_body_size * 1024 * 1024,
     )
 
     # Fetch initial data
@@ -39,14 +125,92 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # Persons move between the hourly updates, coverage of the tracked zones
+    # and persons is re-evaluated whenever their location changes
+    if tracked := [*zones, *([zone] if zone else [])]:
+        entry.async_on_unload(
+            async_track_state_change_event(hass, tracked, coordinator.async_zone_moved)
+        )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if not hass.services.has_service(DOMAIN, SERVICE_QUERY_HISTORY):
+        _async_register_services(hass)
+
+    # Views can not be removed, the view is registered once and serves
+    # the entries loaded at the time of the request
+    if not hass.data.get(DATA_GEOJSON_VIEW):
+        view = hass.data[DATA_GEOJSON_VIEW] = CHMIAlertsGeoJSONView(hass)
+        hass.http.register_view(view)
+
     return True
 
 
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register integration services."""
+
+    async def async_query_history(call: ServiceCall) -> ServiceResponse:
+        """Query archived alerts of a config entry."""
+        entry_id = call.data["config_entry_id"]
+        coordinator: CAPAlertsCoordinator | None = hass.data[DOMAIN].get(entry_id)
+        if coordinator is None or coordinator.archive is None:
+            raise ServiceValidationError(
+                f"Alert archive is not enabled for config entry {entry_id}"
+            )
+
+        start = call.data.get("start")
+        end = call.data.get("end")
+        entries = await hass.async_add_executor_job(
+            coordinator.archive.query,
+            dt_util.as_utc(start) if start else None,
+            dt_util.as_utc(end) if end else None,
+            call.data.get("geocode"),
+            call.data.get("event_type"),
+            call.data.get("awareness_level"),
+        )
+
+        if call.data["mode"] == HISTORY_MODE_AGGREGATE:
+            return summarize(entries)
+
+        offset = call.data["offset"]
+        page = entries[offset : offset + call.data["limit"]]
+        return {
+            "total": len(entries),
+            "offset": offset,
+            "records": [entry.as_dict() for entry in page],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the alert archive of a removed config entry."""
+    archive = AlertArchive(Path(hass.config.path(DOMAIN, entry.entry_id)), 0)
+    await hass.async_add_executor_job(archive.remove)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_QUERY_HISTORY)
+
+        # Triggers attached by automations wait for the reloaded entry, the
+        # trigger platform drops the registry with the last of them
+        all_triggers = hass.data.get(DATA_TRIGGERS, {})
+        if (triggers := all_triggers.get(entry.entry_id)) is not None:
+            if triggers:
+                triggers.async_reset()
+            else:
+                all_triggers.pop(entry.entry_id)
+        if view := hass.data.get(DATA_GEOJSON_VIEW):
+            view.async_forget(entry.entry_id)
 
     return unload_ok
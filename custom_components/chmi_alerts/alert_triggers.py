@@ -0,0 +1,227 @@
+"""Matching of alert changes against automation triggers."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from .awareness import (
+    DEFAULT_EVENT_TYPE,
+    LEVEL_PRIORITY,
+    awareness_level,
+    classify_event_type,
+    event_type_id,
+)
+from .cap_parser import normalize_text
+from .const import TRIGGER_EVENT_ENDED, TRIGGER_EVENT_NEW, TRIGGER_EVENT_UPDATED
+from .lifecycle import MSG_TYPE_UPDATE
+
+if TYPE_CHECKING:
+    from .cap_parser import CAPAlert
+
+InfoKey = tuple[str, int]
+
+
+def actionable_infos(
+    alerts: Iterable[CAPAlert], language_filter: str | None = None
+) -> dict[InfoKey, tuple[CAPAlert, dict[str, Any]]]:
+    """Return actionable info blocks keyed by alert and block position."""
+    infos = {}
+    for alert in alerts:
+        actionable = {
+            id(info) for info in alert.get_actionable_info_blocks(language_filter)
+        }
+        for position, info in enumerate(alert.info):
+            if id(info) in actionable:
+                infos[(alert.identifier, position)] = (alert, info)
+    return infos
+
+
+@dataclass(frozen=True, slots=True)
+class AlertChange:
+    """Info block which appeared in, changed in or disappeared from the alerts."""
+
+    event: str
+    alert: CAPAlert
+    info: dict[str, Any]
+    level: str
+    event_type: str
+    # MeteoAlarm event type identifier, None for unknown events
+    hazard: str | None
+    geocodes: frozenset[str]
+    # Normalized headline, event, description and area names
+    text: str
+    # Block replaced by an Update message
+    previous: AlertChange | None = None
+
+    def same_warning(self, other: AlertChange) -> bool:
+        """Return whether both blocks warn of the same level, type and area."""
+        return (
+            self.level == other.level
+            and self.event_type == other.event_type
+            and self.geocodes == other.geocodes
+        )
+
+    @classmethod
+    def from_info(
+        cls, event: str, alert: CAPAlert, info: dict[str, Any]
+    ) -> AlertChange:
+        """Classify the info block once for all triggers."""
+        areas = info.get("areas", [])
+        event_type = classify_event_type(info.get("event", ""), info.get("parameters"))
+        return cls(
+            event=event,
+            alert=alert,
+            info=info,
+            level=awareness_level(info.get("severity", "")),
+            event_type=event_type or DEFAULT_EVENT_TYPE,
+            hazard=event_type_id(event_type) if event_type else None,
+            geocodes=frozenset(
+                geocode for area in areas for geocode in area.get("geocode", [])
+            ),
+            text=normalize_text(
+                "\n".join(
+                    (
+                        info.get("headline", ""),
+                        info.get("event", ""),
+                        info.get("description", ""),
+                        *(area.get("areaDesc", "") for area in areas),
+                    )
+                )
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AlertTriggerFilter:
+    """Conditions of an automation trigger, empty ones match everything."""
+
+    event: str = TRIGGER_EVENT_NEW
+    # Minimal awareness level
+    level: str | None = None
+    hazards: frozenset[str] = frozenset()
+    locations: frozenset[str] = frozenset()
+    # Normalized keyword searched in the texts of the info block
+    keyword: str | None = None
+
+    def matches(self, change: AlertChange) -> bool:
+        """Return whether the change fires the trigger."""
+        return (
+            change.event == self.event
+            and (
+                self.level is None
+                or LEVEL_PRIORITY[change.level] >= LEVEL_PRIORITY[self.level]
+            )
+            and (not self.hazards or change.hazard in self.hazards)
+            and (not self.locations or not self.locations.isdisjoint(change.geocodes))
+            and (not self.keyword or self.keyword in change.text)
+        )
+
+
+class AlertTriggers:
+    """Automation triggers of a config entry.
+
+    The coordinator passes every new data version, the info blocks which
+    appeared or disappeared since the previous one are classified once and
+    only the actions of the matching triggers are called. The first data
+    only sets the baseline, so alerts active at startup do not fire.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without triggers."""
+        self._triggers: dict[
+            object, tuple[AlertTriggerFilter, Callable[[AlertChange], None]]
+        ] = {}
+        self._infos: dict[InfoKey, tuple[CAPAlert, dict[str, Any]]] | None = None
+
+    def __len__(self) -> int:
+        """Return number of attached triggers."""
+        return len(self._triggers)
+
+    def async_add(
+        self,
+        alert_filter: AlertTriggerFilter,
+        action: Callable[[AlertChange], None],
+    ) -> Callable[[], None]:
+        """Attach a trigger, returns function detaching it."""
+        key = object()
+        self._triggers[key] = (alert_filter, action)
+
+        def remove() -> None:
+            self._triggers.pop(key, None)
+
+        return remove
+
+    def async_reset(self) -> None:
+        """Forget the alerts, the next data only sets the baseline again."""
+        self._infos = None
+
+    def changes(
+        self, alerts: Iterable[CAPAlert], language_filter: str | None = None
+    ) -> list[AlertChange]:
+        """Return info blocks which appeared or disappeared since last call.
+
+        CHMI updates a warning by an Update message with a new identifier
+        referencing the previous one. Its blocks replace the disappeared
+        blocks of the referenced alerts: they are reported as updated, or
+        not at all when the level, type and area did not change.
+        """
+        infos = actionable_infos(alerts, language_filter)
+        previous, self._infos = self._infos, infos
+        if previous is None:
+            return []
+        ended = {
+            key: AlertChange.from_info(TRIGGER_EVENT_ENDED, *value)
+            for key, value in previous.items()
+            if key not in infos
+        }
+        changes = []
+        for key, value in infos.items():
+            if key in previous:
+                continue
+            change = AlertChange.from_info(TRIGGER_EVENT_NEW, *value)
+            replaced = self._replaced(change, ended)
+            if replaced is None:
+                changes.append(change)
+            elif not change.same_warning(replaced):
+                changes.append(
+                    replace(change, event=TRIGGER_EVENT_UPDATED, previous=replaced)
+                )
+        changes.extend(ended.values())
+        return changes
+
+    @staticmethod
+    def _replaced(
+        change: AlertChange, ended: dict[InfoKey, AlertChange]
+    ) -> AlertChange | None:
+        """Remove and return the ended block replaced by the new one.
+
+        Blocks of the referenced alerts are paired by language, preferring
+        the same hazard.
+        """
+        if change.alert.msg_type != MSG_TYPE_UPDATE:
+            return None
+        referenced = {identifier for _, identifier, _ in change.alert.references}
+        language = change.info.get("language")
+        candidates = [
+            key
+            for key, value in ended.items()
+            if key[0] in referenced and value.info.get("language") == language
+        ]
+        if not candidates:
+            return None
+        key = next(
+            (key for key in candidates if ended[key].hazard == change.hazard),
+            candidates[0],
+        )
+        return ended.pop(key)
+
+    def process(
+        self, alerts: Iterable[CAPAlert], language_filter: str | None = None
+    ) -> None:
+        """Call actions of the triggers matching the changes of the alerts."""
+        for change in self.changes(alerts, language_filter):
+            for alert_filter, action in list(self._triggers.values()):
+                if alert_filter.matches(change):
+                    action(change)
@@ -0,0 +1,167 @@
+"""Append-only archive of received CAP alerts."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import re
+import shutil
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from .cap_parser import CAPAlert
+from .history import HistoryEntry, HistoryIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+# One file per month, the file name acts as a coarse time index
+ARCHIVE_FILE_PATTERN = re.compile(r"^alerts-(\d{4})-(\d{2})\.jsonl\.gz$")
+
+
+def _month_key(timestamp: datetime) -> str:
+    """Return archive month of a timestamp."""
+    return f"{timestamp.year:04d}-{timestamp.month:02d}"
+
+
+def _month_end(month: str) -> datetime:
+    """Return the first moment after the given archive month."""
+    year, month_number = (int(part) for part in month.split("-"))
+    if month_number == 12:
+        return datetime(year + 1, 1, 1, tzinfo=UTC)
+    return datetime(year, month_number + 1, 1, tzinfo=UTC)
+
+
+def content_hash(alert: CAPAlert) -> str:
+    """Return stable hash of the alert content."""
+    serialized = json.dumps(alert.data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class AlertArchive:
+    """Append-only history of received alerts.
+
+    Alerts are stored as gzip compressed JSON lines in one file per month of
+    receiving. An alert is appended only when its identifier and content
+    hash combination was not archived yet, so unchanged alerts present in
+    every poll are stored once.
+
+    All methods do blocking file I/O and must be run in the executor.
+    """
+
+    def __init__(self, path: Path, retention_days: int) -> None:
+        """Initialize archive stored in the directory."""
+        self.path = path
+        self.retention = timedelta(days=retention_days)
+        # (identifier, content hash) -> month of archived alerts
+        self._archived: dict[tuple[str, str], str] = {}
+        self.history = HistoryIndex()
+        self._lock = threading.Lock()
+
+    def _file(self, month: str) -> Path:
+        """Return path of the archive file for a month."""
+        return self.path / f"alerts-{month}.jsonl.gz"
+
+    def months(self) -> list[str]:
+        """Return sorted list of archived months."""
+        if not self.path.is_dir():
+            return []
+        return sorted(
+            f"{match.group(1)}-{match.group(2)}"
+            for file in self.path.iterdir()
+            if (match := ARCHIVE_FILE_PATTERN.match(file.name))
+        )
+
+    def load(self, now: datetime | None = None) -> None:
+        """Load archived alerts into the indexes and apply retention."""
+        with self._lock:
+            self._apply_retention(now or datetime.now(UTC))
+            self._archived = {}
+            self.history = HistoryIndex()
+            for month in self.months():
+                for record in self._read_month(month):
+                    self._archived[record["identifier"], record["hash"]] = month
+                    self.history.add(record, month)
+
+    def append(self, alerts: Iterable[CAPAlert], now: datetime | None = None) -> int:
+        """Archive new or changed alerts, returns number of archived alerts."""
+        now = now or datetime.now(UTC)
+        month = _month_key(now)
+        with self._lock:
+            self._apply_retention(now)
+
+            lines = []
+            for alert in alerts:
+                key = (alert.identifier, content_hash(alert))
+                if key in self._archived:
+                    continue
+                self._archived[key] = month
+                record = {
+                    "received": now.isoformat(),
+                    "identifier": key[0],
+                    "hash": key[1],
+                    "data": alert.data,
+                }
+                lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+                self.history.add(record, month)
+
+            if lines:
+                self.path.mkdir(parents=True, exist_ok=True)
+                # Every append adds a new gzip member to the file
+                with gzip.open(self._file(month), "at", encoding="utf-8") as handle:
+                    handle.writelines(lines)
+                _LOGGER.debug("Archived %d alerts", len(lines))
+
+        return len(lines)
+
+    def query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        geocode: str | None = None,
+        event_type: str | None = None,
+        level: str | None = None,
+    ) -> list[HistoryEntry]:
+        """Return archived warnings matching the filters."""
+        with self._lock:
+            return self.history.query(start, end, geocode, event_type, level)
+
+    def remove(self) -> None:
+        """Remove all archive files, used when the config entry is removed."""
+        with self._lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._archived = {}
+            self.history = HistoryIndex()
+
+    def _read_month(self, month: str) -> Iterator[dict[str, Any]]:
+        """Yield all records of an archive file."""
+        try:
+            with gzip.open(self._file(month), "rt", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        _LOGGER.warning(
+                            "Skipping corrupted record in archive %s", month
+                        )
+        except (OSError, EOFError) as err:
+            _LOGGER.warning("Failed to read archive %s: %s", month, err)
+
+    def _apply_retention(self, now: datetime) -> None:
+        """Remove archive files older than the retention period."""
+        cutoff = now - self.retention
+        for month in self.months():
+            if _month_end(month) > cutoff:
+                break
+            _LOGGER.debug("Removing archive %s", month)
+            self._file(month).unlink(missing_ok=True)
+            self.history.remove_month(month)
+            self._archived = {
+                key: archived_month
+                for key, archived_month in self._archived.items()
+                if archived_month != month
+            }
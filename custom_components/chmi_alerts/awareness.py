@@ -0,0 +1,164 @@
+"""MeteoAlarm classification of CAP alerts."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    AWARENESS_LEVEL_GREEN,
+    AWARENESS_LEVEL_ORANGE,
+    AWARENESS_LEVEL_RED,
+    AWARENESS_LEVEL_YELLOW,
+    CISORP_CODE_TO_NAME,
+    EVENT_TYPE_METEOALARM,
+    SEVERITY_TO_AWARENESS,
+)
+
+if TYPE_CHECKING:
+    from .cap_parser import CAPAlert
+
+# Priority order for awareness levels: red > orange > yellow > green
+LEVEL_PRIORITY = {
+    AWARENESS_LEVEL_RED: 4,
+    AWARENESS_LEVEL_ORANGE: 3,
+    AWARENESS_LEVEL_YELLOW: 2,
+    AWARENESS_LEVEL_GREEN: 1,
+}
+
+
+def awareness_level(severity: str) -> str:
+    """Return awareness level of a CAP severity."""
+    return SEVERITY_TO_AWARENESS.get(severity, AWARENESS_LEVEL_GREEN)
+
+
+def event_type_id(event_type: str) -> str:
+    """Return numeric identifier of a MeteoAlarm event type, "1" for "1; Wind"."""
+    return event_type.split(";", 1)[0].strip()
+
+
+def group_by_event_type(
+    alerts: Iterable[CAPAlert], language_filter: str | None = None
+) -> dict[str, list[tuple[CAPAlert, dict[str, Any]]]]:
+    """Group actionable info blocks by MeteoAlarm event type identifier."""
+    groups: dict[str, list[tuple[CAPAlert, dict[str, Any]]]] = {}
+    for alert in alerts:
+        for info in alert.get_actionable_info_blocks(language_filter):
+            info_type = classify_event_type(
+                info.get("event", ""), info.get("parameters")
+            )
+            # Unknown events are not attributed to any hazard
+            if info_type is not None:
+                groups.setdefault(event_type_id(info_type), []).append((alert, info))
+    return groups
+
+
+def location_levels(
+    alerts: Iterable[CAPAlert], language_filter: str | None = None
+) -> dict[str, str]:
+    """Return the highest awareness level of every CISORP location.
+
+    Built in a single pass over the actionable info blocks and their
+    geocodes, locations without a warning are green.
+    """
+    levels = dict.fromkeys(CISORP_CODE_TO_NAME, AWARENESS_LEVEL_GREEN)
+    for alert in alerts:
+        for info in alert.get_actionable_info_blocks(language_filter):
+            level = awareness_level(info.get("severity", ""))
+            priority = LEVEL_PRIORITY[level]
+            for area in info.get("areas", []):
+                for geocode in area.get("geocode", []):
+                    current = levels.get(geocode)
+                    # Other geocodes, such as EMMA_ID, are not locations
+                    if current is not None and LEVEL_PRIORITY[current] < priority:
+                        levels[geocode] = level
+    return levels
+
+
+# Event type shown for unknown events, wind is the most common one and the
+# MeteoAlarm card needs some type to show an icon
+DEFAULT_EVENT_TYPE = "1; Wind"
+
+
+def classify_event_type(  # noqa: C901
+    event: str, parameters: dict[str, str] | None = None
+) -> str | None:
+    """Convert CAP event type to MeteoalarmCard format, None when unknown.
+
+    Returns event in format "N; EventName" where N is the event type ID.
+    First checks if awareness_type is provided in parameters, then falls back
+    to deriving from event text.
+
+    Args:
+        event: Event description text
+        parameters: Optional parameters dict that may contain awareness_type
+
+    Returns:
+        Event type in MeteoalarmCard format (e.g., "6; Low Temperature"),
+        None when neither the parameters nor the event text tell the type
+
+    """
+    # First, check if awareness_type is provided in parameters
+    # Some feeds (like CHMI) provide this directly
+    if parameters and "awareness_type" in parameters:
+        awareness_type = parameters["awareness_type"]
+        # The awareness_type is already in the correct format
+        # e.g., "6; low-temperature" - just capitalize properly
+        if ";" in awareness_type:
+            parts = awareness_type.split(";", 1)
+            if len(parts) == 2:
+                type_id = parts[0].strip()
+                type_name = parts[1].strip()
+                # Capitalize the type name: "low-temperature" -> "Low-Temperature"
+                type_name_formatted = (
+                    type_name.replace("-", " ").title().replace(" ", "-")
+                )
+                return f"{type_id}; {type_name_formatted}"
+
+    # Fall back to deriving from event text
+    if not event:
+        return None
+
+    # Try exact match first
+    if event in EVENT_TYPE_METEOALARM:
+        return EVENT_TYPE_METEOALARM[event]
+
+    # Try partial match (case insensitive)
+    event_lower = event.lower()
+    for key, value in EVENT_TYPE_METEOALARM.items():
+        if key.lower() in event_lower or event_lower in key.lower():
+            return value
+
+    # Fallback based on keywords
+    # NOTE: Order matters - check more specific conditions (rain without flood) before general ones
+    if "flood" in event_lower:
+        # Check flood first since it's more specific
+        return "12; Flooding"
+    if "rain" in event_lower:
+        return "10; Rain"
+    if any(word in event_lower for word in ["wind", "storm", "gale"]):
+        return "1; Wind"
+    if any(word in event_lower for word in ["snow", "ice", "winter"]):
+        return "2; Snow/Ice"
+    if any(word in event_lower for word in ["thunder", "lightning"]):
+        return "3; Thunderstorm"
+    if "fog" in event_lower:
+        return "4; Fog"
+    if any(word in event_lower for word in ["heat", "hot", "high temp"]):
+        return "5; High Temperature"
+    if any(
+        word in event_lower for word in ["cold", "freeze", "frost", "low temp", "mráz"]
+    ):
+        return "6; Low Temperature"
+    if any(word in event_lower for word in ["coastal", "sea", "tide"]):
+        return "7; Coastal Event"
+    if "fire" in event_lower:
+        return "8; Forest Fire"
+    if any(word in event_lower for word in ["avalanche", "snow slide"]):
+        return "9; Avalanches"
+    return None
+
+
+def meteoalarm_event_type(event: str, parameters: dict[str, str] | None = None) -> str:
+    """Convert CAP event type to MeteoalarmCard format, unknown as wind."""
+    return classify_event_type(event, parameters) or DEFAULT_EVENT_TYPE
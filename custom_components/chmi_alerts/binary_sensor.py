@@ -5,16 +5,27 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import voluptuous as vol
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .awareness import LEVEL_PRIORITY, meteoalarm_event_type
+from .cap_parser import CAPAlert
 from .const import (
+    ATTR_ALERTS,
     ATTR_AREA,
     ATTR_AWARENESS_LEVEL,
     ATTR_AWARENESS_TYPE,
@@ -26,21 +37,29 @@ from .const import (
     ATTR_EXPIRES,
     ATTR_HEADLINE,
     ATTR_INSTRUCTION,
+    ATTR_LAST_SUCCESSFUL_UPDATE,
     ATTR_RESPONSE_TYPE,
     ATTR_SENDER,
     ATTR_SEVERITY,
+    ATTR_STALE,
     ATTR_URGENCY,
+    ATTRIBUTE_MODE_COMPACT,
+    ATTRIBUTE_MODE_FULL,
     AWARENESS_ICONS,
     AWARENESS_LEVEL_GREEN,
     AWARENESS_LEVEL_METEOALARM,
-    AWARENESS_LEVEL_ORANGE,
-    AWARENESS_LEVEL_RED,
-    AWARENESS_LEVEL_YELLOW,
     CISORP_CODE_TO_NAME,
     CONF_AREA_FILTER,
+    CONF_AREAS,
+    CONF_ATTRIBUTE_MODE,
+    CONF_HAZARD_SENSORS,
+    CONF_REGION,
+    CONF_ZONES,
     DOMAIN,
     ENTITY_NAME_TRANSLATIONS,
-    EVENT_TYPE_METEOALARM,
+    HAZARD_TYPES,
+    REGION_CODE_TO_NAME,
+    SERVICE_GET_ALERT_DETAILS,
     SEVERITY_TO_AWARENESS,
 )
 from .coordinator import CAPAlertsCoordinator
@@ -56,8 +75,31 @@ async def async_setup_entry(
     """Set up CHMI Alerts binary sensor from a config entry."""
     coordinator: CAPAlertsCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Create a binary sensor
-    async_add_entities([CAPAlertsBinarySensor(coordinator, entry)])
+    # Create a binary sensor for the entry, one for each tracked area and zone
+    # and optionally one for each hazard type
+    entities = [CAPAlertsBinarySensor(coordinator, entry)]
+    entities.extend(
+        CAPAlertsBinarySensor(coordinator, entry, area=area)
+        for area in entry.data.get(CONF_AREAS, [])
+    )
+    entities.extend(
+        CAPAlertsBinarySensor(coordinator, entry, zone=zone)
+        for zone in entry.data.get(CONF_ZONES, [])
+    )
+    if entry.data.get(CONF_HAZARD_SENSORS):
+        entities.extend(
+            CAPAlertsBinarySensor(coordinator, entry, hazard=hazard)
+            for hazard in HAZARD_TYPES
+        )
+    async_add_entities(entities)
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_GET_ALERT_DETAILS,
+        {vol.Optional("identifier"): cv.string},
+        "async_get_alert_details",
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 class CAPAlertsBinarySensor(
@@ -67,41 +109,85 @@ class CAPAlertsBinarySensor(
 
     _attr_has_entity_name = True
     _attr_device_class = BinarySensorDeviceClass.SAFETY
+    # The alert texts can be large, keep them out of the recorder database
+    _unrecorded_attributes = frozenset({ATTR_ALERTS})
 
-    # Priority order for awareness levels: red > orange > yellow > green
-    _LEVEL_PRIORITY = {
-        AWARENESS_LEVEL_RED: 4,
-        AWARENESS_LEVEL_ORANGE: 3,
-        AWARENESS_LEVEL_YELLOW: 2,
-        AWARENESS_LEVEL_GREEN: 1,
-    }
+    _LEVEL_PRIORITY = LEVEL_PRIORITY
 
     def __init__(
         self,
         coordinator: CAPAlertsCoordinator,
         entry: ConfigEntry,
+        *,
+        area: str | None = None,
+        zone: str | None = None,
+        hazard: str | None = None,
     ) -> None:
-        """Initialize the binary sensor."""
+        """Initialize the binary sensor.
+
+        When area (CISORP code) or zone is given, the sensor shows only alerts
+        covering that area or zone instead of all alerts of the entry. When
+        hazard (MeteoAlarm event type identifier) is given, the sensor shows
+        only warnings of that type.
+        """
         super().__init__(coordinator)
 
         # Get area information from config entry
         area_code = entry.data.get(CONF_AREA_FILTER, "")
         area_name = CISORP_CODE_TO_NAME.get(area_code, "") if area_code else ""
-
-        # Build unique_id - use area code if available for uniqueness
-        if area_code:
+        region = entry.data.get(CONF_REGION, "")
+        if region and not area_name:
+            area_name = REGION_CODE_TO_NAME.get(region, region)
+
+        if area:
+            area_name = CISORP_CODE_TO_NAME.get(area, area)
+        elif zone:
+            zone_state = coordinator.hass.states.get(zone)
+            area_name = zone_state.name if zone_state else zone
+
+        # Build unique_id - use target or area code if available for uniqueness
+        if area:
+            self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_area_{area}"
+        elif zone:
+            self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_{zone}"
+        elif hazard:
+            self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_hazard_{hazard}"
+        elif area_code:
             self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_{area_code}"
+        elif region:
+            self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_region_{region}"
         else:
             self._attr_unique_id = f"{entry.entry_id}_chmi_alerts"
 
         # Use translation key only when no area is specified
         # When area is specified, we'll build the name with location in the name property
-        if not area_name:
+        if not area_name and not hazard:
             self._attr_translation_key = "alert"
 
         # Store area name for use in name property
         self._area_name = area_name
+        self._area = area
+        self._zone = zone
+        self._hazard = hazard
+        self._attribute_mode = entry.data.get(CONF_ATTRIBUTE_MODE, ATTRIBUTE_MODE_FULL)
         self._hass = coordinator.hass
+        self._state_cache: tuple[str, dict[str, Any]] | None = None
+        self._state_cache_version: int | None = None
+        self._last_written_state: tuple[bool, str, dict[str, Any]] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator.
+
+        Skips writing the state when availability, level and attributes are
+        the same as in the last write.
+        """
+        level, attributes = self._get_state()
+        rendered_state = (self.available, level, attributes)
+        if rendered_state == self._last_written_state:
+            return
+        self._last_written_state = rendered_state
+        self.async_write_ha_state()
 
     @property
     def name(self) -> str | None:
@@ -109,118 +195,82 @@ class CAPAlertsBinarySensor(
 
         Returns localized name with location if available.
         """
-        if self._area_name:
-            # Build localized name with area
+        if self._area_name or self._hazard:
+            # Build localized name with hazard and area
             # Get the translated base word for "Alerts"
             language = self._hass.config.language if self._hass else "en"
             base_name = ENTITY_NAME_TRANSLATIONS.get(language, "Alerts")
+            hazard_name = ""
+            if self._hazard:
+                names = HAZARD_TYPES[self._hazard]
+                hazard_name = names.get(language, names["en"])
 
-            return f"{base_name} {self._area_name}"
+            return " ".join(
+                part for part in (base_name, hazard_name, self._area_name) if part
+            )
 
         # Return None to use the default translated name from translation_key
         return None
 
+    @property
+    def _alerts(self) -> list[CAPAlert]:
+        """Return alerts shown by this sensor."""
+        if self._area or self._zone:
+            # Alerts with an info block covering the target, each only once
+            return list(
+                {
+                    id(alert): alert for alert, _info in self._get_actionable_infos()
+                }.values()
+            )
+        return self.coordinator.data or []
+
+    def _get_state(self) -> tuple[str, dict[str, Any]]:
+        """Return the highest awareness level and the state attributes.
+
+        Both are computed once per coordinator data version and reused for
+        all reads until the coordinator publishes new data.
+        """
+        data_version = self.coordinator.data_version
+        if self._state_cache is None or self._state_cache_version != data_version:
+            attributes = self._compute_state_attributes()
+            if self.coordinator.stale:
+                # Fetching failed, the alerts are from the last good fetch
+                attributes[ATTR_STALE] = True
+                attributes[ATTR_LAST_SUCCESSFUL_UPDATE] = (
+                    self.coordinator.last_success.isoformat()
+                )
+            self._state_cache = (self._compute_highest_awareness_level(), attributes)
+            self._state_cache_version = data_version
+        return self._state_cache
+
     def _get_highest_awareness_level(self) -> str:
         """Get the highest awareness level from active alerts."""
-        if not self.coordinator.data:
+        return self._get_state()[0]
+
+    def _compute_highest_awareness_level(self) -> str:
+        """Compute the highest awareness level from active alerts."""
+        if not self._alerts:
             return AWARENESS_LEVEL_GREEN
 
         highest_level = AWARENESS_LEVEL_GREEN
         highest_priority = 0
 
         # Check all actionable info blocks from all alerts
-        for alert in self.coordinator.data:
-            actionable_infos = alert.get_actionable_info_blocks(
-                self.coordinator.language_filter
-            )
-            for info in actionable_infos:
-                severity = info.get("severity", "")
-                awareness = SEVERITY_TO_AWARENESS.get(severity, AWARENESS_LEVEL_GREEN)
-                priority = self._LEVEL_PRIORITY.get(awareness, 0)
-                if priority > highest_priority:
-                    highest_priority = priority
-                    highest_level = awareness
+        for _alert, info in self._get_actionable_infos():
+            severity = info.get("severity", "")
+            awareness = SEVERITY_TO_AWARENESS.get(severity, AWARENESS_LEVEL_GREEN)
+            priority = self._LEVEL_PRIORITY.get(awareness, 0)
+            if priority > highest_priority:
+                highest_priority = priority
+                highest_level = awareness
 
         return highest_level
 
     def _get_meteoalarm_event_type(
         self, event: str, parameters: dict[str, str] | None = None
     ) -> str:
-        """Convert CAP event type to MeteoalarmCard format.
-
-        Returns event in format "N; EventName" where N is the event type ID.
-        First checks if awareness_type is provided in parameters, then falls back
-        to deriving from event text.
-
-        Args:
-            event: Event description text
-            parameters: Optional parameters dict that may contain awareness_type
-
-        Returns:
-            Event type in MeteoalarmCard format (e.g., "6; Low Temperature")
-
-        """
-        # First, check if awareness_type is provided in parameters
-        # Some feeds (like CHMI) provide this directly
-        if parameters and "awareness_type" in parameters:
-            awareness_type = parameters["awareness_type"]
-            # The awareness_type is already in the correct format
-            # e.g., "6; low-temperature" - just capitalize properly
-            if ";" in awareness_type:
-                parts = awareness_type.split(";", 1)
-                if len(parts) == 2:
-                    type_id = parts[0].strip()
-                    type_name = parts[1].strip()
-                    # Capitalize the type name: "low-temperature" -> "Low-Temperature"
-                    type_name_formatted = (
-                        type_name.replace("-", " ").title().replace(" ", "-")
-                    )
-                    return f"{type_id}; {type_name_formatted}"
-
-        # Fall back to deriving from event text
-        if not event:
-            return "1; Wind"  # Default fallback
-
-        # Try exact match first
-        if event in EVENT_TYPE_METEOALARM:
-            return EVENT_TYPE_METEOALARM[event]
-
-        # Try partial match (case insensitive)
-        event_lower = event.lower()
-        for key, value in EVENT_TYPE_METEOALARM.items():
-            if key.lower() in event_lower or event_lower in key.lower():
-                return value
-
-        # Fallback based on keywords
-        # NOTE: Order matters - check more specific conditions (rain without flood) before general ones
-        if "flood" in event_lower:
-            # Check flood first since it's more specific
-            return "12; Flooding"
-        if "rain" in event_lower:
-            return "10; Rain"
-        if any(word in event_lower for word in ["wind", "storm", "gale"]):
-            return "1; Wind"
-        if any(word in event_lower for word in ["snow", "ice", "winter"]):
-            return "2; Snow/Ice"
-        if any(word in event_lower for word in ["thunder", "lightning"]):
-            return "3; Thunderstorm"
-        if "fog" in event_lower:
-            return "4; Fog"
-        if any(word in event_lower for word in ["heat", "hot", "high temp"]):
-            return "5; High Temperature"
-        if any(
-            word in event_lower
-            for word in ["cold", "freeze", "frost", "low temp", "mráz"]
-        ):
-            return "6; Low Temperature"
-        if any(word in event_lower for word in ["coastal", "sea", "tide"]):
-            return "7; Coastal Event"
-        if "fire" in event_lower:
-            return "8; Forest Fire"
-        if any(word in event_lower for word in ["avalanche", "snow slide"]):
-            return "9; Avalanches"
-        # Generic fallback - use wind as most common
-        return "1; Wind"
+        """Convert CAP event type to MeteoalarmCard format."""
+        return meteoalarm_event_type(event, parameters)
 
     @property
     def is_on(self) -> bool:
@@ -234,10 +284,109 @@ class CAPAlertsBinarySensor(
         awareness_level = self._get_highest_awareness_level()
         return AWARENESS_ICONS.get(awareness_level, "mdi:alert")
 
+    def _get_actionable_infos(self) -> list[tuple[CAPAlert, dict[str, Any]]]:
+        """Collect all actionable info blocks from all alerts.
+
+        This handles cases where a single alert has multiple info blocks
+        representing different weather phenomena. Hazard sensors use only
+        the blocks of their event type, area and zone sensors only the blocks
+        with an area covering the location or zone.
+        """
+        if self._hazard:
+            return self.coordinator.hazard_infos.get(self._hazard, [])
+        if self._area:
+            return self.coordinator.area_infos.get(self._area, [])
+        if self._zone:
+            return self.coordinator.zone_infos.get(self._zone, [])
+        all_actionable_infos = []
+        for alert in self._alerts:
+            actionable_infos = alert.get_actionable_info_blocks(
+                self.coordinator.language_filter
+            )
+            all_actionable_infos.extend((alert, info) for info in actionable_infos)
+        return all_actionable_infos
+
+    def _build_compact_alert_details(
+        self, alert: CAPAlert, info: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Build alert identifier, level and type for the compact attributes."""
+        severity = info.get("severity", "")
+        awareness_level = SEVERITY_TO_AWARENESS.get(severity, AWARENESS_LEVEL_GREEN)
+        return {
+            "identifier": alert.identifier,
+            ATTR_AWARENESS_LEVEL: AWARENESS_LEVEL_METEOALARM[awareness_level],
+            ATTR_AWARENESS_TYPE: self._get_meteoalarm_event_type(
+                info.get("event", ""), info.get("parameters", {})
+            ),
+        }
+
+    def _build_alert_details(
+        self, alert: CAPAlert, info: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Build full details of an actionable info block."""
+        severity = info.get("severity", "")
+        awareness_level = SEVERITY_TO_AWARENESS.get(severity, AWARENESS_LEVEL_GREEN)
+        meteoalarm_level = AWARENESS_LEVEL_METEOALARM[awareness_level]
+
+        # Get parameters and use awareness_type if available
+        parameters = info.get("parameters", {})
+        event = info.get("event", "")
+        meteoalarm_type = self._get_meteoalarm_event_type(event, parameters)
+
+        # Collect area names from this info block
+        area_names = []
+        for area in info.get("areas", []):
+            area_name = area.get("areaDesc", "")
+            if area_name and area_name not in area_names:
+                area_names.append(area_name)
+
+        return {
+            "identifier": alert.identifier,
+            ATTR_HEADLINE: info.get("headline", ""),
+            ATTR_DESCRIPTION: info.get("description", ""),
+            ATTR_SEVERITY: severity,
+            ATTR_URGENCY: info.get("urgency", ""),
+            ATTR_CERTAINTY: info.get("certainty", ""),
+            ATTR_EVENT: event,
+            ATTR_EFFECTIVE: info.get("effective", ""),
+            ATTR_EXPIRES: info.get("expires", ""),
+            ATTR_SENDER: alert.sender,
+            ATTR_INSTRUCTION: info.get("instruction", ""),
+            ATTR_CATEGORY: info.get("category", ""),
+            ATTR_RESPONSE_TYPE: (
+                info.get("responseType", [""])[0]
+                if isinstance(info.get("responseType"), list)
+                else info.get("responseType", "")
+            ),
+            ATTR_AREA: ", ".join(area_names),
+            ATTR_AWARENESS_LEVEL: meteoalarm_level,
+            ATTR_AWARENESS_TYPE: meteoalarm_type,
+        }
+
+    async def async_get_alert_details(
+        self, identifier: str | None = None
+    ) -> ServiceResponse:
+        """Return full details of the active alerts.
+
+        Serves the complete texts which are omitted from the state attributes
+        in the compact attribute mode.
+        """
+        return {
+            "alerts": [
+                self._build_alert_details(alert, info)
+                for alert, info in self._get_actionable_infos()
+                if identifier is None or alert.identifier == identifier
+            ]
+        }
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        if not self.coordinator.data:
+        return self._get_state()[1]
+
+    def _compute_state_attributes(self) -> dict[str, Any]:
+        """Compute additional state attributes."""
+        if not self._alerts:
             return {
                 ATTR_AWARENESS_LEVEL: AWARENESS_LEVEL_METEOALARM[AWARENESS_LEVEL_GREEN],
                 ATTR_AWARENESS_TYPE: None,
@@ -245,15 +394,7 @@ class CAPAlertsBinarySensor(
                 "attribution": "Information provided by MeteoAlarm",
             }
 
-        # Collect all actionable info blocks from all alerts
-        # This handles cases where a single alert has multiple info blocks
-        # representing different weather phenomena
-        all_actionable_infos = []
-        for alert in self.coordinator.data:
-            actionable_infos = alert.get_actionable_info_blocks(
-                self.coordinator.language_filter
-            )
-            all_actionable_infos.extend((alert, info) for info in actionable_infos)
+        all_actionable_infos = self._get_actionable_infos()
 
         # If no actionable alerts, return green status
         if not all_actionable_infos:
@@ -277,47 +418,16 @@ class CAPAlertsBinarySensor(
                 highest_info = info
 
         # Build details for all actionable alerts
-        alerts_details = []
-        for alert, info in all_actionable_infos:
-            severity = info.get("severity", "")
-            awareness_level = SEVERITY_TO_AWARENESS.get(severity, AWARENESS_LEVEL_GREEN)
-            meteoalarm_level = AWARENESS_LEVEL_METEOALARM[awareness_level]
-
-            # Get parameters and use awareness_type if available
-            parameters = info.get("parameters", {})
-            event = info.get("event", "")
-            meteoalarm_type = self._get_meteoalarm_event_type(event, parameters)
-
-            # Collect area names from this info block
-            area_names = []
-            for area in info.get("areas", []):
-                area_name = area.get("areaDesc", "")
-                if area_name and area_name not in area_names:
-                    area_names.append(area_name)
-
-            alert_info = {
-                "identifier": alert.identifier,
-                ATTR_HEADLINE: info.get("headline", ""),
-                ATTR_DESCRIPTION: info.get("description", ""),
-                ATTR_SEVERITY: severity,
-                ATTR_URGENCY: info.get("urgency", ""),
-                ATTR_CERTAINTY: info.get("certainty", ""),
-                ATTR_EVENT: event,
-                ATTR_EFFECTIVE: info.get("effective", ""),
-                ATTR_EXPIRES: info.get("expires", ""),
-                ATTR_SENDER: alert.sender,
-                ATTR_INSTRUCTION: info.get("instruction", ""),
-                ATTR_CATEGORY: info.get("category", ""),
-                ATTR_RESPONSE_TYPE: (
-                    info.get("responseType", [""])[0]
-                    if isinstance(info.get("responseType"), list)
-                    else info.get("responseType", "")
-                ),
-                ATTR_AREA: ", ".join(area_names),
-                ATTR_AWARENESS_LEVEL: meteoalarm_level,
-                ATTR_AWARENESS_TYPE: meteoalarm_type,
-            }
-            alerts_details.append(alert_info)
+        if self._attribute_mode == ATTRIBUTE_MODE_COMPACT:
+            alerts_details = [
+                self._build_compact_alert_details(alert, info)
+                for alert, info in all_actionable_infos
+            ]
+        else:
+            alerts_details = [
+                self._build_alert_details(alert, info)
+                for alert, info in all_actionable_infos
+            ]
 
         # Get highest awareness level in MeteoalarmCard format
         highest_severity = highest_info.get("severity", "") if highest_info else ""
@@ -337,6 +447,6 @@ class CAPAlertsBinarySensor(
             ATTR_AWARENESS_LEVEL: meteoalarm_awareness_level,
             ATTR_AWARENESS_TYPE: meteoalarm_awareness_type,
             "alert_count": len(all_actionable_infos),
-            "alerts": alerts_details,
+            ATTR_ALERTS: alerts_details,
             "attribution": "Information provided by MeteoAlarm",
         }
@@ -0,0 +1,77 @@
+"""Calendar platform for CHMI Alerts integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import CAPAlertsCoordinator
+from .timeline import TimelineEntry
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up CHMI Alerts calendar from a config entry."""
+    coordinator: CAPAlertsCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([CAPAlertsCalendar(coordinator, entry)])
+
+
+def _calendar_event(entry: TimelineEntry) -> CalendarEvent:
+    """Convert timeline entry to calendar event."""
+    info = entry.info
+    description = "\n\n".join(
+        text for text in (info.get("description"), info.get("instruction")) if text
+    )
+    location = ", ".join(
+        area["areaDesc"] for area in info.get("areas", []) if area.get("areaDesc")
+    )
+    return CalendarEvent(
+        start=entry.start,
+        end=entry.end,
+        summary=info.get("headline") or info.get("event") or entry.alert.identifier,
+        description=description or None,
+        location=location or None,
+        # Alerts hold several info blocks, such as one per phenomenon
+        uid=f"{entry.alert.identifier}_{entry.position}",
+    )
+
+
+class CAPAlertsCalendar(CoordinatorEntity[CAPAlertsCoordinator], CalendarEntity):
+    """Calendar with validity of the alerts of an entry.
+
+    Events are looked up in the coordinator timeline, which is indexed only
+    when the alerts change.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "alert"
+
+    def __init__(self, coordinator: CAPAlertsCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_calendar"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the active or next upcoming alert."""
+        entry = self.coordinator.timeline.active_or_next(dt_util.utcnow())
+        return _calendar_event(entry) if entry is not None else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return alerts valid within the time range."""
+        return [
+            _calendar_event(entry)
+            for entry in self.coordinator.timeline.overlapping(start_date, end_date)
+        ]
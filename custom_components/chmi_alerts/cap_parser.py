@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+import unicodedata
 import xml.etree.ElementTree as ET
 from typing import Any
 
@@ -14,6 +16,18 @@ NAMESPACES = {
     "atom": "http://www.w3.org/2005/Atom",
 }
 
+# Messages replacing the alerts they reference, kept regardless of filters
+_REFERENCING_MSG_TYPES = {"Update", "Cancel"}
+
+
+# Area names repeat across alerts and feed updates, so every distinct name
+# is normalized only once
+@functools.lru_cache(maxsize=4096)
+def normalize_text(text: str) -> str:
+    """Return text folded for case and diacritics insensitive matching."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
 
 class CAPAlert:
     """Representation of a CAP alert."""
@@ -22,6 +36,7 @@ class CAPAlert:
         """Initialize CAP alert."""
         self.data = alert_data
         self._language_filter: str | None = None
+        self._area_keys: tuple[str, ...] | None = None
 
     @property
     def identifier(self) -> str:
@@ -53,11 +68,36 @@ class CAPAlert:
         """Return alert scope."""
         return self.data.get("scope", "")
 
+    @property
+    def key(self) -> tuple[str, str, str]:
+        """Return (sender, identifier, sent) uniquely identifying this message."""
+        return (self.sender, self.identifier, self.sent)
+
+    @property
+    def references(self) -> list[tuple[str, str, str]]:
+        """Return (sender, identifier, sent) of earlier messages this one refers to.
+
+        CAP references are whitespace separated "sender,identifier,sent" triples.
+        Malformed entries are ignored.
+        """
+        references = []
+        for reference in self.data.get("references", "").split():
+            parts = reference.split(",")
+            if len(parts) == 3:
+                references.append((parts[0], parts[1], parts[2]))
+        return references
+
     @property
     def info(self) -> list[dict[str, Any]]:
         """Return alert info sections."""
         return self.data.get("info", [])
 
+    def with_info(self, info: list[dict[str, Any]]) -> CAPAlert:
+        """Return copy of the alert with only the given info sections."""
+        alert = CAPAlert({**self.data, "info": info})
+        alert.set_language_filter(self._language_filter)
+        return alert
+
     def set_language_filter(self, language_filter: str | None) -> None:
         """Set the language filter for this alert.
 
@@ -76,17 +116,7 @@ class CAPAlert:
             True if languages match (exact or prefix match), False otherwise
 
         """
-        if not info_language or not language_filter:
-            return False
-
-        info_language_lower = info_language.lower()
-        language_filter_lower = language_filter.lower()
-
-        # Exact match or prefix match with hyphen separator
-        return (
-            info_language_lower == language_filter_lower
-            or info_language_lower.startswith(language_filter_lower + "-")
-        )
+        return _language_matches(info_language, language_filter)
 
     def _get_preferred_info(self) -> dict[str, Any] | None:
         """Get the preferred info section based on language filter and severity.
@@ -316,21 +346,28 @@ class CAPAlert:
                         geocode_values.add(value)
         return list(geocode_values)
 
+    @property
+    def area_keys(self) -> tuple[str, ...]:
+        """Return normalized area descriptions and geocode values.
+
+        Computed on first use, the alert data does not change afterwards.
+        """
+        if self._area_keys is None:
+            self._area_keys = tuple(
+                normalize_text(value) for value in (*self.areas, *self.geocodes)
+            )
+        return self._area_keys
+
     def matches_area(self, area_filter: str | None) -> bool:
         """Check if alert matches area filter.
 
-        Matches against area descriptions and geocode values.
+        Matches against area descriptions and geocode values, ignoring case
+        and diacritics.
         """
         if not area_filter:
             return True
-        area_filter_lower = area_filter.lower()
-
-        # Check area descriptions
-        if any(area_filter_lower in area.lower() for area in self.areas):
-            return True
-
-        # Check geocode values
-        return any(area_filter_lower in geocode.lower() for geocode in self.geocodes)
+        area_key = normalize_text(area_filter)
+        return any(area_key in key for key in self.area_keys)
 
     def matches_language(self, language_filter: str | None) -> bool:
         """Check if alert matches language filter.
@@ -413,15 +450,48 @@ class CAPAlert:
         return actionable_infos
 
 
-def parse_cap_xml(xml_content: str) -> list[CAPAlert]:
-    """Parse CAP XML content and return list of alerts."""
+def _language_matches(info_language: str, language_filter: str) -> bool:
+    """Check if an info language matches the language filter.
+
+    Uses exact match or prefix match with hyphen separator, so 'cs' matches
+    'cs' and 'cs-CZ', but 'en' does not match 'french'.
+    """
+    if not info_language or not language_filter:
+        return False
+
+    info_language_lower = info_language.lower()
+    language_filter_lower = language_filter.lower()
+
+    return (
+        info_language_lower == language_filter_lower
+        or info_language_lower.startswith(language_filter_lower + "-")
+    )
+
+
+def parse_cap_xml(
+    xml_content: str,
+    area_filter: str | None = None,
+    language_filter: str | None = None,
+) -> list[CAPAlert]:
+    """Parse CAP XML content and return list of alerts.
+
+    The optional filters are applied while parsing, with the same semantics as
+    CAPAlert.matches_area() and CAPAlert.matches_language():
+
+    - alerts without any area matching area_filter are skipped before their
+      info sections are parsed
+    - info sections in other languages than language_filter are skipped and
+      alerts without any matching info section are dropped
+
+    Returned alerts have the language filter already set.
+    """
     try:
         root = ET.fromstring(xml_content)
     except ET.ParseError as err:
         _LOGGER.error("Failed to parse CAP XML: %s", err)
         return []
 
-    alerts = []
+    alert_elements: list[ET.Element] = []
 
     # Check if this is an Atom feed with CAP entries
     if root.tag == "{http://www.w3.org/2005/Atom}feed":
@@ -433,40 +503,177 @@ def parse_cap_xml(xml_content: str) -> list[CAPAlert]:
                 # Look for cap:alert within content
                 cap_alert = content.find("cap:alert", NAMESPACES)
                 if cap_alert is not None:
-                    alert_data = _parse_alert_element(cap_alert)
-                    if alert_data:
-                        alerts.append(CAPAlert(alert_data))
+                    alert_elements.append(cap_alert)
     elif root.tag.endswith("alert"):
         # Direct CAP alert
-        alert_data = _parse_alert_element(root)
-        if alert_data:
-            alerts.append(CAPAlert(alert_data))
+        alert_elements.append(root)
     else:
         # Try to find all alert elements
-        for alert_elem in root.findall(".//cap:alert", NAMESPACES):
-            alert_data = _parse_alert_element(alert_elem)
-            if alert_data:
-                alerts.append(CAPAlert(alert_data))
+        alert_elements.extend(root.findall(".//cap:alert", NAMESPACES))
+
+    return parse_alert_elements(alert_elements, area_filter, language_filter)
+
+
+def parse_alert_elements(
+    alert_elements: list[ET.Element],
+    area_filter: str | None = None,
+    language_filter: str | None = None,
+) -> list[CAPAlert]:
+    """Parse CAP alert elements, applying the filters as parse_cap_xml()."""
+    alerts = []
+    for alert_elem in alert_elements:
+        alert_data = _parse_alert_element(alert_elem, area_filter, language_filter)
+        if alert_data:
+            alerts.append(CAPAlert(alert_data))
+
+    if language_filter:
+        for alert in alerts:
+            alert.set_language_filter(language_filter)
 
     return alerts
 
 
-def _parse_alert_element(alert_elem: ET.Element) -> dict[str, Any] | None:
-    """Parse a single CAP alert element."""
+class CAPStreamParser:
+    """Incremental parser collecting CAP alert elements from XML chunks.
+
+    Accepts the same documents as parse_cap_xml() (Atom feed, a single
+    alert or any document containing CAP alerts), but the XML can be fed
+    in chunks as it is downloaded. The collected elements are parsed with
+    parse_alert_elements().
+
+    Finished elements are detached from the document tree, so only the
+    alert elements are kept, not the whole document.
+    """
+
+    ALERT_TAG = f"{{{NAMESPACES['cap']}}}alert"
+
+    def __init__(self) -> None:
+        """Initialize parser."""
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        # Open elements outside of alerts
+        self._open: list[ET.Element] = []
+        # Depth of the current element within an alert, zero outside alerts
+        self._alert_depth = 0
+        self.alert_elements: list[ET.Element] = []
+
+    def feed(self, data: bytes) -> None:
+        """Feed chunk of XML, raises ET.ParseError on invalid XML."""
+        self._parser.feed(data)
+        self._read_events()
+
+    def close(self) -> list[ET.Element]:
+        """Finish parsing and return the alert elements."""
+        self._parser.close()
+        self._read_events()
+        return self.alert_elements
+
+    def _read_events(self) -> None:
+        """Collect completed top-level alert elements."""
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._alert_depth or elem.tag == self.ALERT_TAG:
+                    self._alert_depth += 1
+                else:
+                    self._open.append(elem)
+                continue
+
+            if self._alert_depth:
+                self._alert_depth -= 1
+                if self._alert_depth:
+                    # Alert content is kept in the alert element
+                    continue
+                self.alert_elements.append(elem)
+            else:
+                self._open.pop()
+                elem.clear()
+            if self._open:
+                self._open[-1].remove(elem)
+
+
+def _info_element_matches_area(
+    info_elem: ET.Element, ns: str, area_filter: str
+) -> bool:
+    """Check if any area of an unparsed info element matches the area filter.
+
+    The area_filter is expected to be normalized already.
+    """
+    for area_elem in info_elem.findall(f"{ns}area"):
+        area_desc = area_elem.findtext(f"{ns}areaDesc")
+        if area_desc and area_filter in normalize_text(area_desc.strip()):
+            return True
+        for geocode in area_elem.findall(f"{ns}geocode"):
+            value = geocode.findtext(f"{ns}value")
+            if (
+                value
+                and geocode.findtext(f"{ns}valueName")
+                and area_filter in normalize_text(value.strip())
+            ):
+                return True
+    return False
+
+
+def _parse_alert_element(
+    alert_elem: ET.Element,
+    area_filter: str | None = None,
+    language_filter: str | None = None,
+) -> dict[str, Any] | None:
+    """Parse a single CAP alert element.
+
+    Returns None if the alert does not match the area or language filter.
+    Update and Cancel messages are always returned, so they still replace
+    the alerts they reference, only without the info sections outside the
+    filters.
+    """
     # Remove namespace for easier processing
     ns = "{urn:oasis:names:tc:emergency:cap:1.2}"
 
+    info_elems = alert_elem.findall(f"{ns}info")
+    referencing = (
+        alert_elem.findtext(f"{ns}msgType") or ""
+    ).strip() in _REFERENCING_MSG_TYPES
+
+    # Check the area on all info sections (regardless of language), this is
+    # cheap compared to parsing the info sections
+    if area_filter:
+        area_key = normalize_text(area_filter)
+        if not any(
+            _info_element_matches_area(info_elem, ns, area_key)
+            for info_elem in info_elems
+        ):
+            if not referencing:
+                return None
+            info_elems = []
+
+    if language_filter:
+        info_elems = [
+            info_elem
+            for info_elem in info_elems
+            if _language_matches(
+                (info_elem.findtext(f"{ns}language") or "").strip(), language_filter
+            )
+        ]
+        if not info_elems and not referencing:
+            return None
+
     alert_data: dict[str, Any] = {}
 
     # Parse basic alert fields
-    for field in ["identifier", "sender", "sent", "status", "msgType", "scope"]:
+    for field in [
+        "identifier",
+        "sender",
+        "sent",
+        "status",
+        "msgType",
+        "scope",
+        "references",
+    ]:
         elem = alert_elem.find(f"{ns}{field}")
         if elem is not None and elem.text:
             alert_data[field] = elem.text.strip()
 
     # Parse info sections
     info_list = []
-    for info_elem in alert_elem.findall(f"{ns}info"):
+    for info_elem in info_elems:
         info_data = _parse_info_element(info_elem, ns)
         if info_data:
             info_list.append(info_data)
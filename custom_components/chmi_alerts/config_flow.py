@@ -11,42 +11,114 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
 from .const import (
+    ATTRIBUTE_MODE_COMPACT,
+    ATTRIBUTE_MODE_FULL,
     CISORP_CODE_TO_NAME,
+    CONF_ARCHIVE,
+    CONF_ARCHIVE_RETENTION,
     CONF_AREA_FILTER,
+    CONF_AREAS,
+    CONF_ATTRIBUTE_MODE,
+    CONF_FEED_URLS,
+    CONF_HAZARD_SENSORS,
     CONF_LANGUAGE_FILTER,
+    CONF_LOCATION_LEVELS,
+    CONF_MAX_BODY_SIZE,
+    CONF_REGION,
+    CONF_SEARCH,
+    CONF_ZONE,
+    CONF_ZONES,
+    DEFAULT_ARCHIVE_RETENTION,
+    DEFAULT_MAX_BODY_SIZE,
     DOMAIN,
+    REGION_CODE_TO_NAME,
 )
+from .locations import LOCATION_INDEX
 
 _LOGGER = logging.getLogger(__name__)
 
+# Location options for the selectors, built once
+AREA_OPTIONS = {
+    code: selector.SelectOptionDict(value=code, label=f"{name} ({code})")
+    for code, name in CISORP_CODE_TO_NAME.items()
+}
+ALL_LOCATIONS_OPTION = selector.SelectOptionDict(
+    value="", label="All locations (no filter)"
+)
+LOCATION_OPTIONS = [ALL_LOCATIONS_OPTION, *AREA_OPTIONS.values()]
+REGION_OPTIONS = [
+    selector.SelectOptionDict(value="", label="All regions (no filter)"),
+    *(
+        selector.SelectOptionDict(value=code, label=name)
+        for code, name in REGION_CODE_TO_NAME.items()
+    ),
+]
+
 
 class CHMIAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for CHMI Alerts."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._data: dict[str, Any] = {}
+        self._search = ""
+        self._matches: list[str] = []
+
+    def _async_create_entry(self, data: dict[str, Any]) -> FlowResult:
+        """Create entry titled after its location, region or zone."""
+        # Create entry without unique_id check (allow multiple instances)
+        # Get friendly title from location code
+        area_code = data.get(CONF_AREA_FILTER, "")
+        region = data.get(CONF_REGION, "")
+        zone = data.get(CONF_ZONE)
+        if area_code and area_code in CISORP_CODE_TO_NAME:
+            title = CISORP_CODE_TO_NAME[area_code]
+        elif area_code:
+            # Fallback for any unexpected code
+            title = area_code
+        elif region:
+            title = REGION_CODE_TO_NAME.get(region, region)
+        elif zone:
+            zone_state = self.hass.states.get(zone)
+            title = zone_state.name if zone_state else zone
+        else:
+            title = "CHMI Alerts"
+
+        return self.async_create_entry(
+            title=title,
+            data=data,
+        )
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Handle the initial step.
+
+        When a location search is entered, the location is selected from the
+        matching locations in the next step.
+        """
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Create entry without unique_id check (allow multiple instances)
-            # Get friendly title from location code
-            area_code = user_input.get(CONF_AREA_FILTER, "")
-            if area_code and area_code in CISORP_CODE_TO_NAME:
-                title = CISORP_CODE_TO_NAME[area_code]
-            elif area_code:
-                # Fallback for any unexpected code
-                title = area_code
+            user_input = dict(user_input)
+            search = user_input.pop(CONF_SEARCH, "").strip()
+            if user_input.get(CONF_REGION) and (
+                search or user_input.get(CONF_AREA_FILTER)
+            ):
+                # Both filters would apply, a location outside the region
+                # would never show any alert
+                errors[CONF_REGION] = "region_and_location"
+            elif not search:
+                return self._async_create_entry(user_input)
+            elif matches := LOCATION_INDEX.search(search):
+                self._data = user_input
+                self._search = search
+                self._matches = matches
+                return await self.async_step_location()
             else:
-                title = "CHMI Alerts"
-
-            return self.async_create_entry(
-                title=title,
-                data=user_input,
-            )
+                errors[CONF_SEARCH] = "no_locations_found"
 
         # Preselect language based on Home Assistant configuration
         # Default to Czech if Home Assistant is using Czech language, English otherwise
@@ -54,20 +126,18 @@ class CHMIAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if self.hass.config.language == "cs":
             default_language = "cs"
 
-        # Build location options for the selector
-        location_options = [
-            selector.SelectOptionDict(value="", label="All locations (no filter)")
-        ]
-        for code, name in CISORP_CODE_TO_NAME.items():
-            location_options.append(
-                selector.SelectOptionDict(value=code, label=f"{name} ({code})")
-            )
-
         data_schema = vol.Schema(
             {
+                vol.Optional(CONF_SEARCH, default=""): selector.TextSelector(),
                 vol.Optional(CONF_AREA_FILTER, default=""): selector.SelectSelector(
                     selector.SelectSelectorConfig(
-                        options=location_options,
+                        options=LOCATION_OPTIONS,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Optional(CONF_REGION, default=""): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=REGION_OPTIONS,
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
                 ),
@@ -80,6 +150,62 @@ class CHMIAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         translation_key=CONF_LANGUAGE_FILTER,
                     )
                 ),
+                vol.Optional(CONF_ZONE): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="zone")
+                ),
+                vol.Optional(CONF_AREAS, default=[]): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=list(AREA_OPTIONS.values()),
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Optional(CONF_ZONES, default=[]): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain=["zone", "person"], multiple=True
+                    )
+                ),
+                vol.Optional(
+                    CONF_ATTRIBUTE_MODE, default=ATTRIBUTE_MODE_FULL
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[ATTRIBUTE_MODE_FULL, ATTRIBUTE_MODE_COMPACT],
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                        translation_key=CONF_ATTRIBUTE_MODE,
+                    )
+                ),
+                vol.Optional(CONF_FEED_URLS, default=[]): selector.TextSelector(
+                    selector.TextSelectorConfig(
+                        type=selector.TextSelectorType.URL, multiple=True
+                    )
+                ),
+                vol.Optional(
+                    CONF_HAZARD_SENSORS, default=False
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_LOCATION_LEVELS, default=False
+                ): selector.BooleanSelector(),
+                vol.Optional(CONF_ARCHIVE, default=False): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_ARCHIVE_RETENTION, default=DEFAULT_ARCHIVE_RETENTION
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=1,
+                        max=3650,
+                        mode=selector.NumberSelectorMode.BOX,
+                        unit_of_measurement="days",
+                    )
+                ),
+                vol.Optional(
+                    CONF_MAX_BODY_SIZE, default=DEFAULT_MAX_BODY_SIZE
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=1,
+                        max=200,
+                        mode=selector.NumberSelectorMode.BOX,
+                        unit_of_measurement="MiB",
+                    )
+                ),
             }
         )
 
@@ -88,3 +214,29 @@ class CHMIAlertsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=data_schema,
             errors=errors,
         )
+
+    async def async_step_location(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Select location from the locations matching the search."""
+        if user_input is not None:
+            return self._async_create_entry({**self._data, **user_input})
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_AREA_FILTER, default=self._matches[0]
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[AREA_OPTIONS[code] for code in self._matches],
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
+                ),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="location",
+            data_schema=data_schema,
+            description_placeholders={"search": self._search},
+        )
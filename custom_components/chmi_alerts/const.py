@@ -1,14 +1,56 @@
 """Constants for the CHMI Alerts integration."""
 
 DOMAIN = "chmi_alerts"
+# Key in hass.data for downloads shared by all config entries
+DATA_SINGLE_FLIGHT = f"{DOMAIN}_single_flight"
+DATA_GEOJSON_VIEW = f"{DOMAIN}_geojson_view"
+DATA_TRIGGERS = f"{DOMAIN}_triggers"
 
 # Configuration
 CONF_AREA_FILTER = "area_filter"
+CONF_REGION = "region"
 CONF_LANGUAGE_FILTER = "language_filter"
+CONF_ZONE = "zone"
+CONF_ZONES = "zones"
+CONF_AREAS = "areas"
+CONF_ATTRIBUTE_MODE = "attribute_mode"
+CONF_FEED_URLS = "feed_urls"
+CONF_ARCHIVE = "archive"
+CONF_ARCHIVE_RETENTION = "archive_retention"
+CONF_MAX_BODY_SIZE = "max_body_size"
+CONF_SEARCH = "search"
+CONF_LOCATION_LEVELS = "location_levels"
+CONF_HAZARD_SENSORS = "hazard_sensors"
+
+# Attribute modes
+# Full mode includes alert texts in the state attributes, compact mode only
+# identifiers, levels and types (full texts are available via service)
+ATTRIBUTE_MODE_FULL = "full"
+ATTRIBUTE_MODE_COMPACT = "compact"
+
+# Services
+SERVICE_GET_ALERT_DETAILS = "get_alert_details"
+SERVICE_QUERY_HISTORY = "query_history"
+
+# History query modes
+HISTORY_MODE_AGGREGATE = "aggregate"
+HISTORY_MODE_RECORDS = "records"
+
+# Alert changes firing automation triggers
+TRIGGER_EVENT_NEW = "new"
+TRIGGER_EVENT_ENDED = "ended"
+TRIGGER_EVENT_UPDATED = "updated"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL = 3600  # 1 hour
 CHMI_FEED_URL = "https://vystrahy-cr.chmi.cz/data/XOCZ50_OKPR.xml"
+FEED_TIMEOUT = 30  # seconds, applies to each feed separately
+FETCH_ATTEMPTS = 3
+FETCH_RETRY_DELAY = 2  # seconds, doubled with each retry
+# Last successfully fetched alerts are kept during outages up to this age
+MAX_STALE_AGE = 12 * 3600  # seconds
+DEFAULT_ARCHIVE_RETENTION = 365  # days
+DEFAULT_MAX_BODY_SIZE = 20  # MiB, applies to both transferred and decoded size
 
 # Entity name translations
 # Maps language code to the translated word for "Alerts"
@@ -17,7 +59,27 @@ ENTITY_NAME_TRANSLATIONS = {
     "en": "Alerts",
 }
 
+# MeteoAlarm event type identifiers with localized names of the hazard sensors
+HAZARD_TYPES = {
+    "1": {"cs": "Vítr", "en": "Wind"},
+    "2": {"cs": "Sníh a led", "en": "Snow/Ice"},
+    "3": {"cs": "Bouřky", "en": "Thunderstorm"},
+    "4": {"cs": "Mlha", "en": "Fog"},
+    "5": {"cs": "Vysoké teploty", "en": "High temperature"},
+    "6": {"cs": "Nízké teploty", "en": "Low temperature"},
+    "7": {"cs": "Pobřežní jevy", "en": "Coastal event"},
+    "8": {"cs": "Lesní požáry", "en": "Forest fire"},
+    "9": {"cs": "Laviny", "en": "Avalanches"},
+    "10": {"cs": "Déšť", "en": "Rain"},
+    "12": {"cs": "Povodně", "en": "Flooding"},
+    "13": {"cs": "Déšť a povodně", "en": "Rain-flood"},
+}
+
 # Attributes
+ATTR_ALERTS = "alerts"
+ATTR_LOCATIONS = "locations"
+ATTR_STALE = "stale"
+ATTR_LAST_SUCCESSFUL_UPDATE = "last_successful_update"
 ATTR_HEADLINE = "headline"
 ATTR_DESCRIPTION = "description"
 ATTR_SEVERITY = "severity"
@@ -96,6 +158,9 @@ EVENT_TYPE_METEOALARM = {
     "Rain-Flood": "13; Rain-Flood",
 }
 
+# Event type of archived warnings which could not be classified
+EVENT_TYPE_OTHER = "Other"
+
 # CISORP location codes from https://apl2.czso.cz/iSMS/cisdet.jsp?kodcis=65
 # Dictionary mapping code to name, sorted alphabetically by name using Czech collation
 CISORP_CODE_TO_NAME = {
@@ -306,3 +371,21 @@ CISORP_CODE_TO_NAME = {
     "6220": "Znojmo",
     "7113": "Zábřeh",
 }
+
+# Regions (kraje), the first two digits of a CISORP code are the region code
+REGION_CODE_TO_NAME = {
+    "10": "Hlavní město Praha",
+    "21": "Středočeský kraj",
+    "31": "Jihočeský kraj",
+    "32": "Plzeňský kraj",
+    "41": "Karlovarský kraj",
+    "42": "Ústecký kraj",
+    "51": "Liberecký kraj",
+    "52": "Královéhradecký kraj",
+    "53": "Pardubický kraj",
+    "61": "Kraj Vysočina",
+    "62": "Jihomoravský kraj",
+    "71": "Olomoucký kraj",
+    "72": "Zlínský kraj",
+    "81": "Moravskoslezský kraj",
+}
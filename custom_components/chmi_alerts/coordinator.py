@@ -4,17 +4,82 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta
+import random
+import xml.etree.ElementTree as ET
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Generic, TypeVar
 
 import aiohttp
-from homeassistant.core import HomeAssistant
+from aiohttp import hdrs
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers.event import EventStateChangedData
+from homeassistant.helpers.typing import EventType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .cap_parser import CAPAlert, parse_cap_xml
-from .const import DEFAULT_SCAN_INTERVAL
+from .alert_triggers import AlertTriggers
+from .archive import AlertArchive
+from .awareness import group_by_event_type, location_levels
+from .cap_parser import CAPAlert, parse_alert_elements
+from .const import (
+    DATA_SINGLE_FLIGHT,
+    DEFAULT_MAX_BODY_SIZE,
+    DEFAULT_SCAN_INTERVAL,
+    FEED_TIMEOUT,
+    FETCH_ATTEMPTS,
+    FETCH_RETRY_DELAY,
+    MAX_STALE_AGE,
+)
+from .fetch import (
+    ACCEPT_ENCODING,
+    BodyTooLargeError,
+    DecodeError,
+    FeedDownload,
+    FeedStats,
+    async_read_error,
+    async_read_feed,
+)
+from .geo import ShapeBatch, SpatialIndex
+from .lifecycle import AlertLifecycleStore
+from .locations import REGION_LOCATIONS
+from .timeline import AlertTimeline
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+class TransientFetchError(UpdateFailed):
+    """Fetching failed with an error which is worth retrying."""
+
+
+class SingleFlight(Generic[_T]):
+    """Coalesce concurrent calls with the same key into a single call.
+
+    Callers arriving while a call for the key is in progress wait for its
+    result instead of starting another one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without calls in progress."""
+        self._in_flight: dict[str, asyncio.Task[_T]] = {}
+
+    def __len__(self) -> int:
+        """Return number of calls in progress."""
+        return len(self._in_flight)
+
+    async def run(self, key: str, func: Callable[[], Awaitable[_T]]) -> _T:
+        """Return result of the call in progress for the key or start one."""
+        if (task := self._in_flight.get(key)) is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _task: self._in_flight.pop(key, None))
+        # Cancelling one of the callers must not cancel the shared call
+        return await asyncio.shield(task)
+
 
 class CAPAlertsCoordinator(DataUpdateCoordinator[list[CAPAlert]]):
     """Class to manage fetching CHMI alerts data."""
@@ -22,14 +87,58 @@ class CAPAlertsCoordinator(DataUpdateCoordinator[list[CAPAlert]]):
     def __init__(
         self,
         hass: HomeAssistant,
-        feed_url: str,
+        feed_urls: list[str],
+        *,
         area_filter: str | None = None,
+        region: str | None = None,
         language_filter: str | None = None,
+        zone: str | None = None,
+        zones: list[str] | None = None,
+        areas: list[str] | None = None,
+        track_location_levels: bool = False,
+        archive: AlertArchive | None = None,
+        triggers: AlertTriggers | None = None,
+        max_body_size: int = DEFAULT_MAX_BODY_SIZE * 1024 * 1024,
     ) -> None:
         """Initialize the coordinator."""
-        self.feed_url = feed_url
+        self.feed_urls = feed_urls
         self.area_filter = area_filter
+        self.region = region
         self.language_filter = language_filter
+        self.zone = zone
+        self.zones = zones or []
+        self.areas = areas or []
+        self.track_location_levels = track_location_levels
+        self.archive = archive
+        # Automation triggers outlive the coordinator when the entry reloads
+        self.triggers = triggers if triggers is not None else AlertTriggers()
+        self._triggers_version: int | None = None
+        self.max_body_size = max_body_size
+        self.lifecycle = AlertLifecycleStore()
+        self.area_index = SpatialIndex()
+        # Actionable info blocks covering each geocode, for the area targets
+        self.area_infos: dict[str, list[tuple[CAPAlert, dict[str, Any]]]] = {}
+        # Highest awareness level of every location in the whole feed
+        self.location_levels: dict[str, str] = {}
+        # Actionable info blocks with an area covering each tracked zone
+        self.zone_infos: dict[str, list[tuple[CAPAlert, dict[str, Any]]]] = {}
+        # Alerts before the zone filter, filtered again when the zone moves
+        self._zone_candidates: list[CAPAlert] = []
+        # Incremented whenever new data is parsed, entities use it to cache
+        # values derived from the data
+        self.data_version = 0
+        self._timeline = AlertTimeline()
+        self._timeline_version: int | None = None
+        self._hazard_infos: dict[str, list[tuple[CAPAlert, dict[str, Any]]]] = {}
+        self._hazard_infos_version: int | None = None
+        # Set when serving the last good data because fetching failed
+        self.stale = False
+        self.last_success: datetime | None = None
+        # Downloads in progress are shared with other config entries
+        self.feed_stats: dict[str, FeedStats] = {}
+        self._single_flight: SingleFlight[FeedDownload] = hass.data.setdefault(
+            DATA_SINGLE_FLIGHT, SingleFlight()
+        )
 
         super().__init__(
             hass,
@@ -38,55 +147,373 @@ class CAPAlertsCoordinator(DataUpdateCoordinator[list[CAPAlert]]):
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
 
-    async def _async_update_data(self) -> list[CAPAlert]:
-        """Fetch data from CAP feed."""
+    @property
+    def timeline(self) -> AlertTimeline:
+        """Return validity index of the alerts, rebuilt when the data changes."""
+        if self._timeline_version != self.data_version:
+            self._timeline = AlertTimeline.from_alerts(
+                self.data or [], self.language_filter
+            )
+            self._timeline_version = self.data_version
+        return self._timeline
+
+    @property
+    def hazard_infos(self) -> dict[str, list[tuple[CAPAlert, dict[str, Any]]]]:
+        """Return actionable info blocks grouped by MeteoAlarm event type.
+
+        Grouped once per data version for all hazard sensors.
+        """
+        if self._hazard_infos_version != self.data_version:
+            self._hazard_infos = group_by_event_type(
+                self.data or [], self.language_filter
+            )
+            self._hazard_infos_version = self.data_version
+        return self._hazard_infos
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update entities and fire triggers of the changed alerts.
+
+        Triggers are evaluated once per data version, after the entities
+        were updated.
+        """
+        super().async_update_listeners()
+        if self.data is not None and self._triggers_version != self.data_version:
+            self._triggers_version = self.data_version
+            self.triggers.process(self.data, self.language_filter)
+
+    async def _async_fetch_feed(
+        self, session: aiohttp.ClientSession, feed_url: str
+    ) -> FeedDownload:
+        """Fetch a single CAP feed, retrying transient failures.
+
+        Connection errors, timeouts and server errors are retried with
+        exponentially growing, randomly jittered delays.
+        """
+        attempt = 1
+        while True:
+            try:
+                return await self._async_fetch_feed_once(session, feed_url)
+            except TransientFetchError as err:
+                if attempt >= FETCH_ATTEMPTS:
+                    raise
+                delay = random.uniform(0, FETCH_RETRY_DELAY * 2 ** (attempt - 1))
+                _LOGGER.debug("%s, retrying in %.1f s", err, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _async_fetch_feed_once(
+        self, session: aiohttp.ClientSession, feed_url: str
+    ) -> FeedDownload:
+        """Fetch a single CAP feed.
+
+        Compressed transfer is negotiated and the body is decompressed and
+        parsed as it is received.
+        """
         try:
-            async with asyncio.timeout(30):
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(self.feed_url) as response:
-                        if response.status != 200:
-                            raise UpdateFailed(
-                                f"Error fetching data: HTTP {response.status}"
-                            )
-                        xml_content = await response.text()
+            async with asyncio.timeout(FEED_TIMEOUT):
+                async with session.get(
+                    feed_url, headers={hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING}
+                ) as response:
+                    if response.status != 200:
+                        message = f"Error fetching {feed_url}: HTTP {response.status}"
+                        if excerpt := await async_read_error(response):
+                            message = f"{message}: {excerpt}"
+                        if response.status >= 500 or response.status == 429:
+                            raise TransientFetchError(message)
+                        raise UpdateFailed(message)
+                    return await async_read_feed(response, self.max_body_size)
+        except (DecodeError, ET.ParseError) as err:
+            raise UpdateFailed(f"Invalid content of {feed_url}: {err}") from err
+        except BodyTooLargeError as err:
+            raise UpdateFailed(f"Error fetching {feed_url}: {err}") from err
         except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error fetching data: {err}") from err
+            raise TransientFetchError(f"Error fetching {feed_url}: {err}") from err
         except TimeoutError as err:
-            raise UpdateFailed("Timeout fetching data") from err
-
-        # Parse the CAP XML
-        all_alerts = parse_cap_xml(xml_content)
-
-        # Filter by area if specified
-        if self.area_filter:
-            filtered_alerts = [
-                alert for alert in all_alerts if alert.matches_area(self.area_filter)
-            ]
-            _LOGGER.debug(
-                "Filtered %d alerts to %d matching area '%s'",
-                len(all_alerts),
-                len(filtered_alerts),
-                self.area_filter,
-            )
-            all_alerts = filtered_alerts
-
-        # Filter by language if specified
-        if self.language_filter:
-            filtered_alerts = [
-                alert
-                for alert in all_alerts
-                if alert.matches_language(self.language_filter)
-            ]
-            _LOGGER.debug(
-                "Filtered %d alerts to %d matching language '%s'",
-                len(all_alerts),
-                len(filtered_alerts),
-                self.language_filter,
-            )
-            all_alerts = filtered_alerts
+            raise TransientFetchError(f"Timeout fetching {feed_url}") from err
+
+    async def _async_download_feed(self, feed_url: str) -> FeedDownload:
+        """Fetch a single CAP feed in a session owned by the download.
+
+        The download may be shared with other refreshes and outlive the one
+        which started it, so it must not use a session of that refresh.
+        """
+        # Decompression is done while parsing the streamed body
+        async with aiohttp.ClientSession(auto_decompress=False) as session:
+            return await self._async_fetch_feed(session, feed_url)
+
+    async def _async_fetch_feeds(self) -> list[FeedDownload]:
+        """Fetch all CAP feeds concurrently.
+
+        Each feed has its own timeout, so a slow feed does not delay the
+        others. Fails only when no feed could be fetched.
+        """
+        results = await asyncio.gather(
+            *(
+                # Entries with a different size limit download separately
+                self._single_flight.run(
+                    f"{self.max_body_size} {url}",
+                    partial(self._async_download_feed, url),
+                )
+                for url in self.feed_urls
+            ),
+            return_exceptions=True,
+        )
+
+        contents: list[FeedDownload] = []
+        errors: list[UpdateFailed] = []
+        for url, result in zip(self.feed_urls, results, strict=True):
+            if isinstance(result, UpdateFailed):
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                contents.append(result)
+                self.feed_stats[url] = result.stats
+
+        if not contents:
+            raise errors[0]
+        for error in errors:
+            _LOGGER.warning("%s", error)
+
+        return contents
+
+    async def _async_update_data(self) -> list[CAPAlert]:
+        """Fetch data from CAP feeds."""
+        try:
+            contents = await self._async_fetch_feeds()
+        except UpdateFailed as err:
+            return self._stale_data(err)
+
+        # Per-area and per-zone sensors and the location levels need the
+        # whole feed, the entry area filter is then applied after parsing
+        has_targets = bool(self.areas or self.zones or self.track_location_levels)
+        parse_area_filter = None if has_targets else self.area_filter
+        alerts = self._parse_feeds(contents, parse_area_filter)
+
+        if self.archive is not None:
+            await self._async_archive(alerts)
+
+        # Apply Update and Cancel messages to the alerts they reference
+        alerts = self.lifecycle.update(alerts)
+
+        # Index polygons and circles of the alerts for coordinate lookups
+        self.area_index = SpatialIndex.from_alerts(alerts)
+
+        if self.areas:
+            self.area_infos = self._infos_by_geocode(alerts)
+
+        if self.zones:
+            self.zone_infos = self._infos_by_zone()
+
+        if self.track_location_levels:
+            self.location_levels = location_levels(alerts, self.language_filter)
+
+        if self.area_filter and has_targets:
+            alerts = [alert for alert in alerts if alert.matches_area(self.area_filter)]
+
+        if self.region:
+            alerts = self._filter_by_region(alerts)
+
+        if self.zone:
+            self._zone_candidates = alerts
+            alerts = self._filter_by_zone(alerts)
+
+        self.stale = False
+        self.last_success = dt_util.utcnow()
+        self.data_version += 1
+
+        return alerts
+
+    def _parse_feeds(
+        self, contents: list[FeedDownload], area_filter: str | None
+    ) -> list[CAPAlert]:
+        """Parse the CAP alerts, filtering by area and language while parsing.
+
+        The downloads may be shared with other config entries, so only this
+        step applies the filters of this entry. Alerts present in multiple
+        feeds are included only once.
+        """
+        alerts_by_identifier: dict[str, CAPAlert] = {}
+        alerts: list[CAPAlert] = []
+        for download in contents:
+            for alert in parse_alert_elements(
+                download.alert_elements,
+                area_filter=area_filter,
+                language_filter=self.language_filter,
+            ):
+                if not alert.identifier:
+                    alerts.append(alert)
+                elif alert.identifier not in alerts_by_identifier:
+                    alerts_by_identifier[alert.identifier] = alert
+                    alerts.append(alert)
+        _LOGGER.debug(
+            "Parsed %d alerts matching area '%s' and language '%s'",
+            len(alerts),
+            area_filter,
+            self.language_filter,
+        )
+        return alerts
+
+    def _stale_data(self, err: UpdateFailed) -> list[CAPAlert]:
+        """Return the last good data when fetching failed.
+
+        Raises the error when there is no data recent enough.
+        """
+        if (
+            self.data is None
+            or self.last_success is None
+            or dt_util.utcnow() - self.last_success > timedelta(seconds=MAX_STALE_AGE)
+        ):
+            raise err
+
+        _LOGGER.warning(
+            "%s, keeping alerts fetched at %s", err, self.last_success.isoformat()
+        )
+        if not self.stale:
+            self.stale = True
+            # Entities show the stale marker
+            self.data_version += 1
+        return self.data
+
+    async def _async_archive(self, alerts: list[CAPAlert]) -> None:
+        """Store received alerts in the archive."""
+        try:
+            await self.hass.async_add_executor_job(self.archive.append, alerts)
+        except OSError as err:
+            _LOGGER.warning("Failed to archive alerts: %s", err)
+
+    def _infos_by_geocode(
+        self, alerts: list[CAPAlert]
+    ) -> dict[str, list[tuple[CAPAlert, dict[str, Any]]]]:
+        """Map each geocode value to the actionable info blocks covering it.
+
+        Alerts hold a separate info block for each phenomenon and its areas,
+        like for zones only the blocks covering the geocode are included.
+        """
+        index: dict[str, list[tuple[CAPAlert, dict[str, Any]]]] = {}
+        for alert in alerts:
+            for info in alert.get_actionable_info_blocks(self.language_filter):
+                geocodes = {
+                    geocode
+                    for area in info.get("areas", [])
+                    for geocode in area.get("geocode", [])
+                }
+                for geocode in geocodes:
+                    index.setdefault(geocode, []).append((alert, info))
+        return index
+
+    @staticmethod
+    def _state_location(state: State | None) -> tuple[float, float] | None:
+        """Return latitude and longitude of a zone or person state."""
+        if state is None or ATTR_LATITUDE not in state.attributes:
+            return None
+        return state.attributes[ATTR_LATITUDE], state.attributes[ATTR_LONGITUDE]
+
+    def _zone_location(self, zone: str) -> tuple[float, float] | None:
+        """Return latitude and longitude of a zone."""
+        return self._state_location(self.hass.states.get(zone))
+
+    def _actionable_info_ids(self) -> set[int]:
+        """Return ids of the actionable info blocks of the indexed alerts."""
+        alerts = {id(alert): alert for alert, _info in self.area_index.values}
+        return {
+            id(info)
+            for alert in alerts.values()
+            for info in alert.get_actionable_info_blocks(self.language_filter)
+        }
+
+    def _infos_by_zone(self) -> dict[str, list[tuple[CAPAlert, dict[str, Any]]]]:
+        """Map each tracked zone to the actionable info blocks covering it.
+
+        Coverage of all zones by all indexed shapes is evaluated in a single
+        vectorized pass. Only the info blocks with an area covering the zone
+        are included, not all blocks of the matching alerts.
+        """
+        zones = []
+        points = []
+        for zone in self.zones:
+            if (location := self._zone_location(zone)) is None:
+                _LOGGER.warning("Location of %s not available, ignoring", zone)
+                continue
+            zones.append(zone)
+            points.append(location)
+
+        coverage = ShapeBatch(self.area_index.shapes).coverage(points)
+        actionable = self._actionable_info_ids()
+
+        result: dict[str, list[tuple[CAPAlert, dict[str, Any]]]] = {
+            zone: [] for zone in self.zones
+        }
+        for zone, covered in zip(zones, coverage, strict=True):
+            # Keep feed order and include every info block only once
+            zone_infos = {
+                id(info): (alert, info)
+                for alert, info in (
+                    self.area_index.values[i] for i in covered.nonzero()[0]
+                )
+                if id(info) in actionable
+            }
+            result[zone] = list(zone_infos.values())
+        return result
+
+    def _filter_by_region(self, alerts: list[CAPAlert]) -> list[CAPAlert]:
+        """Filter alerts to those covering a location of the region."""
+        locations = REGION_LOCATIONS.get(self.region, frozenset())
+        filtered_alerts = [
+            alert for alert in alerts if not locations.isdisjoint(alert.geocodes)
+        ]
+        _LOGGER.debug(
+            "Filtered %d alerts to %d covering region '%s'",
+            len(alerts),
+            len(filtered_alerts),
+            self.region,
+        )
+        return filtered_alerts
+
+    def _filter_by_zone(self, alerts: list[CAPAlert]) -> list[CAPAlert]:
+        """Filter alerts to those with an area polygon or circle covering the zone.
+
+        The alerts keep only the info blocks with an area covering the zone.
+        """
+        if (location := self._zone_location(self.zone)) is None:
+            raise UpdateFailed(f"Zone {self.zone} not found")
+
+        latitude, longitude = location
+        matching = {
+            id(info) for _alert, info in self.area_index.query(latitude, longitude)
+        }
+        filtered_alerts = []
+        for alert in alerts:
+            infos = [info for info in alert.info if id(info) in matching]
+            if infos:
+                filtered_alerts.append(alert.with_info(infos))
+        _LOGGER.debug(
+            "Filtered %d alerts to %d covering zone '%s'",
+            len(alerts),
+            len(filtered_alerts),
+            self.zone,
+        )
+        return filtered_alerts
+
+    @callback
+    def async_zone_moved(self, event: EventType[EventStateChangedData]) -> None:
+        """Re-evaluate coverage when a tracked zone or person moves.
 
-            # Set language filter on each alert so it returns the preferred info section
-            for alert in all_alerts:
-                alert.set_language_filter(self.language_filter)
+        The alerts of the last update are used, the feed is not fetched again.
+        """
+        location = self._state_location(event.data["new_state"])
+        if (
+            self.data is None
+            or location is None
+            or location == self._state_location(event.data["old_state"])
+        ):
+            return
 
-        return all_alerts
+        entity_id = event.data["entity_id"]
+        if entity_id in self.zones:
+            self.zone_infos = self._infos_by_zone()
+        if entity_id == self.zone:
+            self.data = self._filter_by_zone(self._zone_candidates)
+        self.data_version += 1
+        self.async_update_listeners()
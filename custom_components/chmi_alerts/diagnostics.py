@@ -0,0 +1,30 @@
+"""Diagnostics support for CHMI Alerts."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import CAPAlertsCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: CAPAlertsCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry_data": dict(entry.data),
+        "alert_count": len(coordinator.data or []),
+        "stale": coordinator.stale,
+        "last_successful_update": (
+            coordinator.last_success.isoformat() if coordinator.last_success else None
+        ),
+        "feeds": {
+            url: stats.as_dict() for url, stats in coordinator.feed_stats.items()
+        },
+    }
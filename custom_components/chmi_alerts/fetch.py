@@ -0,0 +1,347 @@
+"""Streaming download of CAP feeds."""
+
+from __future__ import annotations
+
+import logging
+import zlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+from .cap_parser import CAPStreamParser
+
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+
+    import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+# Part of error response body included in the error message
+ERROR_EXCERPT_SIZE = 256
+# Limit of the decoded beginning of error response body
+ERROR_DECODED_SIZE = 64 * ERROR_EXCERPT_SIZE
+
+# Brotli releases before 1.1 can not limit the decoded size
+if brotli is not None and not hasattr(brotli.Decompressor, "can_accept_more_data"):
+    brotli = None
+
+# Content encodings supported by the installed libraries, in preference order
+SUPPORTED_ENCODINGS = [
+    *(["zstd"] if zstandard is not None else []),
+    *(["br"] if brotli is not None else []),
+    "gzip",
+    "deflate",
+]
+ACCEPT_ENCODING = ", ".join(SUPPORTED_ENCODINGS)
+
+
+class DecodeError(Exception):
+    """Response body could not be decoded."""
+
+
+class BodyTooLargeError(Exception):
+    """Response body exceeds the size limit."""
+
+
+class Decoder(Protocol):
+    """Streaming decoder of a content encoding."""
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """Decode chunk of the body.
+
+        Decoders supporting it raise BodyTooLargeError as soon as the chunk
+        would decode to more than max_length bytes.
+        """
+
+    def flush(self) -> bytes:
+        """Return remaining decoded data."""
+
+
+class IdentityDecoder:
+    """Decoder of uncompressed body."""
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """Return chunk unchanged."""
+        return data
+
+    def flush(self) -> bytes:
+        """Return no data."""
+        return b""
+
+
+class ZlibDecoder:
+    """Decoder of gzip and deflate encoded body."""
+
+    def __init__(self, wbits: int) -> None:
+        """Initialize decoder for the zlib window bits."""
+        self._decompressor = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """Decode chunk of the body."""
+        try:
+            result = self._decompressor.decompress(data, max_length)
+        except zlib.error as err:
+            raise DecodeError(err) from err
+        if self._decompressor.unconsumed_tail:
+            raise BodyTooLargeError(f"Decoded body exceeds {max_length} bytes")
+        return result
+
+    def flush(self) -> bytes:
+        """Return remaining decoded data."""
+        try:
+            return self._decompressor.flush()
+        except zlib.error as err:
+            raise DecodeError(err) from err
+
+
+class BrotliDecoder:
+    """Decoder of brotli encoded body."""
+
+    def __init__(self) -> None:
+        """Initialize decoder."""
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """Decode chunk of the body, producing at most max_length bytes.
+
+        The output is produced in blocks of about CHUNK_SIZE until the
+        decompressor needs more input, so decoding stops within one block
+        after exceeding the limit.
+        """
+        output = []
+        size = 0
+        try:
+            block = self._decompressor.process(data, output_buffer_limit=CHUNK_SIZE)
+            while block:
+                output.append(block)
+                size += len(block)
+                if max_length and size > max_length:
+                    raise BodyTooLargeError(f"Decoded body exceeds {max_length} bytes")
+                if self._decompressor.is_finished():
+                    break
+                block = self._decompressor.process(b"", output_buffer_limit=CHUNK_SIZE)
+        except brotli.error as err:
+            raise DecodeError(err) from err
+        return b"".join(output)
+
+    def flush(self) -> bytes:
+        """Return remaining decoded data."""
+        return b""
+
+
+class _LimitedOutput:
+    """Collector of decoded data failing when it exceeds the limit."""
+
+    def __init__(self) -> None:
+        """Initialize empty output."""
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self.limit = 0
+
+    def write(self, data: bytes) -> int:
+        """Collect decoded data."""
+        self.size += len(data)
+        if self.limit and self.size > self.limit:
+            raise BodyTooLargeError(f"Decoded body exceeds {self.limit} bytes")
+        self.chunks.append(data)
+        return len(data)
+
+    def take(self) -> bytes:
+        """Return and forget the collected data."""
+        data = b"".join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+
+class ZstdDecoder:
+    """Decoder of zstd encoded body.
+
+    The decoded data is written in blocks of CHUNK_SIZE, so decoding stops
+    within one block after exceeding the limit.
+    """
+
+    def __init__(self) -> None:
+        """Initialize decoder."""
+        self._output = _LimitedOutput()
+        self._writer = zstandard.ZstdDecompressor().stream_writer(
+            self._output, write_size=CHUNK_SIZE
+        )
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """Decode chunk of the body, producing at most max_length bytes."""
+        self._output.limit = max_length
+        try:
+            self._writer.write(data)
+        except zstandard.ZstdError as err:
+            raise DecodeError(err) from err
+        return self._output.take()
+
+    def flush(self) -> bytes:
+        """Return remaining decoded data."""
+        return b""
+
+
+class ChainedDecoder:
+    """Decoder of a body with multiple content encodings applied."""
+
+    def __init__(self, decoders: list[Decoder]) -> None:
+        """Initialize decoder, the decoders are in the order of decoding."""
+        self._decoders = decoders
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """Decode chunk of the body by all decoders."""
+        for decoder in self._decoders:
+            data = decoder.decompress(data, max_length)
+        return data
+
+    def flush(self) -> bytes:
+        """Return remaining decoded data."""
+        data = b""
+        for decoder in self._decoders:
+            # Remaining data of the previous decoders is decoded first
+            data = decoder.decompress(data) + decoder.flush()
+        return data
+
+
+def get_decoder(encoding: str) -> Decoder:
+    """Return streaming decoder for a Content-Encoding header value.
+
+    Multiple encodings are listed in the order they were applied, so they
+    are decoded in reverse order.
+    """
+    decoders = [
+        _get_single_decoder(part)
+        for part in reversed(encoding.lower().split(","))
+        if part.strip() not in {"", "identity"}
+    ]
+    if not decoders:
+        return IdentityDecoder()
+    if len(decoders) == 1:
+        return decoders[0]
+    return ChainedDecoder(decoders)
+
+
+def _get_single_decoder(encoding: str) -> Decoder:
+    """Return streaming decoder for a single content encoding."""
+    encoding = encoding.strip()
+    if encoding in {"gzip", "x-gzip"}:
+        return ZlibDecoder(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        # Accepts both zlib wrapped and gzip data
+        return ZlibDecoder(32 + zlib.MAX_WBITS)
+    if encoding == "br" and brotli is not None:
+        return BrotliDecoder()
+    if encoding == "zstd" and zstandard is not None:
+        return ZstdDecoder()
+    raise DecodeError(f"Unsupported content encoding {encoding}")
+
+
+@dataclass(slots=True)
+class FeedStats:
+    """Transfer statistics of a feed download."""
+
+    encoding: str = "identity"
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Return ratio of decoded to transferred size."""
+        if not self.wire_bytes:
+            return None
+        return round(self.decoded_bytes / self.wire_bytes, 2)
+
+    def as_dict(self) -> dict[str, str | int | float | None]:
+        """Return diagnostic representation."""
+        return {
+            "encoding": self.encoding,
+            "wire_bytes": self.wire_bytes,
+            "decoded_bytes": self.decoded_bytes,
+            "compression_ratio": self.compression_ratio,
+        }
+
+
+@dataclass(slots=True)
+class FeedDownload:
+    """Alert elements of a downloaded feed."""
+
+    alert_elements: list[ET.Element] = field(default_factory=list)
+    stats: FeedStats = field(default_factory=FeedStats)
+
+
+def _check_size(stats: FeedStats, max_size: int) -> None:
+    """Raise when transferred or decoded size exceeds the limit."""
+    if stats.wire_bytes > max_size or stats.decoded_bytes > max_size:
+        raise BodyTooLargeError(f"Response body exceeds {max_size} bytes")
+
+
+async def async_read_feed(
+    response: aiohttp.ClientResponse, max_size: int
+) -> FeedDownload:
+    """Decode and parse response body as it is received.
+
+    The body is never held in memory as a whole, neither compressed nor
+    decoded. Reading stops as soon as either size exceeds max_size, which
+    also guards against highly compressed bodies.
+
+    Raises DecodeError or ET.ParseError on invalid content and
+    BodyTooLargeError on oversized body.
+    """
+    # Announced size allows aborting before reading anything
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_size:
+        raise BodyTooLargeError(f"Response body of {length} bytes exceeds {max_size}")
+
+    encoding = response.headers.get("Content-Encoding", "identity")
+    decoder = get_decoder(encoding)
+    parser = CAPStreamParser()
+    stats = FeedStats(encoding=encoding.strip().lower() or "identity")
+
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        stats.wire_bytes += len(chunk)
+        data = decoder.decompress(chunk, max_size - stats.decoded_bytes + 1)
+        stats.decoded_bytes += len(data)
+        _check_size(stats, max_size)
+        parser.feed(data)
+    data = decoder.flush()
+    stats.decoded_bytes += len(data)
+    _check_size(stats, max_size)
+    parser.feed(data)
+
+    alert_elements = parser.close()
+    _LOGGER.debug(
+        "Received %d bytes (%s), decoded %d bytes with %d alerts",
+        stats.wire_bytes,
+        stats.encoding,
+        stats.decoded_bytes,
+        len(alert_elements),
+    )
+    return FeedDownload(alert_elements, stats)
+
+
+async def async_read_error(response: aiohttp.ClientResponse) -> str:
+    """Return short excerpt of an error response body.
+
+    Only the beginning of the body is read and decoded.
+    """
+    try:
+        decoder = get_decoder(response.headers.get("Content-Encoding", "identity"))
+        chunk = await response.content.read(ERROR_EXCERPT_SIZE)
+        text = decoder.decompress(chunk, ERROR_DECODED_SIZE)[
+            :ERROR_EXCERPT_SIZE
+        ].decode(errors="replace")
+    except (DecodeError, BodyTooLargeError):
+        return ""
+    return " ".join(text.split())
@@ -0,0 +1,359 @@
+"""Geometry helpers for CAP area polygons and circles."""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+# Mean Earth radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+# Grid cell size of the spatial index in degrees
+DEFAULT_CELL_SIZE = 0.25
+
+# Number of points evaluated at once by the vectorized coverage test
+COVERAGE_CHUNK_SIZE = 256
+
+
+def _parse_point(text: str) -> tuple[float, float]:
+    """Parse CAP "latitude,longitude" coordinate pair."""
+    lat, lon = text.split(",")
+    return float(lat), float(lon)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return great-circle distance between two points in kilometers."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class PolygonShape:
+    """CAP polygon with precomputed bounding box.
+
+    CAP polygons are whitespace separated "latitude,longitude" pairs where the
+    first and last pair are the same.
+    """
+
+    def __init__(self, lats: list[float], lons: list[float]) -> None:
+        """Initialize polygon from coordinate arrays."""
+        self.lats = lats
+        self.lons = lons
+        self.bbox = (min(lats), min(lons), max(lats), max(lons))
+
+    @classmethod
+    def from_cap(cls, text: str) -> PolygonShape | None:
+        """Parse CAP polygon string, returns None for invalid polygons."""
+        try:
+            points = [_parse_point(pair) for pair in text.split()]
+        except ValueError:
+            _LOGGER.debug("Ignoring invalid CAP polygon: %s", text)
+            return None
+        if points and points[0] == points[-1]:
+            points.pop()
+        if len(points) < 3:
+            _LOGGER.debug("Ignoring degenerate CAP polygon: %s", text)
+            return None
+        return cls([point[0] for point in points], [point[1] for point in points])
+
+    @property
+    def centroid(self) -> tuple[float, float]:
+        """Return latitude and longitude of the area centroid.
+
+        Uses the planar shoelace formula, which is accurate enough for areas
+        of the size of a country, and the mean of the vertices for polygons
+        without area.
+        """
+        # Relative to the first vertex to avoid losing precision
+        lat0 = self.lats[0]
+        lon0 = self.lons[0]
+        lats = [lat - lat0 for lat in self.lats]
+        lons = [lon - lon0 for lon in self.lons]
+        area = 0.0
+        lat_sum = 0.0
+        lon_sum = 0.0
+        j = len(lats) - 1
+        for i in range(len(lats)):
+            cross = lons[j] * lats[i] - lons[i] * lats[j]
+            area += cross
+            lat_sum += (lats[i] + lats[j]) * cross
+            lon_sum += (lons[i] + lons[j]) * cross
+            j = i
+        if not area:
+            return lat0 + sum(lats) / len(lats), lon0 + sum(lons) / len(lons)
+        return lat0 + lat_sum / (3 * area), lon0 + lon_sum / (3 * area)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """Check if point is inside the polygon (ray casting)."""
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+            return False
+
+        inside = False
+        lats = self.lats
+        lons = self.lons
+        j = len(lats) - 1
+        for i in range(len(lats)):
+            if (lats[i] > lat) != (lats[j] > lat) and lon < (lons[j] - lons[i]) * (
+                lat - lats[i]
+            ) / (lats[j] - lats[i]) + lons[i]:
+                inside = not inside
+            j = i
+        return inside
+
+
+class CircleShape:
+    """CAP circle with precomputed bounding box.
+
+    CAP circles are "latitude,longitude radius" with radius in kilometers.
+    """
+
+    def __init__(self, lat: float, lon: float, radius_km: float) -> None:
+        """Initialize circle from center and radius."""
+        self.lat = lat
+        self.lon = lon
+        self.radius_km = radius_km
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        # Clamp near the poles where a longitude degree gets very short
+        dlon = math.degrees(
+            radius_km / (EARTH_RADIUS_KM * max(math.cos(math.radians(lat)), 0.01))
+        )
+        self.bbox = (lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+    @classmethod
+    def from_cap(cls, text: str) -> CircleShape | None:
+        """Parse CAP circle string, returns None for invalid circles."""
+        try:
+            center, radius = text.split()
+            lat, lon = _parse_point(center)
+            radius_km = float(radius)
+        except ValueError:
+            _LOGGER.debug("Ignoring invalid CAP circle: %s", text)
+            return None
+        return cls(lat, lon, radius_km)
+
+    @property
+    def centroid(self) -> tuple[float, float]:
+        """Return latitude and longitude of the circle center."""
+        return self.lat, self.lon
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """Check if point is inside the circle."""
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+            return False
+        return haversine_km(self.lat, self.lon, lat, lon) <= self.radius_km
+
+
+Shape = PolygonShape | CircleShape
+
+
+def shapes_from_area(area: dict[str, Any]) -> list[Shape]:
+    """Build shapes from a parsed CAP area."""
+    shapes: list[Shape] = []
+    if polygon_text := area.get("polygon"):
+        if polygon := PolygonShape.from_cap(polygon_text):
+            shapes.append(polygon)
+    if circle_text := area.get("circle"):
+        if circle := CircleShape.from_cap(circle_text):
+            shapes.append(circle)
+    return shapes
+
+
+def shapes_centroid(shapes: Sequence[Shape]) -> tuple[float, float] | None:
+    """Return mean of the centroids of the shapes."""
+    if not shapes:
+        return None
+    centroids = [shape.centroid for shape in shapes]
+    return (
+        sum(lat for lat, _lon in centroids) / len(centroids),
+        sum(lon for _lat, lon in centroids) / len(centroids),
+    )
+
+
+class SpatialIndex:
+    """Uniform grid index over shapes.
+
+    Each shape is registered in all grid cells its bounding box overlaps, so
+    a point lookup only tests shapes from a single cell.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE) -> None:
+        """Initialize empty index."""
+        self.cell_size = cell_size
+        self.shapes: list[Shape] = []
+        self.values: list[Any] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    def __len__(self) -> int:
+        """Return number of indexed shapes."""
+        return len(self.shapes)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        """Return grid cell of a point."""
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def insert(self, shape: Shape, value: Any) -> None:
+        """Add shape with associated value to the index."""
+        shape_id = len(self.shapes)
+        self.shapes.append(shape)
+        self.values.append(value)
+        min_lat, min_lon, max_lat, max_lon = shape.bbox
+        min_row, min_col = self._cell(min_lat, min_lon)
+        max_row, max_col = self._cell(max_lat, max_lon)
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                self._cells.setdefault((row, col), []).append(shape_id)
+
+    def query(self, lat: float, lon: float) -> Iterator[Any]:
+        """Yield values of all shapes containing the point.
+
+        A value is yielded once for every matching shape, callers should
+        deduplicate if one value was inserted with multiple shapes.
+        """
+        for shape_id in self._cells.get(self._cell(lat, lon), ()):
+            if self.shapes[shape_id].contains(lat, lon):
+                yield self.values[shape_id]
+
+    @classmethod
+    def from_alerts(
+        cls, alerts: Iterable[Any], cell_size: float = DEFAULT_CELL_SIZE
+    ) -> SpatialIndex:
+        """Build index over areas of all info sections of the alerts.
+
+        Values are (alert, info) tuples.
+        """
+        index = cls(cell_size)
+        for alert in alerts:
+            for info in alert.info:
+                for area in info.get("areas", []):
+                    for shape in shapes_from_area(area):
+                        index.insert(shape, (alert, info))
+        return index
+
+
+class ShapeBatch:
+    """Shapes packed into NumPy arrays for vectorized point coverage tests.
+
+    All polygon edges are concatenated into flat arrays with per-polygon
+    offsets. Points are tested against the shape bounding boxes first and
+    the edges are evaluated only for the point and polygon pairs passing it.
+    """
+
+    def __init__(self, shapes: Sequence[Shape]) -> None:
+        """Pack shapes into arrays."""
+        self.size = len(shapes)
+        bboxes = np.array([shape.bbox for shape in shapes], dtype=float).reshape(-1, 4)
+        self._min_lats, self._min_lons, self._max_lats, self._max_lons = bboxes.T
+        self._polygon_columns = np.array(
+            [i for i, shape in enumerate(shapes) if isinstance(shape, PolygonShape)],
+            dtype=np.intp,
+        )
+        self._circle_columns = np.array(
+            [i for i, shape in enumerate(shapes) if isinstance(shape, CircleShape)],
+            dtype=np.intp,
+        )
+
+        polygons = [shapes[i] for i in self._polygon_columns]
+        self._polygon_lengths = np.array(
+            [len(polygon.lats) for polygon in polygons], dtype=np.intp
+        )
+        # Start offset of every polygon in the edge arrays
+        self._polygon_starts = np.concatenate(
+            ([0], np.cumsum(self._polygon_lengths)[:-1])
+        ).astype(np.intp)
+        if polygons:
+            lats = [np.asarray(polygon.lats, dtype=float) for polygon in polygons]
+            lons = [np.asarray(polygon.lons, dtype=float) for polygon in polygons]
+            # Edge i goes from vertex i to vertex i + 1 (wrapping around)
+            self._y1 = np.concatenate(lats)
+            self._x1 = np.concatenate(lons)
+            self._y2 = np.concatenate([np.roll(values, -1) for values in lats])
+            self._x2 = np.concatenate([np.roll(values, -1) for values in lons])
+
+        circles = [shapes[i] for i in self._circle_columns]
+        self._circle_lats = np.radians([circle.lat for circle in circles])
+        self._circle_lons = np.radians([circle.lon for circle in circles])
+        self._circle_radii = np.array([circle.radius_km for circle in circles])
+
+    def coverage(self, points: Sequence[tuple[float, float]]) -> np.ndarray:
+        """Return boolean matrix of shape (points, shapes).
+
+        Element [n, m] is True when point n (latitude, longitude) is covered
+        by shape m. Points are processed in chunks of COVERAGE_CHUNK_SIZE to
+        bound the size of the intermediate arrays.
+        """
+        result = np.zeros((len(points), self.size), dtype=bool)
+        if not len(points) or not self.size:
+            return result
+
+        coordinates = np.asarray(points, dtype=float).reshape(-1, 2)
+        for start in range(0, len(coordinates), COVERAGE_CHUNK_SIZE):
+            chunk = coordinates[start : start + COVERAGE_CHUNK_SIZE]
+            result[start : start + len(chunk)] = self._chunk_coverage(chunk)
+        return result
+
+    def _chunk_coverage(self, coordinates: np.ndarray) -> np.ndarray:
+        """Return coverage matrix of a chunk of (latitude, longitude) rows."""
+        lat = coordinates[:, 0:1]
+        lon = coordinates[:, 1:2]
+        # (points, shapes) matrix of points inside the bounding boxes
+        result = (
+            (self._min_lats <= lat)
+            & (lat <= self._max_lats)
+            & (self._min_lons <= lon)
+            & (lon <= self._max_lons)
+        )
+
+        if len(self._polygon_columns):
+            point_ids, polygon_ids = result[:, self._polygon_columns].nonzero()
+            inside = np.zeros(len(point_ids), dtype=bool)
+            if len(point_ids):
+                # Edges of the candidate pairs laid out one pair after another
+                counts = self._polygon_lengths[polygon_ids]
+                pair_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+                edges = np.repeat(
+                    self._polygon_starts[polygon_ids] - pair_starts, counts
+                ) + np.arange(counts.sum())
+                y = np.repeat(lat[point_ids, 0], counts)
+                x = np.repeat(lon[point_ids, 0], counts)
+                y1 = self._y1[edges]
+                y2 = self._y2[edges]
+                x1 = self._x1[edges]
+                # Ray casting over the edges of all pairs at once
+                crosses = (y1 > y) != (y2 > y)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    x_intersect = (self._x2[edges] - x1) * (y - y1) / (y2 - y1) + x1
+                crossings = crosses & (x < x_intersect)
+                # Odd number of crossings of the polygon edges means inside
+                inside = np.bitwise_xor.reduceat(crossings, pair_starts)
+            polygon_result = np.zeros(
+                (len(coordinates), len(self._polygon_columns)), dtype=bool
+            )
+            polygon_result[point_ids, polygon_ids] = inside
+            result[:, self._polygon_columns] = polygon_result
+
+        if len(self._circle_columns):
+            phi = np.radians(lat)
+            dphi = self._circle_lats - phi
+            dlambda = self._circle_lons - np.radians(lon)
+            a = (
+                np.sin(dphi / 2) ** 2
+                + np.cos(phi) * np.cos(self._circle_lats) * np.sin(dlambda / 2) ** 2
+            )
+            distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+            result[:, self._circle_columns] &= distance <= self._circle_radii
+
+        return result
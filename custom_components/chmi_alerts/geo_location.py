@@ -0,0 +1,148 @@
+"""Geolocation platform for CHMI Alerts integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.geo_location import GeolocationEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfLength
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .alert_triggers import actionable_infos
+from .awareness import awareness_level, meteoalarm_event_type
+from .cap_parser import CAPAlert
+from .const import (
+    ATTR_AREA,
+    ATTR_AWARENESS_LEVEL,
+    ATTR_AWARENESS_TYPE,
+    ATTR_EVENT,
+    ATTR_EXPIRES,
+    ATTR_HEADLINE,
+    ATTR_SEVERITY,
+    AWARENESS_ICONS,
+    AWARENESS_LEVEL_METEOALARM,
+    DOMAIN,
+)
+from .coordinator import CAPAlertsCoordinator
+from .geo import haversine_km, shapes_centroid, shapes_from_area
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up CHMI Alerts geolocation events from a config entry."""
+    coordinator: CAPAlertsCoordinator = hass.data[DOMAIN][entry.entry_id]
+    manager = CAPAlertsGeolocationManager(hass, coordinator, async_add_entities)
+    entry.async_on_unload(coordinator.async_add_listener(manager.async_update))
+    manager.async_update()
+
+
+class CAPAlertsGeolocationManager:
+    """Keep one geolocation event per active info block with an area shape.
+
+    Events are added for new info blocks and removed for expired ones, the
+    events of info blocks present in consecutive updates are kept.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: CAPAlertsCoordinator,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Initialize the manager."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._async_add_entities = async_add_entities
+        # None for info blocks without an area shape
+        self._events: dict[tuple[str, int], CAPAlertGeolocationEvent | None] = {}
+        self._data_version: int | None = None
+
+    @callback
+    def async_update(self) -> None:
+        """Add events of new info blocks and remove events of ended ones."""
+        if self._data_version == self._coordinator.data_version:
+            return
+        self._data_version = self._coordinator.data_version
+
+        infos = actionable_infos(
+            self._coordinator.data or [], self._coordinator.language_filter
+        )
+
+        for key in self._events.keys() - infos.keys():
+            if (event := self._events.pop(key)) is not None:
+                self._hass.async_create_task(event.async_remove(force_remove=True))
+
+        new_events = []
+        for key, (alert, info) in infos.items():
+            if key in self._events:
+                continue
+            shapes = [
+                shape
+                for area in info.get("areas", [])
+                for shape in shapes_from_area(area)
+            ]
+            if (centroid := shapes_centroid(shapes)) is None:
+                # Areas described only by geocodes have no location
+                self._events[key] = None
+                continue
+            event = CAPAlertGeolocationEvent(
+                alert,
+                info,
+                centroid,
+                haversine_km(
+                    self._hass.config.latitude,
+                    self._hass.config.longitude,
+                    *centroid,
+                ),
+            )
+            self._events[key] = event
+            new_events.append(event)
+
+        if new_events:
+            _LOGGER.debug("Adding %d geolocation events", len(new_events))
+            self._async_add_entities(new_events)
+
+
+class CAPAlertGeolocationEvent(GeolocationEvent):
+    """Geolocation event of an alert info block located at its area centroid."""
+
+    _attr_should_poll = False
+    _attr_source = DOMAIN
+    _attr_unit_of_measurement = UnitOfLength.KILOMETERS
+
+    def __init__(
+        self,
+        alert: CAPAlert,
+        info: dict[str, Any],
+        centroid: tuple[float, float],
+        distance: float,
+    ) -> None:
+        """Initialize the event, the location is computed only once."""
+        level = awareness_level(info.get("severity", ""))
+        event = info.get("event", "")
+        self._attr_name = info.get("headline") or event or alert.identifier
+        self._attr_icon = AWARENESS_ICONS.get(level, "mdi:alert")
+        self._attr_latitude, self._attr_longitude = centroid
+        self._attr_distance = distance
+        self._attr_extra_state_attributes = {
+            "identifier": alert.identifier,
+            ATTR_HEADLINE: info.get("headline", ""),
+            ATTR_EVENT: event,
+            ATTR_SEVERITY: info.get("severity", ""),
+            ATTR_AWARENESS_LEVEL: AWARENESS_LEVEL_METEOALARM[level],
+            ATTR_AWARENESS_TYPE: meteoalarm_event_type(event, info.get("parameters")),
+            ATTR_EXPIRES: info.get("expires", ""),
+            ATTR_AREA: ", ".join(
+                area["areaDesc"]
+                for area in info.get("areas", [])
+                if area.get("areaDesc")
+            ),
+        }
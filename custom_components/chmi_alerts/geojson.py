@@ -0,0 +1,191 @@
+"""GeoJSON export of active alerts."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers.json import json_bytes
+
+from .awareness import awareness_level, meteoalarm_event_type
+from .const import AWARENESS_LEVEL_METEOALARM, DOMAIN
+from .geo import EARTH_RADIUS_KM, CircleShape, PolygonShape
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .cap_parser import CAPAlert
+    from .coordinator import CAPAlertsCoordinator
+
+CONTENT_TYPE_GEOJSON = "application/geo+json"
+
+# Number of vertices of polygons approximating CAP circles
+CIRCLE_VERTICES = 32
+
+
+def _polygon_geometry(polygon: PolygonShape) -> dict[str, Any]:
+    """Return GeoJSON polygon, coordinates are longitude, latitude pairs."""
+    ring = [[lon, lat] for lat, lon in zip(polygon.lats, polygon.lons, strict=True)]
+    ring.append(ring[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def _circle_geometry(circle: CircleShape) -> dict[str, Any]:
+    """Return GeoJSON polygon approximating the circle.
+
+    GeoJSON has no circles, the polygon vertices lie on the circle.
+    """
+    dlat = math.degrees(circle.radius_km / EARTH_RADIUS_KM)
+    dlon = dlat / max(math.cos(math.radians(circle.lat)), 0.01)
+    ring = [
+        [
+            circle.lon + dlon * math.sin(angle),
+            circle.lat + dlat * math.cos(angle),
+        ]
+        for angle in (
+            2 * math.pi * vertex / CIRCLE_VERTICES for vertex in range(CIRCLE_VERTICES)
+        )
+    ]
+    ring.append(ring[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def area_geometries(area: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return GeoJSON geometries of a parsed CAP area."""
+    geometries = []
+    if (polygon_text := area.get("polygon")) and (
+        polygon := PolygonShape.from_cap(polygon_text)
+    ):
+        geometries.append(_polygon_geometry(polygon))
+    if (circle_text := area.get("circle")) and (
+        circle := CircleShape.from_cap(circle_text)
+    ):
+        geometries.append(_circle_geometry(circle))
+    return geometries
+
+
+def alerts_feature_collection(
+    alerts: Iterable[CAPAlert], language_filter: str | None = None
+) -> dict[str, Any]:
+    """Return feature collection with a feature for every area with geometry.
+
+    Areas described only by geocodes have no geometry and are skipped.
+    """
+    features = []
+    for alert in alerts:
+        for info in alert.get_actionable_info_blocks(language_filter):
+            level = awareness_level(info.get("severity", ""))
+            properties = {
+                "identifier": alert.identifier,
+                "event": info.get("event", ""),
+                "headline": info.get("headline", ""),
+                "severity": info.get("severity", ""),
+                "awareness_level": AWARENESS_LEVEL_METEOALARM[level],
+                "awareness_type": meteoalarm_event_type(
+                    info.get("event", ""), info.get("parameters")
+                ),
+                "color": level,
+                "onset": info.get("onset", ""),
+                "expires": info.get("expires", ""),
+            }
+            for area in info.get("areas", []):
+                geometries = area_geometries(area)
+                if not geometries:
+                    continue
+                features.append(
+                    {
+                        "type": "Feature",
+                        "geometry": (
+                            geometries[0]
+                            if len(geometries) == 1
+                            else {
+                                "type": "GeometryCollection",
+                                "geometries": geometries,
+                            }
+                        ),
+                        "properties": {
+                            **properties,
+                            "area": area.get("areaDesc", ""),
+                            "geocodes": area.get("geocode", []),
+                        },
+                    }
+                )
+    return {"type": "FeatureCollection", "features": features}
+
+
+@dataclass(slots=True)
+class GeoJSONBody:
+    """Serialized feature collection of a coordinator data version."""
+
+    # Versions of a coordinator created by reloading the entry start again
+    coordinator: CAPAlertsCoordinator
+    data_version: int
+    body: bytes
+    etag: str
+
+
+class CHMIAlertsGeoJSONView(HomeAssistantView):
+    """Serve active alerts of a config entry as GeoJSON.
+
+    The body is serialized once per coordinator update, on the first request
+    after it, and its ETag is the content hash, so polling clients get
+    304 Not Modified until the alerts change.
+    """
+
+    url = "/api/chmi_alerts/{entry_id}/geojson"
+    name = "api:chmi_alerts:geojson"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+        self._cache: dict[str, GeoJSONBody] = {}
+
+    def async_forget(self, entry_id: str) -> None:
+        """Drop the cached body of an unloaded entry."""
+        self._cache.pop(entry_id, None)
+
+    def _get_body(
+        self, entry_id: str, coordinator: CAPAlertsCoordinator
+    ) -> GeoJSONBody:
+        """Return serialized alerts of the current coordinator data."""
+        cached = self._cache.get(entry_id)
+        if (
+            cached is None
+            or cached.coordinator is not coordinator
+            or cached.data_version != coordinator.data_version
+        ):
+            body = json_bytes(
+                alerts_feature_collection(
+                    coordinator.data or [], coordinator.language_filter
+                )
+            )
+            cached = self._cache[entry_id] = GeoJSONBody(
+                coordinator,
+                coordinator.data_version,
+                body,
+                f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            )
+        return cached
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return GeoJSON of the active alerts."""
+        coordinator: CAPAlertsCoordinator | None = self.hass.data.get(DOMAIN, {}).get(
+            entry_id
+        )
+        if coordinator is None:
+            self._cache.pop(entry_id, None)
+            return self.json_message("Config entry not found", HTTPStatus.NOT_FOUND)
+
+        cached = self._get_body(entry_id, coordinator)
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+        if cached.etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(
+            body=cached.body, content_type=CONTENT_TYPE_GEOJSON, headers=headers
+        )
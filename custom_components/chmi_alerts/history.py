@@ -0,0 +1,231 @@
+"""In-memory index over archived alerts."""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .awareness import awareness_level, classify_event_type
+from .cap_parser import CAPAlert
+from .const import EVENT_TYPE_OTHER
+from .lifecycle import MSG_TYPE_CANCEL, MSG_TYPE_UPDATE, MSG_TYPES_INACTIVE
+from .timeline import parse_time
+
+
+def event_type_key(event_type: str) -> str:
+    """Return lookup key of a MeteoAlarm event type.
+
+    Accepts both "1; Wind" and "wind".
+    """
+    return event_type.rsplit(";", 1)[-1].strip().casefold()
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    """Single archived warning (one classified info block)."""
+
+    identifier: str
+    start: datetime
+    end: datetime | None
+    event: str
+    event_type: str
+    level: str
+    geocodes: frozenset[str]
+    headline: str
+    # Archive month of the record, used to apply retention
+    month: str
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return JSON serializable representation."""
+        return {
+            "identifier": self.identifier,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat() if self.end else None,
+            "event": self.event,
+            "awareness_type": self.event_type,
+            "awareness_level": self.level,
+            "geocodes": sorted(self.geocodes),
+            "headline": self.headline,
+        }
+
+
+class HistoryIndex:
+    """Index of archived warnings by time, geocode, event type and level.
+
+    Entries are kept in a timeline sorted by start time, so time ranges are
+    located by bisection, and in inverted sets per geocode, event type and
+    level, which are intersected for the other filters. A newer version of
+    an archived alert and an Update message replace the entries of the
+    previous alert, so each warning is counted once, and a Cancel message
+    removes them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty index."""
+        self._entries: dict[int, HistoryEntry] = {}
+        # Sorted (start timestamp, entry id)
+        self._timeline: list[tuple[float, int]] = []
+        self._by_identifier: dict[str, list[int]] = {}
+        self._by_geocode: dict[str, set[int]] = {}
+        self._by_event_type: dict[str, set[int]] = {}
+        self._by_level: dict[str, set[int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        """Return number of indexed entries."""
+        return len(self._entries)
+
+    def add(self, record: dict[str, Any], month: str) -> None:
+        """Index an archive record."""
+        alert = CAPAlert(record["data"])
+        self._remove_identifier(record["identifier"])
+        # Updates replace and Cancels withdraw the referenced warnings
+        if alert.msg_type in {MSG_TYPE_UPDATE, MSG_TYPE_CANCEL}:
+            for _sender, identifier, _sent in alert.references:
+                self._remove_identifier(identifier)
+
+        if alert.msg_type in MSG_TYPES_INACTIVE:
+            return
+
+        received = datetime.fromisoformat(record["received"])
+        entries: dict[tuple, HistoryEntry] = {}
+        for info in alert.get_actionable_info_blocks():
+            geocodes = frozenset(
+                value
+                for area in info.get("areas", [])
+                for value in area.get("geocode", [])
+                if value
+            )
+            entry = HistoryEntry(
+                identifier=record["identifier"],
+                start=parse_time(info.get("onset"))
+                or parse_time(info.get("effective"))
+                or parse_time(alert.sent)
+                or received,
+                end=parse_time(info.get("expires")),
+                event=info.get("event", ""),
+                event_type=classify_event_type(
+                    info.get("event", ""), info.get("parameters")
+                )
+                or EVENT_TYPE_OTHER,
+                level=awareness_level(info.get("severity", "")),
+                geocodes=geocodes,
+                headline=info.get("headline", ""),
+                month=month,
+            )
+            # Info blocks in other languages describe the same warning
+            entries.setdefault(
+                (entry.start, entry.end, entry.event_type, entry.level, geocodes),
+                entry,
+            )
+
+        for entry in entries.values():
+            self._insert(entry)
+
+    def _insert(self, entry: HistoryEntry) -> None:
+        """Insert entry into all indexes."""
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = entry
+        bisect.insort(self._timeline, (entry.start.timestamp(), entry_id))
+        self._by_identifier.setdefault(entry.identifier, []).append(entry_id)
+        for geocode in entry.geocodes:
+            self._by_geocode.setdefault(geocode, set()).add(entry_id)
+        self._by_event_type.setdefault(event_type_key(entry.event_type), set()).add(
+            entry_id
+        )
+        self._by_level.setdefault(entry.level, set()).add(entry_id)
+
+    def _remove(self, entry_id: int) -> None:
+        """Remove entry from all indexes."""
+        entry = self._entries.pop(entry_id)
+        position = bisect.bisect_left(
+            self._timeline, (entry.start.timestamp(), entry_id)
+        )
+        del self._timeline[position]
+        for geocode in entry.geocodes:
+            self._by_geocode[geocode].discard(entry_id)
+        self._by_event_type[event_type_key(entry.event_type)].discard(entry_id)
+        self._by_level[entry.level].discard(entry_id)
+
+    def _remove_identifier(self, identifier: str) -> None:
+        """Remove entries of an alert."""
+        for entry_id in self._by_identifier.pop(identifier, []):
+            self._remove(entry_id)
+
+    def remove_month(self, month: str) -> None:
+        """Remove entries archived in a month."""
+        for entry_id, entry in list(self._entries.items()):
+            if entry.month == month:
+                self._by_identifier[entry.identifier].remove(entry_id)
+                if not self._by_identifier[entry.identifier]:
+                    del self._by_identifier[entry.identifier]
+                self._remove(entry_id)
+
+    def query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        geocode: str | None = None,
+        event_type: str | None = None,
+        level: str | None = None,
+    ) -> list[HistoryEntry]:
+        """Return entries starting within the time range matching the filters."""
+        low = 0
+        high = len(self._timeline)
+        if start is not None:
+            low = bisect.bisect_left(self._timeline, (start.timestamp(), -1))
+        if end is not None:
+            high = bisect.bisect_left(self._timeline, (end.timestamp(), -1))
+
+        filters: list[set[int]] = []
+        if geocode is not None:
+            filters.append(self._by_geocode.get(geocode, set()))
+        if event_type is not None:
+            filters.append(self._by_event_type.get(event_type_key(event_type), set()))
+        if level is not None:
+            filters.append(self._by_level.get(level, set()))
+
+        if not filters:
+            return [self._entries[entry_id] for _, entry_id in self._timeline[low:high]]
+
+        # Start from the most selective filter
+        filters.sort(key=len)
+        matching = set.intersection(*filters)
+        if len(matching) < high - low:
+            # Fewer matches than entries in the time range, check their times
+            selected = [
+                entry
+                for entry in (self._entries[entry_id] for entry_id in matching)
+                if (start is None or entry.start >= start)
+                and (end is None or entry.start < end)
+            ]
+            return sorted(selected, key=lambda entry: entry.start)
+        return [
+            self._entries[entry_id]
+            for _, entry_id in self._timeline[low:high]
+            if entry_id in matching
+        ]
+
+
+def summarize(entries: Iterable[HistoryEntry]) -> dict[str, Any]:
+    """Aggregate entries by level, event type and month."""
+    by_level: Counter[str] = Counter()
+    by_event_type: Counter[str] = Counter()
+    by_month: Counter[str] = Counter()
+    total = 0
+    for entry in entries:
+        total += 1
+        by_level[entry.level] += 1
+        by_event_type[entry.event_type] += 1
+        by_month[f"{entry.start.year:04d}-{entry.start.month:02d}"] += 1
+    return {
+        "total": total,
+        "by_level": dict(by_level),
+        "by_event_type": dict(by_event_type),
+        "by_month": dict(sorted(by_month.items())),
+    }
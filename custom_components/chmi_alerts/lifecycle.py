@@ -0,0 +1,101 @@
+"""Tracking of CAP alert lifecycle across feed updates."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from .cap_parser import CAPAlert
+from .timeline import parse_time
+
+_LOGGER = logging.getLogger(__name__)
+
+# (sender, identifier, sent) uniquely identifies a CAP message
+AlertKey = tuple[str, str, str]
+
+MSG_TYPE_ALERT = "Alert"
+MSG_TYPE_UPDATE = "Update"
+MSG_TYPE_CANCEL = "Cancel"
+# Acknowledgements and error messages never represent an active alert
+MSG_TYPES_INACTIVE = {MSG_TYPE_CANCEL, "Ack", "Error"}
+
+# Messages without valid sent time are applied before the others
+_UNKNOWN_SENT = datetime.min.replace(tzinfo=UTC)
+
+
+def _sent_time(alert: CAPAlert) -> datetime:
+    """Return sent time of the message for ordering."""
+    return parse_time(alert.sent) or _UNKNOWN_SENT
+
+
+class AlertLifecycleStore:
+    """Active alerts with CAP Update and Cancel messages applied.
+
+    Messages are keyed by (sender, identifier, sent). An Update replaces the
+    messages it references and a Cancel removes them, so superseded alerts
+    are dropped even while they are still present in the feed.
+
+    The store is updated incrementally: only messages not seen in the
+    previous feed are processed, and messages which disappeared from the
+    feed are removed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty store."""
+        self._active: dict[AlertKey, CAPAlert] = {}
+        # Messages in the feed which were replaced or cancelled
+        self._superseded: set[AlertKey] = set()
+        # All messages present in the last feed
+        self._seen: set[AlertKey] = set()
+
+    @property
+    def active(self) -> list[CAPAlert]:
+        """Return active alerts."""
+        return list(self._active.values())
+
+    def update(self, alerts: Iterable[CAPAlert]) -> list[CAPAlert]:
+        """Apply current feed content and return active alerts."""
+        current = {alert.key: alert for alert in alerts}
+
+        # Forget messages which are no longer in the feed
+        for key in self._seen - current.keys():
+            self._active.pop(key, None)
+
+        # References point to earlier messages, process new ones in order of
+        # the sent time, timestamps with different offsets are not comparable
+        # as text
+        new_alerts = sorted(
+            (alert for key, alert in current.items() if key not in self._seen),
+            key=_sent_time,
+        )
+        for alert in new_alerts:
+            self._apply(alert)
+
+        self._seen = set(current)
+        # Superseded messages are only relevant while present in the feed
+        self._superseded &= self._seen
+        return self.active
+
+    def _apply(self, alert: CAPAlert) -> None:
+        """Apply a single new message."""
+        key = alert.key
+        if key in self._superseded:
+            return
+
+        if alert.msg_type in {MSG_TYPE_UPDATE, MSG_TYPE_CANCEL}:
+            for reference in alert.references:
+                if self._active.pop(reference, None) is not None:
+                    _LOGGER.debug(
+                        "Alert %s superseded by %s %s",
+                        reference[1],
+                        alert.msg_type,
+                        alert.identifier,
+                    )
+                self._superseded.add(reference)
+
+        if alert.msg_type in MSG_TYPES_INACTIVE:
+            return
+
+        # Alert, Update and messages with unknown type are active
+        self._active[key] = alert
@@ -0,0 +1,81 @@
+"""Search over CISORP locations."""
+
+from __future__ import annotations
+
+import bisect
+import re
+
+from .cap_parser import normalize_text
+from .const import CISORP_CODE_TO_NAME, REGION_CODE_TO_NAME
+
+# Words of location names, "Brandýs nad Labem-Stará Boleslav" has five
+WORD_PATTERN = re.compile(r"[^\s-]+")
+
+
+class LocationIndex:
+    """Case and diacritics insensitive search index of locations.
+
+    Every normalized suffix of a location name starting at a word boundary,
+    and the location code, are kept in a sorted list, so locations with a
+    word starting with the query are found by bisection. Locations merely
+    containing the query are looked up in the normalized names.
+    """
+
+    def __init__(self, locations: dict[str, str]) -> None:
+        """Build index of location code to name mapping."""
+        # Preserve the order of the mapping in results
+        self._order = {code: position for position, code in enumerate(locations)}
+        self._names = {code: normalize_text(name) for code, name in locations.items()}
+        self._keys = sorted(
+            [
+                *(
+                    (name[match.start() :], code)
+                    for code, name in self._names.items()
+                    for match in WORD_PATTERN.finditer(name)
+                ),
+                *((code, code) for code in locations),
+            ]
+        )
+
+    def search(self, query: str) -> list[str]:
+        """Return codes of matching locations.
+
+        Locations with a word or code starting with the query come first,
+        followed by the locations containing it anywhere in the name.
+        """
+        query = normalize_text(query.strip())
+        if not query:
+            return list(self._order)
+
+        prefix_matches: set[str] = set()
+        position = bisect.bisect_left(self._keys, (query, ""))
+        while position < len(self._keys) and self._keys[position][0].startswith(query):
+            prefix_matches.add(self._keys[position][1])
+            position += 1
+
+        substring_matches = {
+            code
+            for code, name in self._names.items()
+            if code not in prefix_matches and query in name
+        }
+
+        return [
+            *sorted(prefix_matches, key=self._order.__getitem__),
+            *sorted(substring_matches, key=self._order.__getitem__),
+        ]
+
+
+LOCATION_INDEX = LocationIndex(CISORP_CODE_TO_NAME)
+
+# Region code of each location, the first two digits of its code
+LOCATION_REGION = {code: code[:2] for code in CISORP_CODE_TO_NAME}
+
+# Locations of each region, alert geocodes are matched against these sets
+REGION_LOCATIONS: dict[str, frozenset[str]] = {
+    region: frozenset(
+        code
+        for code, location_region in LOCATION_REGION.items()
+        if location_region == region
+    )
+    for region in REGION_CODE_TO_NAME
+}
@@ -0,0 +1,215 @@
+"""Sensor platform for CHMI Alerts integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_LOCATIONS,
+    AWARENESS_ICONS,
+    AWARENESS_LEVEL_GREEN,
+    AWARENESS_LEVEL_ORANGE,
+    AWARENESS_LEVEL_RED,
+    AWARENESS_LEVEL_YELLOW,
+    CONF_LOCATION_LEVELS,
+    DOMAIN,
+)
+from .coordinator import CAPAlertsCoordinator
+from .timeline import TimelineForecast
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up CHMI Alerts sensors from a config entry."""
+    coordinator: CAPAlertsCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    forecast = CAPAlertsForecastTracker(hass, coordinator)
+    entry.async_on_unload(forecast.async_shutdown)
+    entry.async_on_unload(coordinator.async_add_listener(forecast.async_refresh))
+    forecast.async_refresh()
+
+    entities: list[SensorEntity] = [
+        CAPNextOnsetSensor(forecast, entry),
+        CAPActiveUntilSensor(forecast, entry),
+        CAPUpcomingLevelSensor(forecast, entry),
+    ]
+    if entry.data.get(CONF_LOCATION_LEVELS):
+        entities.append(CAPLocationLevelsSensor(coordinator, entry))
+    async_add_entities(entities)
+
+
+class CAPLocationLevelsSensor(CoordinatorEntity[CAPAlertsCoordinator], SensorEntity):
+    """Sensor with the awareness level of every location.
+
+    The state is the number of locations with a warning, the locations
+    attribute maps each CISORP code to its awareness level.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "location_levels"
+    _attr_icon = "mdi:map-marker-alert"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    # The mapping changes with every warning, keep it out of the recorder
+    _unrecorded_attributes = frozenset({ATTR_LOCATIONS})
+
+    def __init__(self, coordinator: CAPAlertsCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_location_levels"
+
+    @property
+    def native_value(self) -> int:
+        """Return number of locations with a warning."""
+        return sum(
+            level != AWARENESS_LEVEL_GREEN
+            for level in self.coordinator.location_levels.values()
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return awareness level of each location."""
+        return {ATTR_LOCATIONS: self.coordinator.location_levels}
+
+
+class CAPAlertsForecastTracker:
+    """Forecast of the entry alerts, refreshed when it changes.
+
+    The forecast is recomputed on coordinator updates and by a single timer
+    scheduled at the next start or end of a warning, all forecast sensors
+    are notified from it.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: CAPAlertsCoordinator) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.forecast = coordinator.timeline.forecast(dt_util.utcnow())
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for forecast changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_refresh(self, now: datetime | None = None) -> None:
+        """Recompute forecast and schedule the next refresh."""
+        self.async_shutdown()
+        self.forecast = self.coordinator.timeline.forecast(dt_util.utcnow())
+        if self.forecast.next_change is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self.async_refresh, self.forecast.next_change
+            )
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the scheduled refresh."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+
+class CAPForecastSensor(SensorEntity):
+    """Base of sensors showing a value of the alerts forecast."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _key: str
+
+    def __init__(self, tracker: CAPAlertsForecastTracker, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._tracker = tracker
+        self._attr_unique_id = f"{entry.entry_id}_chmi_alerts_{self._key}"
+        self._attr_translation_key = self._key
+
+    @property
+    def available(self) -> bool:
+        """Return if the alerts were fetched."""
+        return self._tracker.coordinator.last_update_success
+
+    @property
+    def _forecast(self) -> TimelineForecast:
+        """Return current forecast."""
+        return self._tracker.forecast
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to forecast changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._tracker.async_add_listener(self.async_write_ha_state)
+        )
+
+
+class CAPNextOnsetSensor(CAPForecastSensor):
+    """Sensor with the start of the next warning."""
+
+    _key = "next_onset"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:clock-alert-outline"
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return start of the next warning."""
+        return self._forecast.next_onset
+
+
+class CAPActiveUntilSensor(CAPForecastSensor):
+    """Sensor with the end of the currently active warnings."""
+
+    _key = "active_until"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:clock-end"
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return end of the last active warning."""
+        return self._forecast.active_until
+
+
+class CAPUpcomingLevelSensor(CAPForecastSensor):
+    """Sensor with the highest level of the active and upcoming warnings."""
+
+    _key = "upcoming_level"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [
+        AWARENESS_LEVEL_GREEN,
+        AWARENESS_LEVEL_YELLOW,
+        AWARENESS_LEVEL_ORANGE,
+        AWARENESS_LEVEL_RED,
+    ]
+
+    @property
+    def native_value(self) -> str:
+        """Return highest awareness level."""
+        return self._forecast.upcoming_level
+
+    @property
+    def icon(self) -> str:
+        """Return icon of the level."""
+        return AWARENESS_ICONS.get(self._forecast.upcoming_level, "mdi:alert")
@@ -0,0 +1,180 @@
+"""Index of alert validity intervals."""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from .awareness import LEVEL_PRIORITY, awareness_level
+from .const import AWARENESS_LEVEL_GREEN
+
+if TYPE_CHECKING:
+    from .cap_parser import CAPAlert
+
+# Shown duration of warnings without expiry time
+OPEN_ENDED_DURATION = timedelta(days=1)
+
+
+def parse_time(value: str | None) -> datetime | None:
+    """Parse CAP timestamp, timestamps without offset are treated as UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineEntry:
+    """Validity interval of an actionable info block."""
+
+    start: datetime
+    end: datetime
+    alert: CAPAlert
+    info: dict[str, Any]
+    level: str = AWARENESS_LEVEL_GREEN
+    # Set when the block has no expiry and the end is only estimated
+    open_ended: bool = False
+    # Position of the info block in the alert
+    position: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineForecast:
+    """State of the timeline at a point in time."""
+
+    # Start of the next warning
+    next_onset: datetime | None
+    # End of the last currently active warning, None also when an active
+    # warning has no expiry
+    active_until: datetime | None
+    # Highest level of active and upcoming warnings
+    upcoming_level: str
+    # When any of the above changes next
+    next_change: datetime | None
+
+
+class AlertTimeline:
+    """Interval index over validity of alert info blocks.
+
+    Entries are sorted by start time. As no entry lasts longer than the
+    longest one, the entries overlapping a time range all start between the
+    range start minus the longest duration and the range end, which is
+    located by bisection.
+    """
+
+    def __init__(self, entries: Iterable[TimelineEntry] = ()) -> None:
+        """Build index of the entries."""
+        self.entries = sorted(entries, key=lambda entry: entry.start)
+        self._starts = [entry.start.timestamp() for entry in self.entries]
+        self._max_duration = max(
+            ((entry.end - entry.start).total_seconds() for entry in self.entries),
+            default=0.0,
+        )
+        # Highest level of the entries starting at each position and later
+        self._suffix_levels = [AWARENESS_LEVEL_GREEN] * (len(self.entries) + 1)
+        for position in range(len(self.entries) - 1, -1, -1):
+            self._suffix_levels[position] = max(
+                self.entries[position].level,
+                self._suffix_levels[position + 1],
+                key=LEVEL_PRIORITY.__getitem__,
+            )
+
+    def __len__(self) -> int:
+        """Return number of indexed entries."""
+        return len(self.entries)
+
+    @classmethod
+    def from_alerts(
+        cls, alerts: Iterable[CAPAlert], language_filter: str | None = None
+    ) -> AlertTimeline:
+        """Build index of the actionable info blocks of the alerts.
+
+        Info blocks start at onset, effective or sent time, in this order of
+        preference. Blocks without expiry last OPEN_ENDED_DURATION.
+        """
+        entries = []
+        for alert in alerts:
+            sent = parse_time(alert.sent)
+            actionable = {
+                id(info) for info in alert.get_actionable_info_blocks(language_filter)
+            }
+            for position, info in enumerate(alert.info):
+                if id(info) not in actionable:
+                    continue
+                start = (
+                    parse_time(info.get("onset"))
+                    or parse_time(info.get("effective"))
+                    or sent
+                )
+                if start is None:
+                    continue
+                expires = parse_time(info.get("expires"))
+                end = expires or start + OPEN_ENDED_DURATION
+                entries.append(
+                    TimelineEntry(
+                        start,
+                        max(start, end),
+                        alert,
+                        info,
+                        awareness_level(info.get("severity", "")),
+                        open_ended=expires is None,
+                        position=position,
+                    )
+                )
+        return cls(entries)
+
+    def overlapping(self, start: datetime, end: datetime) -> list[TimelineEntry]:
+        """Return entries valid at any time within the range, by start time."""
+        start_timestamp = start.timestamp()
+        low = bisect.bisect_left(self._starts, start_timestamp - self._max_duration)
+        high = bisect.bisect_left(self._starts, end.timestamp())
+        return [entry for entry in self.entries[low:high] if entry.end > start]
+
+    def active_or_next(self, now: datetime) -> TimelineEntry | None:
+        """Return the earliest starting entry which has not ended yet."""
+        low = bisect.bisect_left(self._starts, now.timestamp() - self._max_duration)
+        return next(
+            (entry for entry in islice(self.entries, low, None) if entry.end > now),
+            None,
+        )
+
+    def forecast(self, now: datetime) -> TimelineForecast:
+        """Return the active and upcoming warnings summary at a time.
+
+        The next change is the earliest of the next start and the ends of
+        the active entries. The estimated end of an entry without expiry is
+        not reported as the end of the active warnings.
+        """
+        timestamp = now.timestamp()
+        low = bisect.bisect_left(self._starts, timestamp - self._max_duration)
+        upcoming = bisect.bisect_right(self._starts, timestamp)
+        active = [entry for entry in self.entries[low:upcoming] if entry.end > now]
+
+        next_onset = (
+            self.entries[upcoming].start if upcoming < len(self.entries) else None
+        )
+        ends = [entry.end for entry in active]
+        return TimelineForecast(
+            next_onset=next_onset,
+            active_until=(
+                None
+                if any(entry.open_ended for entry in active)
+                else max(ends, default=None)
+            ),
+            upcoming_level=max(
+                (self._suffix_levels[upcoming], *(entry.level for entry in active)),
+                key=LEVEL_PRIORITY.__getitem__,
+            ),
+            next_change=min(
+                (*ends, *([next_onset] if next_onset else [])), default=None
+            ),
+        )
@@ -0,0 +1,173 @@
+"""Automation triggers of CHMI alerts."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.const import CONF_PLATFORM
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .alert_triggers import AlertChange, AlertTriggerFilter, AlertTriggers
+from .awareness import event_type_id
+from .cap_parser import normalize_text
+from .const import (
+    AWARENESS_LEVEL_METEOALARM,
+    AWARENESS_LEVEL_ORANGE,
+    AWARENESS_LEVEL_RED,
+    AWARENESS_LEVEL_YELLOW,
+    CISORP_CODE_TO_NAME,
+    DATA_TRIGGERS,
+    DOMAIN,
+    HAZARD_TYPES,
+    TRIGGER_EVENT_ENDED,
+    TRIGGER_EVENT_NEW,
+    TRIGGER_EVENT_UPDATED,
+)
+from .locations import REGION_LOCATIONS
+
+CONF_CONFIG_ENTRY_ID = "config_entry_id"
+CONF_EVENT = "event"
+CONF_AWARENESS_LEVEL = "awareness_level"
+CONF_HAZARD = "hazard"
+CONF_LOCATION = "location"
+CONF_KEYWORD = "keyword"
+
+# Hazard identifiers by lower case English and Czech names
+_HAZARD_NAMES = {
+    name.lower(): hazard
+    for hazard, names in HAZARD_TYPES.items()
+    for name in names.values()
+}
+
+
+def hazard_type(value: Any) -> str:
+    """Validate hazard type given by identifier, name or MeteoAlarm type."""
+    text = str(value).strip()
+    if (hazard := event_type_id(text)) in HAZARD_TYPES:
+        return hazard
+    if (hazard := _HAZARD_NAMES.get(text.lower())) is not None:
+        return hazard
+    raise vol.Invalid(f"Unknown hazard type: {value}")
+
+
+def location_codes(value: Any) -> list[str]:
+    """Validate CISORP location code, region codes expand to their locations."""
+    code = str(value).strip()
+    if code in CISORP_CODE_TO_NAME:
+        return [code]
+    if code in REGION_LOCATIONS:
+        return sorted(REGION_LOCATIONS[code])
+    raise vol.Invalid(f"Unknown location code: {value}")
+
+
+TRIGGER_SCHEMA = cv.TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_PLATFORM): DOMAIN,
+        vol.Required(CONF_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(CONF_EVENT, default=TRIGGER_EVENT_NEW): vol.In(
+            [TRIGGER_EVENT_NEW, TRIGGER_EVENT_UPDATED, TRIGGER_EVENT_ENDED]
+        ),
+        vol.Optional(CONF_AWARENESS_LEVEL): vol.In(
+            [AWARENESS_LEVEL_YELLOW, AWARENESS_LEVEL_ORANGE, AWARENESS_LEVEL_RED]
+        ),
+        vol.Optional(CONF_HAZARD, default=[]): vol.All(cv.ensure_list, [hazard_type]),
+        vol.Optional(CONF_LOCATION, default=[]): vol.All(
+            cv.ensure_list, [location_codes]
+        ),
+        vol.Optional(CONF_KEYWORD): cv.string,
+    }
+)
+
+
+def _trigger_filter(config: ConfigType) -> AlertTriggerFilter:
+    """Return filter of the validated trigger configuration."""
+    keyword = config.get(CONF_KEYWORD)
+    return AlertTriggerFilter(
+        event=config[CONF_EVENT],
+        level=config.get(CONF_AWARENESS_LEVEL),
+        hazards=frozenset(config[CONF_HAZARD]),
+        locations=frozenset(code for codes in config[CONF_LOCATION] for code in codes),
+        keyword=normalize_text(keyword) if keyword else None,
+    )
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Listen for alert changes matching the configured filters.
+
+    The filters are evaluated by the config entry for every changed info
+    block, the automation runs only when they match.
+    """
+    entry_id = config[CONF_CONFIG_ENTRY_ID]
+    trigger_data = trigger_info["trigger_data"]
+    job = HassJob(action, f"chmi_alerts trigger {trigger_info}")
+    # The entry may not be set up yet, it picks up the triggers then
+    triggers: AlertTriggers = hass.data.setdefault(DATA_TRIGGERS, {}).setdefault(
+        entry_id, AlertTriggers()
+    )
+
+    @callback
+    def async_on_change(change: AlertChange) -> None:
+        """Run the automation for a matching alert change."""
+        info = change.info
+        headline = info.get("headline") or info.get("event") or change.alert.identifier
+        previous = change.previous
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    "platform": DOMAIN,
+                    "event": change.event,
+                    "config_entry_id": entry_id,
+                    "identifier": change.alert.identifier,
+                    "msg_type": change.alert.msg_type,
+                    "references": [
+                        ",".join(reference) for reference in change.alert.references
+                    ],
+                    "previous_identifier": (
+                        previous.alert.identifier if previous else ""
+                    ),
+                    "previous_awareness_level": (
+                        AWARENESS_LEVEL_METEOALARM[previous.level] if previous else ""
+                    ),
+                    "headline": headline,
+                    "awareness_level": AWARENESS_LEVEL_METEOALARM[change.level],
+                    "awareness_type": change.event_type,
+                    "severity": info.get("severity", ""),
+                    "onset": info.get("onset", ""),
+                    "expires": info.get("expires", ""),
+                    "area": ", ".join(
+                        area["areaDesc"]
+                        for area in info.get("areas", [])
+                        if area.get("areaDesc")
+                    ),
+                    "geocodes": sorted(change.geocodes),
+                    "description": f"CHMI alert {change.event}: {headline}",
+                }
+            },
+        )
+
+    remove = triggers.async_add(_trigger_filter(config), async_on_change)
+
+    @callback
+    def async_remove() -> None:
+        """Detach the trigger, dropping the registry of an unloaded entry."""
+        remove()
+        all_triggers = hass.data.get(DATA_TRIGGERS, {})
+        if (
+            not triggers
+            and entry_id not in hass.data.get(DOMAIN, {})
+            and all_triggers.get(entry_id) is triggers
+        ):
+            all_triggers.pop(entry_id)
+
+    return async_remove
@@ -1 +1,50 @@
 """Tests for CHMI Alerts integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.chmi_alerts.cap_parser import CAPAlert
+
+SENDER = "test@example.com"
+
+
+def make_alert(
+    identifier: str = "ALERT-1",
+    *,
+    sent: str = "2026-01-01T00:00:00+01:00",
+    msg_type: str = "Alert",
+    references: str = "",
+    languages: tuple[str, ...] = ("cs",),
+    geocodes: tuple[str, ...] = ("2101",),
+    **info: Any,
+) -> CAPAlert:
+    """Create alert with the same warning in each of the languages.
+
+    The info blocks are a likely moderate wind warning in the geocodes,
+    headlined by the identifier and language. Keyword arguments override
+    their fields and None leaves a field out.
+    """
+    data = {
+        "identifier": identifier,
+        "sender": SENDER,
+        "sent": sent,
+        "msgType": msg_type,
+        "info": [],
+    }
+    if references:
+        data["references"] = references
+    for language in languages:
+        fields = {
+            "language": language,
+            "event": "Strong wind",
+            "headline": f"{identifier} {language}",
+            "severity": "Moderate",
+            "certainty": "Likely",
+            "areas": [{"areaDesc": "Benešov", "geocode": list(geocodes)}],
+            **info,
+        }
+        data["info"].append(
+            {key: value for key, value in fields.items() if value is not None}
+        )
+    return CAPAlert(data)
@@ -0,0 +1,90 @@
+"""Tests for the alert archive."""
+
+import gzip
+import json
+from datetime import UTC, datetime
+
+from custom_components.chmi_alerts.archive import AlertArchive
+
+from . import make_alert
+
+JANUARY = datetime(2026, 1, 15, 12, 0, tzinfo=UTC)
+FEBRUARY = datetime(2026, 2, 10, 12, 0, tzinfo=UTC)
+MARCH = datetime(2026, 3, 5, 12, 0, tzinfo=UTC)
+
+
+def test_append_deduplicates(tmp_path):
+    """Test unchanged alerts are archived only once."""
+    archive = AlertArchive(tmp_path, retention_days=365)
+
+    assert archive.append([make_alert("ALERT-1"), make_alert("ALERT-2")], JANUARY) == 2
+    assert archive.append([make_alert("ALERT-1"), make_alert("ALERT-2")], JANUARY) == 0
+    # Changed content is archived again
+    assert archive.append([make_alert("ALERT-1", headline="Mráz")], JANUARY) == 1
+
+    # The index keeps the newest version of an alert
+    assert {entry.identifier: entry.headline for entry in archive.query()} == {
+        "ALERT-1": "Mráz",
+        "ALERT-2": "ALERT-2 cs",
+    }
+
+    # Appends are separate gzip members of a single file
+    with gzip.open(tmp_path / "alerts-2026-01.jsonl.gz", "rt") as handle:
+        assert len([json.loads(line) for line in handle]) == 3
+
+
+def test_load_restores_deduplication(tmp_path):
+    """Test archived alerts are not stored again after restart."""
+    AlertArchive(tmp_path, retention_days=365).append([make_alert("ALERT-1")], JANUARY)
+
+    archive = AlertArchive(tmp_path, retention_days=365)
+    archive.load(JANUARY)
+
+    assert archive.append([make_alert("ALERT-1"), make_alert("ALERT-2")], FEBRUARY) == 1
+    assert archive.months() == ["2026-01", "2026-02"]
+
+
+def test_time_range(tmp_path):
+    """Test querying warnings starting in a time range."""
+    archive = AlertArchive(tmp_path, retention_days=365)
+    for identifier, received in (
+        ("ALERT-1", JANUARY),
+        ("ALERT-2", FEBRUARY),
+        ("ALERT-3", MARCH),
+    ):
+        archive.append([make_alert(identifier, onset=received.isoformat())], received)
+
+    entries = archive.query(
+        start=datetime(2026, 2, 1, tzinfo=UTC), end=datetime(2026, 3, 1, tzinfo=UTC)
+    )
+    assert [entry.identifier for entry in entries] == ["ALERT-2"]
+
+
+def test_retention(tmp_path):
+    """Test archive files older than retention are removed."""
+    archive = AlertArchive(tmp_path, retention_days=30)
+    archive.append([make_alert("ALERT-1")], JANUARY)
+    archive.append([make_alert("ALERT-2")], FEBRUARY)
+
+    # January ended more than 30 days before March 5
+    archive.append([make_alert("ALERT-3")], MARCH)
+
+    assert archive.months() == ["2026-02", "2026-03"]
+    assert sorted(entry.identifier for entry in archive.query()) == [
+        "ALERT-2",
+        "ALERT-3",
+    ]
+    # Removed alerts are archived again when received
+    assert archive.append([make_alert("ALERT-1")], MARCH) == 1
+
+
+def test_remove(tmp_path):
+    """Test removing the archive deletes its files."""
+    archive = AlertArchive(tmp_path / "entry", retention_days=365)
+    archive.append([make_alert("ALERT-1")], JANUARY)
+
+    archive.remove()
+
+    assert not (tmp_path / "entry").exists()
+    assert archive.query() == []
+    assert archive.append([make_alert("ALERT-1")], JANUARY) == 1
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from unittest.mock import Mock
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
 
+from custom_components.chmi_alerts.awareness import (
+    classify_event_type,
+    group_by_event_type,
+    meteoalarm_event_type,
+)
 from custom_components.chmi_alerts.binary_sensor import CAPAlertsBinarySensor
-from custom_components.chmi_alerts.const import CONF_AREA_FILTER
+from custom_components.chmi_alerts.const import (
+    ATTRIBUTE_MODE_COMPACT,
+    CONF_AREA_FILTER,
+    CONF_ATTRIBUTE_MODE,
+)
 
 # Enable asyncio for all tests in this module
 pytestmark = pytest.mark.asyncio
@@ -19,6 +29,8 @@ def mock_coordinator():
     """Create a mock coordinator."""
     coordinator = Mock()
     coordinator.data = []
+    coordinator.data_version = 0
+    coordinator.stale = False
     coordinator.language_filter = "en"
     coordinator.hass = Mock()
     coordinator.hass.config = Mock()
@@ -90,3 +102,261 @@ async def test_entity_unique_id_format(mock_coordinator):
 
     sensor_no_area = CAPAlertsBinarySensor(mock_coordinator, entry_no_area)
     assert sensor_no_area.unique_id == "entry_2_chmi_alerts"
+
+
+async def test_zone_sensor(mock_coordinator, mock_entry_without_area):
+    """Test zone sensor uses zone name and alerts covering the zone."""
+    zone_state = Mock()
+    zone_state.name = "Home"
+    mock_coordinator.hass.states.get.return_value = zone_state
+    mock_coordinator.zone_infos = {"zone.home": []}
+
+    sensor = CAPAlertsBinarySensor(
+        mock_coordinator, mock_entry_without_area, zone="zone.home"
+    )
+
+    assert sensor.name == "Alerts Home"
+    assert sensor.unique_id == "test_entry_id_chmi_alerts_zone.home"
+    assert sensor.is_on is False
+
+    alert = Mock()
+    alert.identifier = "TEST-ZONE-001"
+    alert.sender = "test@example.com"
+    mock_coordinator.zone_infos = {
+        "zone.home": [(alert, {"event": "Strong Wind", "severity": "Moderate"})]
+    }
+    mock_coordinator.data_version += 1
+
+    assert sensor.is_on is True
+    attributes = sensor.extra_state_attributes
+    assert attributes["awareness_level"] == "3; Orange"
+    assert attributes["alert_count"] == 1
+    assert attributes["alerts"][0]["identifier"] == "TEST-ZONE-001"
+
+
+async def test_area_target_sensor(mock_coordinator, mock_entry_without_area):
+    """Test area target sensors use only the info blocks covering them."""
+    alert = Mock()
+    alert.identifier = "TEST-AREA-001"
+    alert.sender = "test@example.com"
+    alert.get_actionable_info_blocks.return_value = [
+        {"event": "Frost", "severity": "Minor"},
+        {"event": "Strong Wind", "severity": "Severe"},
+    ]
+    mock_coordinator.area_infos = {
+        "2101": [(alert, {"event": "Frost", "severity": "Minor"})]
+    }
+
+    benesov = CAPAlertsBinarySensor(
+        mock_coordinator, mock_entry_without_area, area="2101"
+    )
+    brno = CAPAlertsBinarySensor(mock_coordinator, mock_entry_without_area, area="6203")
+
+    assert benesov.name == "Alerts Benešov"
+    assert benesov.unique_id == "test_entry_id_chmi_alerts_area_2101"
+    assert benesov.is_on is True
+    attributes = benesov.extra_state_attributes
+    assert attributes["awareness_level"] == "2; Yellow"
+    assert attributes["alert_count"] == 1
+
+    assert brno.name == "Alerts Brno"
+    assert brno.is_on is False
+
+
+async def test_hazard_sensors(mock_coordinator, mock_entry_with_area):
+    """Test hazard sensors show only warnings of their type."""
+    alert = Mock()
+    alert.identifier = "TEST-HAZARD-001"
+    alert.sender = "test@example.com"
+    alert.get_actionable_info_blocks.return_value = [
+        {
+            "event": "Silný vítr",
+            "severity": "Moderate",
+            "parameters": {"awareness_type": "1; wind"},
+        },
+        {
+            "event": "Mráz",
+            "severity": "Minor",
+            "parameters": {"awareness_type": "6; low-temperature"},
+        },
+        {"event": "Zvláštní upozornění", "severity": "Severe"},
+    ]
+    mock_coordinator.data = [alert]
+    mock_coordinator.hazard_infos = group_by_event_type([alert])
+    assert set(mock_coordinator.hazard_infos) == {"1", "6"}
+
+    wind = CAPAlertsBinarySensor(mock_coordinator, mock_entry_with_area, hazard="1")
+    frost = CAPAlertsBinarySensor(mock_coordinator, mock_entry_with_area, hazard="6")
+    fog = CAPAlertsBinarySensor(mock_coordinator, mock_entry_with_area, hazard="4")
+
+    assert wind.name == "Alerts Wind Nový Bor"
+    assert wind.unique_id == "test_entry_id_chmi_alerts_hazard_1"
+    assert wind.is_on is True
+    assert wind.extra_state_attributes["awareness_level"] == "3; Orange"
+    assert wind.extra_state_attributes["alert_count"] == 1
+
+    assert frost.is_on is True
+    assert frost.extra_state_attributes["awareness_level"] == "2; Yellow"
+
+    assert fog.is_on is False
+
+    mock_coordinator.hass.config.language = "cs"
+    assert frost.name == "Výstrahy Nízké teploty Nový Bor"
+
+
+@pytest.mark.parametrize(
+    ("event", "expected"),
+    [
+        ("Ice storm", "2; Snow/Ice"),
+        ("Wildfire", "8; Forest Fire"),
+        ("Thunderstorms", "3; Thunderstorm"),
+        ("Strong Wind", "1; Wind"),
+        ("Povodňová pohotovost", "5; High Temperature"),
+        ("Bouřky s přívalovými srážkami", None),
+        ("Silný vítr", None),
+        ("", None),
+    ],
+)
+async def test_classify_event_type(event, expected):
+    """Test unknown events are shown as wind, but have no type for grouping."""
+    assert classify_event_type(event) == expected
+    assert meteoalarm_event_type(event) == (expected or "1; Wind")
+
+
+@pytest.fixture
+def mock_alert():
+    """Create a mock alert with one actionable info block."""
+    alert = Mock()
+    alert.identifier = "TEST-DETAILS-001"
+    alert.sender = "test@example.com"
+    alert.get_actionable_info_blocks.return_value = [
+        {
+            "event": "Silný mráz",
+            "severity": "Moderate",
+            "headline": "Silný mráz",
+            "description": "Long description of the alert",
+            "instruction": "Long instruction",
+            "parameters": {"awareness_type": "6; low-temperature"},
+        }
+    ]
+    return alert
+
+
+async def test_compact_attribute_mode(
+    mock_coordinator, mock_entry_without_area, mock_alert
+):
+    """Test compact mode keeps only identifiers, levels and types."""
+    mock_coordinator.data = [mock_alert]
+    mock_entry_without_area.data = {
+        CONF_AREA_FILTER: "",
+        CONF_ATTRIBUTE_MODE: ATTRIBUTE_MODE_COMPACT,
+    }
+    sensor = CAPAlertsBinarySensor(mock_coordinator, mock_entry_without_area)
+
+    attributes = sensor.extra_state_attributes
+
+    assert attributes["awareness_level"] == "3; Orange"
+    assert attributes["awareness_type"] == "6; Low-Temperature"
+    assert attributes["alert_count"] == 1
+    assert attributes["alerts"] == [
+        {
+            "identifier": "TEST-DETAILS-001",
+            "awareness_level": "3; Orange",
+            "awareness_type": "6; Low-Temperature",
+        }
+    ]
+
+
+async def test_alerts_attribute_unrecorded(mock_coordinator, mock_entry_without_area):
+    """Test the bulky alerts attribute is excluded from the recorder."""
+    sensor = CAPAlertsBinarySensor(mock_coordinator, mock_entry_without_area)
+
+    assert "alerts" in sensor._unrecorded_attributes  # noqa: SLF001
+    assert "awareness_level" not in sensor._unrecorded_attributes  # noqa: SLF001
+
+
+async def test_get_alert_details(mock_coordinator, mock_entry_without_area, mock_alert):
+    """Test the service returns full alert details."""
+    mock_coordinator.data = [mock_alert]
+    sensor = CAPAlertsBinarySensor(mock_coordinator, mock_entry_without_area)
+
+    response = await sensor.async_get_alert_details()
+
+    assert len(response["alerts"]) == 1
+    details = response["alerts"][0]
+    assert details["identifier"] == "TEST-DETAILS-001"
+    assert details["description"] == "Long description of the alert"
+    assert details["instruction"] == "Long instruction"
+
+    response = await sensor.async_get_alert_details(identifier="TEST-DETAILS-001")
+    assert len(response["alerts"]) == 1
+
+    response = await sensor.async_get_alert_details(identifier="OTHER")
+    assert response["alerts"] == []
+
+
+async def test_state_cached_per_data_version(
+    mock_coordinator, mock_entry_without_area, mock_alert
+):
+    """Test state attributes are computed once per coordinator data version."""
+    mock_coordinator.data = [mock_alert]
+    sensor = CAPAlertsBinarySensor(mock_coordinator, mock_entry_without_area)
+
+    attributes = sensor.extra_state_attributes
+    assert sensor.is_on is True
+    assert sensor.icon == "mdi:alert-circle"
+    assert sensor.extra_state_attributes is attributes
+    assert mock_alert.get_actionable_info_blocks.call_count == 2
+
+    # New data invalidates the cache
+    mock_coordinator.data = []
+    assert sensor.extra_state_attributes is attributes
+    mock_coordinator.data_version += 1
+    assert sensor.is_on is False
+    assert sensor.extra_state_attributes["alert_count"] == 0
+
+
+async def test_unchanged_state_not_written(
+    mock_coordinator, mock_entry_without_area, mock_alert
+):
+    """Test coordinator updates with the same rendered state skip the write."""
+    mock_coordinator.data = [mock_alert]
+    mock_coordinator.last_update_success = True
+    sensor = CAPAlertsBinarySensor(mock_coordinator, mock_entry_without_area)
+    sensor.async_write_ha_state = Mock()
+
+    sensor._handle_coordinator_update()  # noqa: SLF001
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # New data version with identical content
+    mock_coordinator.data_version += 1
+    sensor._handle_coordinator_update()  # noqa: SLF001
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # Availability change is written
+    mock_coordinator.last_update_success = False
+    sensor._handle_coordinator_update()  # noqa: SLF001
+    assert sensor.async_write_ha_state.call_count == 2
+
+    # Changed alerts are written
+    mock_coordinator.last_update_success = True
+    mock_coordinator.data = []
+    mock_coordinator.data_version += 1
+    sensor._handle_coordinator_update()  # noqa: SLF001
+    assert sensor.async_write_ha_state.call_count == 3
+
+
+async def test_stale_data_marked(mock_coordinator, mock_entry_without_area, mock_alert):
+    """Test alerts kept after a failed fetch are marked stale."""
+    mock_coordinator.data = [mock_alert]
+    sensor = CAPAlertsBinarySensor(mock_coordinator, mock_entry_without_area)
+    assert "stale" not in sensor.extra_state_attributes
+
+    mock_coordinator.stale = True
+    mock_coordinator.last_success = datetime(2026, 1, 5, 10, 0, tzinfo=UTC)
+    mock_coordinator.data_version += 1
+
+    attributes = sensor.extra_state_attributes
+    assert sensor.is_on is True
+    assert attributes["stale"] is True
+    assert attributes["last_successful_update"] == "2026-01-05T10:00:00+00:00"
@@ -0,0 +1,109 @@
+"""Test the CHMI Alerts calendar."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+
+from custom_components.chmi_alerts.calendar import CAPAlertsCalendar
+from custom_components.chmi_alerts.cap_parser import CAPAlert
+from custom_components.chmi_alerts.timeline import AlertTimeline
+
+from . import make_alert
+
+# Enable asyncio for all tests in this module
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def calendar():
+    """Create calendar with a single alert."""
+    alert = CAPAlert(
+        {
+            "identifier": "ALERT-1",
+            "info": [
+                {
+                    "language": "en",
+                    "event": "Strong Wind",
+                    "headline": "Strong wind warning",
+                    "description": "Gusts up to 25 m/s.",
+                    "instruction": "Secure loose objects.",
+                    "severity": "Moderate",
+                    "certainty": "Likely",
+                    "onset": "2026-01-05T10:00:00+01:00",
+                    "expires": "2026-01-06T10:00:00+01:00",
+                    "areas": [{"areaDesc": "Benešov"}, {"areaDesc": "Beroun"}],
+                }
+            ],
+        }
+    )
+    coordinator = Mock()
+    coordinator.timeline = AlertTimeline.from_alerts([alert])
+    entry = Mock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    return CAPAlertsCalendar(coordinator, entry)
+
+
+async def test_get_events(calendar):
+    """Test events are returned for the requested range."""
+    events = await calendar.async_get_events(
+        Mock(),
+        datetime(2026, 1, 6, tzinfo=UTC),
+        datetime(2026, 1, 7, tzinfo=UTC),
+    )
+
+    (event,) = events
+    assert event.summary == "Strong wind warning"
+    assert event.description == "Gusts up to 25 m/s.\n\nSecure loose objects."
+    assert event.location == "Benešov, Beroun"
+    assert event.start == datetime(2026, 1, 5, 9, tzinfo=UTC)
+    assert event.end == datetime(2026, 1, 6, 9, tzinfo=UTC)
+    assert event.uid == "ALERT-1_0"
+
+    assert (
+        await calendar.async_get_events(
+            Mock(),
+            datetime(2026, 1, 7, tzinfo=UTC),
+            datetime(2026, 1, 8, tzinfo=UTC),
+        )
+        == []
+    )
+
+
+async def test_current_event(calendar):
+    """Test the state follows the active or upcoming alert."""
+    assert calendar.unique_id == "test_entry_id_chmi_alerts_calendar"
+    with patch(
+        "custom_components.chmi_alerts.calendar.dt_util.utcnow",
+        return_value=datetime(2026, 1, 1, tzinfo=UTC),
+    ):
+        assert calendar.event.summary == "Strong wind warning"
+    with patch(
+        "custom_components.chmi_alerts.calendar.dt_util.utcnow",
+        return_value=datetime(2026, 1, 7, tzinfo=UTC),
+    ):
+        assert calendar.event is None
+
+
+async def test_event_per_info_block():
+    """Test info blocks of one alert get distinct event identifiers."""
+    alert = make_alert(
+        languages=("cs", "en"),
+        onset="2026-01-05T10:00:00+01:00",
+        expires="2026-01-06T10:00:00+01:00",
+    )
+    coordinator = Mock()
+    coordinator.timeline = AlertTimeline.from_alerts([alert])
+    entry = Mock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    calendar = CAPAlertsCalendar(coordinator, entry)
+
+    events = await calendar.async_get_events(
+        Mock(),
+        datetime(2026, 1, 5, tzinfo=UTC),
+        datetime(2026, 1, 6, tzinfo=UTC),
+    )
+    assert sorted(event.uid for event in events) == ["ALERT-1_0", "ALERT-1_1"]
@@ -6,7 +6,12 @@ from pathlib import Path
 # Add custom_components to path to allow importing without Home Assistant
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from custom_components.chmi_alerts.cap_parser import CAPAlert, parse_cap_xml
+from custom_components.chmi_alerts.cap_parser import (
+    CAPAlert,
+    CAPStreamParser,
+    parse_alert_elements,
+    parse_cap_xml,
+)
 
 # Sample CAP XML for testing
 SAMPLE_CAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
@@ -244,6 +249,10 @@ def test_geocode_filter_match():
     assert alert.matches_area("Středočeský") is True
     assert alert.matches_area("kraj") is True
 
+    # Test matching ignores diacritics
+    assert alert.matches_area("stredocesky") is True
+    assert alert.matches_area("STŘEDOČESKÝ KRAJ") is True
+
     # Test no match
     assert alert.matches_area("9999") is False
     assert alert.matches_area("CZ03") is False
@@ -1224,3 +1233,161 @@ def test_get_actionable_info_blocks_no_language_filter():
     assert "Silný mráz" in events
     assert "Heavy Frost" in events
     assert "Žádná výstraha" not in events
+
+
+PUSHDOWN_FEED_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <entry>
+        <content>
+            <alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">
+                <identifier>TEST-PUSHDOWN-001</identifier>
+                <sender>test@example.com</sender>
+                <info>
+                    <language>cs</language>
+                    <event>Silný vítr</event>
+                    <severity>Moderate</severity>
+                    <area>
+                        <areaDesc>Benešov</areaDesc>
+                        <geocode>
+                            <valueName>CISORP</valueName>
+                            <value>2101</value>
+                        </geocode>
+                    </area>
+                </info>
+                <info>
+                    <language>en</language>
+                    <event>Strong Wind</event>
+                    <severity>Moderate</severity>
+                    <area>
+                        <areaDesc>Benešov</areaDesc>
+                        <geocode>
+                            <valueName>CISORP</valueName>
+                            <value>2101</value>
+                        </geocode>
+                    </area>
+                </info>
+            </alert>
+        </content>
+    </entry>
+    <entry>
+        <content>
+            <alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">
+                <identifier>TEST-PUSHDOWN-002</identifier>
+                <sender>test@example.com</sender>
+                <info>
+                    <language>cs</language>
+                    <event>Silný mráz</event>
+                    <severity>Minor</severity>
+                    <area>
+                        <areaDesc>Brno</areaDesc>
+                        <geocode>
+                            <valueName>CISORP</valueName>
+                            <value>6203</value>
+                        </geocode>
+                    </area>
+                </info>
+            </alert>
+        </content>
+    </entry>
+</feed>
+"""
+
+
+def test_parse_with_area_filter():
+    """Test that parse_cap_xml skips alerts not matching the area filter."""
+    alerts = parse_cap_xml(PUSHDOWN_FEED_XML, area_filter="2101")
+
+    assert [alert.identifier for alert in alerts] == ["TEST-PUSHDOWN-001"]
+    assert len(alerts[0].info) == 2
+
+    # Area descriptions are matched as well, case insensitive
+    alerts = parse_cap_xml(PUSHDOWN_FEED_XML, area_filter="brno")
+    assert [alert.identifier for alert in alerts] == ["TEST-PUSHDOWN-002"]
+
+    # Diacritics are ignored
+    alerts = parse_cap_xml(PUSHDOWN_FEED_XML, area_filter="Benesov")
+    assert [alert.identifier for alert in alerts] == ["TEST-PUSHDOWN-001"]
+
+    assert parse_cap_xml(PUSHDOWN_FEED_XML, area_filter="9999") == []
+
+
+def test_parse_with_language_filter():
+    """Test that parse_cap_xml skips info sections in other languages."""
+    alerts = parse_cap_xml(PUSHDOWN_FEED_XML, language_filter="en")
+
+    # Alert without English info is dropped
+    assert [alert.identifier for alert in alerts] == ["TEST-PUSHDOWN-001"]
+    alert = alerts[0]
+    assert [info["language"] for info in alert.info] == ["en"]
+    assert alert.event == "Strong Wind"
+
+
+def test_parse_with_filters_matches_post_filtering():
+    """Test that parsing with filters gives the same result as filtering later."""
+    for area_filter in (None, "2101", "6203", "Brno", "benesov", "9999"):
+        for language_filter in (None, "cs", "en", "fr"):
+            pushed_down = parse_cap_xml(
+                PUSHDOWN_FEED_XML,
+                area_filter=area_filter,
+                language_filter=language_filter,
+            )
+            post_filtered = [
+                alert
+                for alert in parse_cap_xml(PUSHDOWN_FEED_XML)
+                if alert.matches_area(area_filter)
+                and alert.matches_language(language_filter)
+            ]
+            for alert in post_filtered:
+                alert.set_language_filter(language_filter)
+
+            assert [alert.identifier for alert in pushed_down] == [
+                alert.identifier for alert in post_filtered
+            ]
+            assert [alert.event for alert in pushed_down] == [
+                alert.event for alert in post_filtered
+            ]
+            assert [
+                alert.get_actionable_info_blocks(language_filter)
+                for alert in pushed_down
+            ] == [
+                alert.get_actionable_info_blocks(language_filter)
+                for alert in post_filtered
+            ]
+
+
+def test_stream_parser_matches_parse_cap_xml():
+    """Test incremental parsing gives the same alerts as parsing the document."""
+    for xml_content in (PUSHDOWN_FEED_XML, SAMPLE_CAP_XML):
+        data = xml_content.encode()
+        parser = CAPStreamParser()
+        # Feed in small chunks splitting elements and multibyte characters
+        for start in range(0, len(data), 7):
+            parser.feed(data[start : start + 7])
+        elements = parser.close()
+
+        for area_filter, language_filter in ((None, None), ("2101", "cs")):
+            streamed = parse_alert_elements(elements, area_filter, language_filter)
+            expected = parse_cap_xml(xml_content, area_filter, language_filter)
+            assert [alert.data for alert in streamed] == [
+                alert.data for alert in expected
+            ]
+
+
+def test_stream_parser_keeps_only_cap_alerts():
+    """Test finished elements are detached and other alert elements ignored."""
+    parser = CAPStreamParser()
+    parser.feed(b'<feed xmlns="http://www.w3.org/2005/Atom"><title>CHMI</title>')
+    root = parser._open[0]  # noqa: SLF001
+    parser.feed(
+        b"<entry><content>"
+        b'<alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">'
+        b"<identifier>CAP-1</identifier></alert>"
+        b"</content></entry>"
+        b'<entry><alert xmlns="urn:example:other"><identifier>X</identifier></alert>'
+        b"</entry></feed>"
+    )
+    elements = parser.close()
+
+    assert [alert.identifier for alert in parse_alert_elements(elements)] == ["CAP-1"]
+    # The document tree is not kept
+    assert len(root) == 0
@@ -11,6 +11,8 @@ from custom_components.chmi_alerts.config_flow import CHMIAlertsConfigFlow
 from custom_components.chmi_alerts.const import (
     CONF_AREA_FILTER,
     CONF_LANGUAGE_FILTER,
+    CONF_REGION,
+    CONF_SEARCH,
 )
 
 # Enable asyncio for all tests in this module
@@ -116,3 +118,73 @@ async def test_form_create_entry_no_area_filter():
     assert result["title"] == "CHMI Alerts"
     assert result["data"] == user_input
     assert result["data"][CONF_LANGUAGE_FILTER] == "en"
+
+
+async def test_form_create_entry_region(mock_hass):
+    """Test creating an entry filtered by region."""
+    flow = CHMIAlertsConfigFlow()
+    flow.hass = mock_hass
+
+    user_input = {
+        CONF_AREA_FILTER: "",
+        CONF_REGION: "72",
+        CONF_LANGUAGE_FILTER: "cs",
+    }
+
+    result = await flow.async_step_user(user_input)
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Zlínský kraj"
+    assert result["data"] == user_input
+
+
+async def test_form_search_location(mock_hass):
+    """Test selecting a location found by search."""
+    flow = CHMIAlertsConfigFlow()
+    flow.hass = mock_hass
+
+    result = await flow.async_step_user(
+        {CONF_SEARCH: "benesov", CONF_AREA_FILTER: "", CONF_LANGUAGE_FILTER: "cs"}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "location"
+    selector = result["data_schema"].schema[CONF_AREA_FILTER]
+    assert [option["value"] for option in selector.config["options"]] == ["2101"]
+
+    result = await flow.async_step_location({CONF_AREA_FILTER: "2101"})
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Benešov"
+    assert result["data"] == {CONF_AREA_FILTER: "2101", CONF_LANGUAGE_FILTER: "cs"}
+
+
+async def test_form_search_no_match(mock_hass):
+    """Test search without matching locations shows an error."""
+    flow = CHMIAlertsConfigFlow()
+    flow.hass = mock_hass
+
+    result = await flow.async_step_user({CONF_SEARCH: "atlantis"})
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {CONF_SEARCH: "no_locations_found"}
+
+
+@pytest.mark.parametrize(
+    "user_input",
+    [
+        {CONF_AREA_FILTER: "2101", CONF_REGION: "72"},
+        {CONF_SEARCH: "benesov", CONF_AREA_FILTER: "", CONF_REGION: "72"},
+    ],
+)
+async def test_form_region_and_location(mock_hass, user_input):
+    """Test a location and a region can not be combined."""
+    flow = CHMIAlertsConfigFlow()
+    flow.hass = mock_hass
+
+    result = await flow.async_step_user({**user_input, CONF_LANGUAGE_FILTER: "cs"})
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {CONF_REGION: "region_and_location"}
@@ -0,0 +1,685 @@
+"""Test the CHMI Alerts data update coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import gzip
+import zlib
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from typing import Self
+from unittest.mock import Mock, patch
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.chmi_alerts.const import CISORP_CODE_TO_NAME, DATA_SINGLE_FLIGHT
+from custom_components.chmi_alerts.coordinator import CAPAlertsCoordinator
+from custom_components.chmi_alerts.fetch import BodyTooLargeError, get_decoder
+
+from . import make_alert
+
+# Enable asyncio for all tests in this module
+pytestmark = pytest.mark.asyncio
+
+FEED_A = "https://example.com/a.xml"
+FEED_B = "https://example.com/b.xml"
+
+
+def make_feed(*identifiers: str) -> str:
+    """Build CAP Atom feed with one alert per identifier."""
+    entries = "".join(
+        f"""
+    <entry>
+        <content>
+            <alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">
+                <identifier>{identifier}</identifier>
+                <sender>test@example.com</sender>
+                <info>
+                    <language>cs</language>
+                    <event>Silný vítr</event>
+                    <severity>Moderate</severity>
+                    <area>
+                        <areaDesc>Benešov</areaDesc>
+                        <geocode>
+                            <valueName>CISORP</valueName>
+                            <value>2101</value>
+                        </geocode>
+                    </area>
+                </info>
+            </alert>
+        </content>
+    </entry>"""
+        for identifier in identifiers
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">{entries}
+</feed>
+"""
+
+
+class FakeContent:
+    """Fake aiohttp response body stream."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self, size: int = -1) -> bytes:
+        """Read beginning of the body."""
+        return self._body if size < 0 else self._body[:size]
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+        """Yield body in chunks."""
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+class FakeResponse:
+    """Fake aiohttp response."""
+
+    def __init__(
+        self,
+        status: int,
+        body: str | bytes,
+        delay: float = 0,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.status = status
+        self.content = FakeContent(body.encode() if isinstance(body, str) else body)
+        self.headers = headers or {}
+        self._delay = delay
+        self.session: FakeSession | None = None
+
+    async def __aenter__(self) -> Self:
+        """Enter response context."""
+        await asyncio.sleep(self._delay)
+        if self.session is not None and self.session.closed:
+            raise RuntimeError("Session is closed")
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Exit context."""
+
+
+class FakeSession:
+    """Fake aiohttp client session serving predefined responses."""
+
+    def __init__(self, responses: dict[str, FakeResponse | list[FakeResponse]]) -> None:
+        self.responses = responses
+        self.requested: list[str] = []
+        self.request_headers: dict[str, str] = {}
+        self.closed = False
+
+    def open(self, **kwargs) -> FakeSession:
+        """Return new session sharing the responses and the request log."""
+        session = copy.copy(self)
+        session.closed = False
+        return session
+
+    async def __aenter__(self) -> Self:
+        """Enter session context."""
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Close the session."""
+        self.closed = True
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> FakeResponse:
+        self.requested.append(url)
+        self.request_headers.clear()
+        self.request_headers.update(headers or {})
+        response = self.responses[url]
+        if isinstance(response, list):
+            # Serve responses of consecutive requests in order
+            response = response.pop(0)
+        response.session = self
+        return response
+
+
+@pytest.fixture
+def mock_hass():
+    """Create a mock Home Assistant instance."""
+    hass = Mock()
+    hass.data = {}
+    return hass
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay():
+    """Retry failed fetches without waiting."""
+    with patch("custom_components.chmi_alerts.coordinator.FETCH_RETRY_DELAY", 0):
+        yield
+
+
+def patch_session(session: FakeSession):
+    """Patch aiohttp client session used by the coordinator."""
+    return patch(
+        "custom_components.chmi_alerts.coordinator.aiohttp.ClientSession",
+        side_effect=session.open,
+    )
+
+
+async def test_multiple_feeds_merged(mock_hass):
+    """Test alerts from multiple feeds are merged and deduplicated."""
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(200, make_feed("ALERT-1", "ALERT-2")),
+            FEED_B: FakeResponse(200, make_feed("ALERT-2", "ALERT-3")),
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B])
+
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert sorted(session.requested) == [FEED_A, FEED_B]
+    assert [alert.identifier for alert in alerts] == ["ALERT-1", "ALERT-2", "ALERT-3"]
+
+
+async def test_failed_feed_does_not_block_others(mock_hass):
+    """Test a failing or slow feed does not prevent using the other feeds."""
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(200, make_feed("ALERT-1")),
+            FEED_B: FakeResponse(200, make_feed("ALERT-2"), delay=10),
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B])
+
+    with (
+        patch_session(session),
+        patch("custom_components.chmi_alerts.coordinator.FEED_TIMEOUT", 0.1),
+    ):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert [alert.identifier for alert in alerts] == ["ALERT-1"]
+
+    session.responses[FEED_B] = FakeResponse(500, "")
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert [alert.identifier for alert in alerts] == ["ALERT-1"]
+
+
+async def test_all_feeds_failed(mock_hass):
+    """Test update fails when no feed could be fetched."""
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(500, ""),
+            FEED_B: FakeResponse(404, ""),
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B])
+
+    with patch_session(session), pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()  # noqa: SLF001
+
+
+async def test_area_infos(mock_hass):
+    """Test info blocks are matched to area targets."""
+    session = FakeSession({FEED_A: FakeResponse(200, make_feed("ALERT-1"))})
+    coordinator = CAPAlertsCoordinator(
+        mock_hass, [FEED_A], area_filter="6203", areas=["2101"]
+    )
+
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    # Entry area filter applies to the data, but not to the area targets
+    assert alerts == []
+    assert [alert.identifier for alert, _info in coordinator.area_infos["2101"]] == [
+        "ALERT-1"
+    ]
+
+
+async def test_area_infos_per_info_block(mock_hass):
+    """Test an area target gets only the info blocks covering it."""
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A], areas=["2101", "6203"])
+    alert = make_alert()
+    frost = {**alert.info[0], "event": "Frost"}
+    frost["areas"] = [{"areaDesc": "Brno", "geocode": ["6203"]}]
+    alert.info.append(frost)
+
+    area_infos = coordinator._infos_by_geocode([alert])  # noqa: SLF001
+
+    assert area_infos == {
+        "2101": [(alert, alert.info[0])],
+        "6203": [(alert, frost)],
+    }
+
+
+async def test_location_levels(mock_hass):
+    """Test location levels are computed from the whole feed."""
+    session = FakeSession({FEED_A: FakeResponse(200, make_feed("ALERT-1"))})
+    coordinator = CAPAlertsCoordinator(
+        mock_hass, [FEED_A], area_filter="6203", track_location_levels=True
+    )
+
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert alerts == []
+    assert coordinator.location_levels["2101"] == "orange"
+    assert coordinator.location_levels["6203"] == "green"
+    assert len(coordinator.location_levels) == len(CISORP_CODE_TO_NAME)
+
+
+async def test_region_filter(mock_hass):
+    """Test alerts are filtered by the locations of the region."""
+    session = FakeSession({FEED_A: FakeResponse(200, make_feed("ALERT-1"))})
+    central_bohemia = CAPAlertsCoordinator(mock_hass, [FEED_A], region="21")
+    south_moravia = CAPAlertsCoordinator(mock_hass, [FEED_A], region="62")
+
+    with patch_session(session):
+        alerts = await central_bohemia._async_update_data()  # noqa: SLF001
+        assert [alert.identifier for alert in alerts] == ["ALERT-1"]
+        assert await south_moravia._async_update_data() == []  # noqa: SLF001
+
+
+async def test_transient_errors_retried(mock_hass):
+    """Test server errors are retried and client errors are not."""
+    session = FakeSession(
+        {
+            FEED_A: [
+                FakeResponse(503, ""),
+                FakeResponse(500, ""),
+                FakeResponse(200, make_feed("ALERT-1")),
+            ],
+            FEED_B: [FakeResponse(404, ""), FakeResponse(200, make_feed("ALERT-2"))],
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B])
+
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert [alert.identifier for alert in alerts] == ["ALERT-1"]
+    assert session.requested.count(FEED_A) == 3
+    assert session.requested.count(FEED_B) == 1
+
+
+async def test_stale_data_on_failure(mock_hass):
+    """Test the last good data is served after fetching fails."""
+    session = FakeSession({FEED_A: FakeResponse(200, make_feed("ALERT-1"))})
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A])
+
+    with patch_session(session):
+        coordinator.data = await coordinator._async_update_data()  # noqa: SLF001
+    assert coordinator.stale is False
+    version = coordinator.data_version
+
+    session.responses[FEED_A] = FakeResponse(500, "")
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert [alert.identifier for alert in alerts] == ["ALERT-1"]
+    assert coordinator.stale is True
+    assert coordinator.data_version == version + 1
+    # All attempts were used
+    assert len(session.requested) == 4
+
+    # Data older than the limit is not served
+    coordinator.last_success = dt_util.utcnow() - timedelta(days=1)
+    with patch_session(session), pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()  # noqa: SLF001
+
+    session.responses[FEED_A] = FakeResponse(200, make_feed("ALERT-2"))
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert [alert.identifier for alert in alerts] == ["ALERT-2"]
+    assert coordinator.stale is False
+
+
+async def test_concurrent_fetches_coalesced(mock_hass):
+    """Test concurrent refreshes of entries share one download per feed."""
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(200, make_feed("ALERT-1"), delay=0.1),
+            FEED_B: FakeResponse(200, make_feed("ALERT-2"), delay=0.1),
+        }
+    )
+    first = CAPAlertsCoordinator(mock_hass, [FEED_A])
+    second = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B], area_filter="2101")
+
+    with patch_session(session):
+        results = await asyncio.gather(
+            first._async_update_data(),  # noqa: SLF001
+            second._async_update_data(),  # noqa: SLF001
+            first._async_update_data(),  # noqa: SLF001
+        )
+
+    assert sorted(session.requested) == [FEED_A, FEED_B]
+    assert [[alert.identifier for alert in alerts] for alerts in results] == [
+        ["ALERT-1"],
+        ["ALERT-1", "ALERT-2"],
+        ["ALERT-1"],
+    ]
+    assert len(mock_hass.data[DATA_SINGLE_FLIGHT]) == 0
+
+    # Later refresh downloads again
+    with patch_session(session):
+        await first._async_update_data()  # noqa: SLF001
+    assert session.requested.count(FEED_A) == 2
+
+
+async def test_shared_download_survives_cancelled_caller(mock_hass):
+    """Test a shared download does not depend on the refresh starting it."""
+    session = FakeSession({FEED_A: FakeResponse(200, make_feed("ALERT-1"), delay=0.1)})
+    first = CAPAlertsCoordinator(mock_hass, [FEED_A])
+    second = CAPAlertsCoordinator(mock_hass, [FEED_A])
+
+    with patch_session(session):
+        first_task = asyncio.ensure_future(first._async_update_data())  # noqa: SLF001
+        await asyncio.sleep(0.01)
+        second_task = asyncio.ensure_future(second._async_update_data())  # noqa: SLF001
+        await asyncio.sleep(0.01)
+        first_task.cancel()
+        alerts = await second_task
+
+    assert session.requested == [FEED_A]
+    assert [alert.identifier for alert in alerts] == ["ALERT-1"]
+
+
+async def test_compressed_feeds(mock_hass):
+    """Test compressed responses are decoded while streaming."""
+    feed = make_feed("ALERT-1", "ALERT-2", "ALERT-3")
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(
+                200, gzip.compress(feed.encode()), headers={"Content-Encoding": "gzip"}
+            ),
+            FEED_B: FakeResponse(
+                200,
+                zlib.compress(make_feed("ALERT-4").encode()),
+                headers={"Content-Encoding": "deflate"},
+            ),
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B])
+
+    with (
+        patch_session(session),
+        patch("custom_components.chmi_alerts.fetch.CHUNK_SIZE", 100),
+    ):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert "gzip" in session.request_headers["Accept-Encoding"]
+    assert [alert.identifier for alert in alerts] == [
+        "ALERT-1",
+        "ALERT-2",
+        "ALERT-3",
+        "ALERT-4",
+    ]
+    stats = coordinator.feed_stats[FEED_A]
+    assert stats.encoding == "gzip"
+    assert stats.decoded_bytes == len(feed.encode())
+    assert stats.wire_bytes < stats.decoded_bytes
+    assert stats.compression_ratio > 1
+
+
+async def test_invalid_content(mock_hass):
+    """Test feeds with undecodable or malformed content fail."""
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(
+                200, b"not gzip data", headers={"Content-Encoding": "gzip"}
+            ),
+            FEED_B: FakeResponse(200, "<feed><entry>"),
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B])
+
+    with patch_session(session), pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()  # noqa: SLF001
+
+
+async def test_body_size_limit(mock_hass):
+    """Test oversized feeds are aborted while streaming."""
+    feed = make_feed(*(f"ALERT-{n}" for n in range(50)))
+    session = FakeSession(
+        {
+            # Highly compressible body within the transfer limit
+            FEED_A: FakeResponse(
+                200, gzip.compress(feed.encode()), headers={"Content-Encoding": "gzip"}
+            ),
+            # Announced length over the limit
+            FEED_B: FakeResponse(
+                200, make_feed("ALERT-1"), headers={"Content-Length": "100000"}
+            ),
+        }
+    )
+    coordinator = CAPAlertsCoordinator(
+        mock_hass, [FEED_A, FEED_B], max_body_size=len(feed) // 2
+    )
+
+    with (
+        patch_session(session),
+        pytest.raises(UpdateFailed, match="exceeds"),
+    ):
+        await coordinator._async_update_data()  # noqa: SLF001
+
+    coordinator.max_body_size = len(feed.encode()) + 1
+    with patch_session(session):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+    assert len(alerts) == 50
+
+
+async def test_error_response_excerpt(mock_hass):
+    """Test the beginning of an error response is reported."""
+    session = FakeSession(
+        {FEED_A: FakeResponse(404, "<html>\n  <h1>Not   found</h1>" + "x" * 10000)}
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A])
+
+    with (
+        patch_session(session),
+        pytest.raises(
+            UpdateFailed, match="HTTP 404: <html> <h1>Not found</h1>x"
+        ) as err,
+    ):
+        await coordinator._async_update_data()  # noqa: SLF001
+
+    assert len(str(err.value)) < 400
+
+
+async def test_timeline_rebuilt_on_new_data(mock_hass):
+    """Test the timeline is indexed once per data version."""
+    session = FakeSession({FEED_A: FakeResponse(200, make_feed("ALERT-1"))})
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A])
+
+    with patch_session(session):
+        coordinator.data = await coordinator._async_update_data()  # noqa: SLF001
+
+    timeline = coordinator.timeline
+    assert coordinator.timeline is timeline
+
+    coordinator.data_version += 1
+    assert coordinator.timeline is not timeline
+
+
+async def test_triggers_processed_once_per_data_version(mock_hass):
+    """Test alert changes are matched against triggers only for new data."""
+    session = FakeSession({FEED_A: FakeResponse(200, make_feed("ALERT-1"))})
+    triggers = Mock()
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A], triggers=triggers)
+
+    with patch_session(session):
+        coordinator.data = await coordinator._async_update_data()  # noqa: SLF001
+
+    coordinator.async_update_listeners()
+    coordinator.async_update_listeners()
+
+    triggers.process.assert_called_once_with(coordinator.data, None)
+
+
+ZONE_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <entry>
+        <content>
+            <alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">
+                <identifier>ALERT-1</identifier>
+                <sender>test@example.com</sender>
+                <info>
+                    <language>cs</language>
+                    <event>Silný vítr</event>
+                    <severity>Minor</severity>
+                    <area>
+                        <areaDesc>Praha</areaDesc>
+                        <polygon>49.9,14.2 49.9,14.7 50.2,14.7 50.2,14.2 49.9,14.2</polygon>
+                    </area>
+                </info>
+                <info>
+                    <language>cs</language>
+                    <event>Silné bouřky</event>
+                    <severity>Extreme</severity>
+                    <area>
+                        <areaDesc>Brno</areaDesc>
+                        <circle>49.19,16.61 15</circle>
+                    </area>
+                </info>
+            </alert>
+        </content>
+    </entry>
+</feed>
+"""
+
+
+def zone_state(latitude: float, longitude: float) -> Mock:
+    """Create zone state located at the point."""
+    state = Mock()
+    state.attributes = {"latitude": latitude, "longitude": longitude}
+    return state
+
+
+async def test_zones_use_only_covering_info_blocks(mock_hass):
+    """Test zones get only the info blocks with an area covering them."""
+    session = FakeSession({FEED_A: FakeResponse(200, ZONE_FEED)})
+    states = {
+        "zone.home": zone_state(50.05, 14.45),
+        "person.anna": zone_state(49.2, 16.6),
+    }
+    mock_hass.states.get = states.get
+    coordinator = CAPAlertsCoordinator(
+        mock_hass, [FEED_A], zone="zone.home", zones=["zone.home", "person.anna"]
+    )
+
+    with patch_session(session):
+        coordinator.data = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert [
+        info["severity"] for _alert, info in coordinator.zone_infos["zone.home"]
+    ] == ["Minor"]
+    assert [
+        info["severity"] for _alert, info in coordinator.zone_infos["person.anna"]
+    ] == ["Extreme"]
+    assert [info["severity"] for info in coordinator.data[0].info] == ["Minor"]
+
+
+async def test_zone_moved_reevaluates_coverage(mock_hass):
+    """Test a moving person is matched without fetching the feed again."""
+    session = FakeSession({FEED_A: FakeResponse(200, ZONE_FEED)})
+    states = {"person.anna": zone_state(50.05, 14.45)}
+    mock_hass.states.get = states.get
+    coordinator = CAPAlertsCoordinator(
+        mock_hass, [FEED_A], zone="person.anna", zones=["person.anna"]
+    )
+
+    with patch_session(session):
+        coordinator.data = await coordinator._async_update_data()  # noqa: SLF001
+    data_version = coordinator.data_version
+
+    old_state = states["person.anna"]
+    states["person.anna"] = zone_state(49.2, 16.6)
+    event = Mock()
+    event.data = {
+        "entity_id": "person.anna",
+        "old_state": old_state,
+        "new_state": states["person.anna"],
+    }
+    coordinator.async_zone_moved(event)
+
+    assert session.requested == [FEED_A]
+    assert coordinator.data_version == data_version + 1
+    assert [
+        info["severity"] for _alert, info in coordinator.zone_infos["person.anna"]
+    ] == ["Extreme"]
+    assert [info["severity"] for info in coordinator.data[0].info] == ["Extreme"]
+
+    # Updates of other attributes do not re-evaluate the coverage
+    event.data = {**event.data, "old_state": states["person.anna"]}
+    coordinator.async_zone_moved(event)
+    assert coordinator.data_version == data_version + 1
+
+
+async def test_chained_content_encodings(mock_hass):
+    """Test bodies encoded multiple times are decoded in reverse order."""
+    feed = make_feed("ALERT-1")
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(
+                200,
+                zlib.compress(gzip.compress(feed.encode())),
+                headers={"Content-Encoding": "gzip, deflate"},
+            ),
+            FEED_B: FakeResponse(
+                200, feed.encode(), headers={"Content-Encoding": "gzip, compress"}
+            ),
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A, FEED_B])
+
+    with (
+        patch_session(session),
+        patch("custom_components.chmi_alerts.fetch.CHUNK_SIZE", 50),
+    ):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert [alert.identifier for alert in alerts] == ["ALERT-1"]
+    assert coordinator.feed_stats[FEED_A].decoded_bytes == len(feed.encode())
+    assert FEED_B not in coordinator.feed_stats
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    """Compress data with an optional library, skip the test without it."""
+    if encoding == "br":
+        return pytest.importorskip("brotli").compress(data)
+    return pytest.importorskip("zstandard").ZstdCompressor().compress(data)
+
+
+@pytest.mark.parametrize("encoding", ["br", "zstd"])
+async def test_optional_encodings(mock_hass, encoding):
+    """Test brotli and zstd bodies are decoded while streaming."""
+    feed = make_feed("ALERT-1", "ALERT-2")
+    session = FakeSession(
+        {
+            FEED_A: FakeResponse(
+                200,
+                compress(encoding, feed.encode()),
+                headers={"Content-Encoding": encoding},
+            )
+        }
+    )
+    coordinator = CAPAlertsCoordinator(mock_hass, [FEED_A])
+
+    with (
+        patch_session(session),
+        patch("custom_components.chmi_alerts.fetch.CHUNK_SIZE", 100),
+    ):
+        alerts = await coordinator._async_update_data()  # noqa: SLF001
+
+    assert encoding in session.request_headers["Accept-Encoding"]
+    assert [alert.identifier for alert in alerts] == ["ALERT-1", "ALERT-2"]
+    assert coordinator.feed_stats[FEED_A].decoded_bytes == len(feed.encode())
+
+
+@pytest.mark.parametrize("encoding", ["br", "zstd"])
+async def test_optional_encodings_limit_output(encoding):
+    """Test a compression bomb is not decoded beyond the limit."""
+    body = compress(encoding, b"\0" * 5_000_000)
+    decoder = get_decoder(encoding)
+
+    with pytest.raises(BodyTooLargeError):
+        decoder.decompress(body, 200_000)
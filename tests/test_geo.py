@@ -0,0 +1,218 @@
+"""Tests for CAP area geometry helpers."""
+
+import pytest
+
+from custom_components.chmi_alerts import geo
+from custom_components.chmi_alerts.cap_parser import parse_cap_xml
+from custom_components.chmi_alerts.geo import (
+    CircleShape,
+    PolygonShape,
+    ShapeBatch,
+    SpatialIndex,
+    haversine_km,
+    shapes_centroid,
+    shapes_from_area,
+)
+
+# Rough square around Prague and a circle around Brno
+GEO_CAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <entry>
+        <content>
+            <alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">
+                <identifier>TEST-GEO-PRAGUE</identifier>
+                <info>
+                    <language>en</language>
+                    <event>Strong Wind</event>
+                    <severity>Moderate</severity>
+                    <area>
+                        <areaDesc>Praha</areaDesc>
+                        <polygon>49.9,14.2 49.9,14.7 50.2,14.7 50.2,14.2 49.9,14.2</polygon>
+                    </area>
+                </info>
+            </alert>
+        </content>
+    </entry>
+    <entry>
+        <content>
+            <alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">
+                <identifier>TEST-GEO-BRNO</identifier>
+                <info>
+                    <language>en</language>
+                    <event>Frost</event>
+                    <severity>Minor</severity>
+                    <area>
+                        <areaDesc>Brno</areaDesc>
+                        <circle>49.19,16.61 15</circle>
+                    </area>
+                </info>
+            </alert>
+        </content>
+    </entry>
+</feed>
+"""
+
+
+def test_polygon_parsing():
+    """Test parsing CAP polygon into coordinate arrays."""
+    polygon = PolygonShape.from_cap("49.9,14.2 49.9,14.7 50.2,14.7 50.2,14.2 49.9,14.2")
+
+    # Closing point is dropped
+    assert polygon.lats == [49.9, 49.9, 50.2, 50.2]
+    assert polygon.lons == [14.2, 14.7, 14.7, 14.2]
+    assert polygon.bbox == (49.9, 14.2, 50.2, 14.7)
+
+
+def test_polygon_invalid():
+    """Test invalid polygons are ignored."""
+    assert PolygonShape.from_cap("not a polygon") is None
+    assert PolygonShape.from_cap("49.9,14.2 49.9,14.7 49.9,14.2") is None
+
+
+def test_polygon_contains():
+    """Test point in polygon check."""
+    # Concave polygon (L shape)
+    polygon = PolygonShape.from_cap("0,0 0,2 1,2 1,1 2,1 2,0 0,0")
+
+    assert polygon.contains(0.5, 0.5) is True
+    assert polygon.contains(0.5, 1.5) is True
+    assert polygon.contains(1.5, 0.5) is True
+    # Inside bounding box, but outside polygon
+    assert polygon.contains(1.5, 1.5) is False
+    # Outside bounding box
+    assert polygon.contains(3, 3) is False
+
+
+def test_circle_contains():
+    """Test point in circle check."""
+    circle = CircleShape.from_cap("49.19,16.61 15")
+
+    assert circle.radius_km == 15
+    assert circle.contains(49.19, 16.61) is True
+    assert circle.contains(49.25, 16.70) is True
+    assert circle.contains(50.08, 14.42) is False
+    assert CircleShape.from_cap("49.19,16.61") is None
+
+
+def test_haversine():
+    """Test great-circle distance."""
+    # Prague to Brno is roughly 185 km
+    assert 180 < haversine_km(50.08, 14.42, 49.19, 16.61) < 190
+    assert haversine_km(50.08, 14.42, 50.08, 14.42) == 0
+
+
+def test_shapes_from_area():
+    """Test building shapes from parsed area."""
+    shapes = shapes_from_area(
+        {
+            "areaDesc": "Test",
+            "polygon": "0,0 0,1 1,1 0,0",
+            "circle": "0,0 10",
+        }
+    )
+    assert [type(shape) for shape in shapes] == [PolygonShape, CircleShape]
+    assert shapes_from_area({"areaDesc": "Test"}) == []
+
+
+def test_spatial_index_from_alerts():
+    """Test querying alerts by coordinates."""
+    alerts = parse_cap_xml(GEO_CAP_XML)
+    index = SpatialIndex.from_alerts(alerts)
+
+    assert len(index) == 2
+
+    # Prague
+    matches = list(index.query(50.08, 14.42))
+    assert [alert.identifier for alert, _info in matches] == ["TEST-GEO-PRAGUE"]
+    assert matches[0][1]["event"] == "Strong Wind"
+
+    # Brno
+    matches = list(index.query(49.2, 16.6))
+    assert [alert.identifier for alert, _info in matches] == ["TEST-GEO-BRNO"]
+
+    # Ostrava
+    assert list(index.query(49.83, 18.29)) == []
+
+
+def test_spatial_index_spans_cells():
+    """Test shapes larger than a grid cell are found from all cells."""
+    index = SpatialIndex(cell_size=0.1)
+    index.insert(PolygonShape.from_cap("49,14 49,15 50,15 50,14 49,14"), "large")
+
+    assert list(index.query(49.05, 14.05)) == ["large"]
+    assert list(index.query(49.95, 14.95)) == ["large"]
+    assert list(index.query(50.05, 14.5)) == []
+
+
+def test_coverage():
+    """Test vectorized coverage of many points by many shapes."""
+    shapes = [
+        PolygonShape.from_cap("0,0 0,2 1,2 1,1 2,1 2,0 0,0"),
+        CircleShape.from_cap("49.19,16.61 15"),
+        PolygonShape.from_cap("49.9,14.2 49.9,14.7 50.2,14.7 50.2,14.2 49.9,14.2"),
+    ]
+    points = [
+        (0.5, 0.5),
+        (1.5, 1.5),
+        (1.5, 0.5),
+        (49.2, 16.6),
+        (50.08, 14.42),
+        (49.83, 18.29),
+    ]
+
+    matrix = ShapeBatch(shapes).coverage(points)
+
+    assert matrix.shape == (6, 3)
+    assert matrix.tolist() == [
+        [True, False, False],
+        [False, False, False],
+        [True, False, False],
+        [False, True, False],
+        [False, False, True],
+        [False, False, False],
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [7, 256])
+def test_coverage_matches_scalar(monkeypatch, chunk_size):
+    """Test vectorized coverage gives the same results as per-shape checks."""
+    monkeypatch.setattr(geo, "COVERAGE_CHUNK_SIZE", chunk_size)
+    shapes = [
+        PolygonShape.from_cap("0,0 0,4 4,4 4,3 1,3 1,1 4,1 4,0 0,0"),
+        PolygonShape.from_cap("1,1 1,2 3,3 2,1 1,1"),
+        CircleShape.from_cap("2,2 100"),
+    ]
+    points = [(x / 4, y / 4) for x in range(-2, 20) for y in range(-2, 20)]
+
+    matrix = ShapeBatch(shapes).coverage(points)
+
+    for n, (lat, lon) in enumerate(points):
+        for m, shape in enumerate(shapes):
+            assert matrix[n, m] == shape.contains(lat, lon), (lat, lon, m)
+
+
+def test_coverage_empty():
+    """Test coverage with no points, shapes or bounding box matches."""
+    assert ShapeBatch([CircleShape(0, 0, 1)]).coverage([]).shape == (0, 1)
+    assert ShapeBatch([]).coverage([(0, 0)]).shape == (1, 0)
+    # No point inside any bounding box
+    shapes = [PolygonShape.from_cap("0,0 0,1 1,1 0,0"), CircleShape(0, 0, 1)]
+    assert not ShapeBatch(shapes).coverage([(5, 5), (-5, 0)]).any()
+
+
+def test_centroids():
+    """Test centroids of polygons and circles."""
+    polygon = PolygonShape.from_cap("49.9,14.2 49.9,14.7 50.2,14.7 50.2,14.2 49.9,14.2")
+    assert polygon.centroid == pytest.approx((50.05, 14.45))
+
+    # Centroid of an L shape is weighted by area, not the mean of vertices
+    polygon = PolygonShape.from_cap("0,0 0,2 1,2 1,1 2,1 2,0 0,0")
+    assert polygon.centroid == pytest.approx((0.8333, 0.8333), abs=1e-4)
+
+    circle = CircleShape.from_cap("49.19,16.61 15")
+    assert circle.centroid == (49.19, 16.61)
+
+    assert shapes_centroid([polygon, circle]) == pytest.approx(
+        (25.0117, 8.7217), abs=1e-4
+    )
+    assert shapes_centroid([]) is None
@@ -0,0 +1,75 @@
+"""Test the CHMI Alerts geolocation events."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.chmi_alerts.geo_location import CAPAlertsGeolocationManager
+
+from . import make_alert
+
+# Enable asyncio for all tests in this module
+pytestmark = pytest.mark.asyncio
+
+
+PRAGUE = {
+    "areaDesc": "Praha",
+    "polygon": "49.9,14.2 49.9,14.7 50.2,14.7 50.2,14.2 49.9,14.2",
+}
+BRNO = {"areaDesc": "Brno", "circle": "49.19,16.61 15"}
+BENESOV = {"areaDesc": "Benešov", "geocode": ["2101"]}
+
+
+@pytest.fixture
+def mock_hass():
+    """Create a mock Home Assistant instance located in Prague."""
+    hass = Mock()
+    hass.config.latitude = 50.05
+    hass.config.longitude = 14.45
+    return hass
+
+
+async def test_events_added_and_removed_incrementally(mock_hass):
+    """Test events are kept while their info blocks stay active."""
+    coordinator = Mock()
+    coordinator.language_filter = "en"
+    coordinator.data_version = 1
+    coordinator.data = [
+        make_alert("ALERT-1", languages=("en", "cs"), areas=[PRAGUE]),
+        make_alert("ALERT-2", languages=("en", "cs"), areas=[BRNO]),
+        make_alert("ALERT-3", languages=("en", "cs"), areas=[BENESOV]),
+    ]
+    add_entities = Mock()
+    manager = CAPAlertsGeolocationManager(mock_hass, coordinator, add_entities)
+
+    manager.async_update()
+
+    prague, brno = add_entities.call_args.args[0]
+    assert prague.name == "ALERT-1 en"
+    assert (prague.latitude, prague.longitude) == pytest.approx((50.05, 14.45))
+    assert prague.state == 0
+    assert brno.distance == pytest.approx(182.6, abs=0.1)
+    assert brno.extra_state_attributes["awareness_level"] == "3; Orange"
+
+    # Unchanged data does nothing
+    add_entities.reset_mock()
+    manager.async_update()
+    add_entities.assert_not_called()
+
+    # Ended alert is removed, new one added, the rest is kept
+    prague.async_remove = Mock()
+    brno.async_remove = Mock()
+    coordinator.data_version = 2
+    coordinator.data = [
+        make_alert("ALERT-2", languages=("en", "cs"), areas=[BRNO]),
+        make_alert("ALERT-4", languages=("en", "cs"), areas=[PRAGUE, BRNO]),
+    ]
+    manager.async_update()
+
+    prague.async_remove.assert_called_once_with(force_remove=True)
+    brno.async_remove.assert_not_called()
+    (combined,) = add_entities.call_args.args[0]
+    assert combined.name == "ALERT-4 en"
+    assert combined.extra_state_attributes["area"] == "Praha, Brno"
@@ -0,0 +1,104 @@
+"""Test the GeoJSON export of active alerts."""
+
+from __future__ import annotations
+
+import json
+from http import HTTPStatus
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.chmi_alerts.const import DOMAIN
+from custom_components.chmi_alerts.geojson import (
+    CHMIAlertsGeoJSONView,
+    alerts_feature_collection,
+)
+
+from . import make_alert
+
+# Enable asyncio for all tests in this module
+pytestmark = pytest.mark.asyncio
+
+
+# Polygon, circle and geocode only areas
+AREAS = [
+    {
+        "areaDesc": "Polygon",
+        "polygon": "50.0,14.0 50.0,15.0 49.0,15.0 50.0,14.0",
+        "geocode": ["2101"],
+    },
+    {"areaDesc": "Circle", "circle": "49.5,16.0 10"},
+    {"areaDesc": "Benešov", "geocode": ["2101"]},
+]
+
+
+def make_request(headers: dict[str, str] | None = None) -> Mock:
+    """Create a mock HTTP request."""
+    request = Mock()
+    request.headers = headers or {}
+    return request
+
+
+async def test_feature_collection():
+    """Test areas with geometry are exported as features."""
+    collection = alerts_feature_collection([make_alert(areas=AREAS)])
+
+    assert collection["type"] == "FeatureCollection"
+    polygon, circle = collection["features"]
+    assert polygon["geometry"] == {
+        "type": "Polygon",
+        "coordinates": [[[14.0, 50.0], [15.0, 50.0], [15.0, 49.0], [14.0, 50.0]]],
+    }
+    assert polygon["properties"]["area"] == "Polygon"
+    assert polygon["properties"]["geocodes"] == ["2101"]
+    assert polygon["properties"]["awareness_level"] == "3; Orange"
+    assert polygon["properties"]["awareness_type"] == "1; Wind"
+    assert circle["geometry"]["type"] == "Polygon"
+    ring = circle["geometry"]["coordinates"][0]
+    assert ring[0] == ring[-1]
+    assert ring[0] == pytest.approx([16.0, 49.59], abs=0.01)
+
+
+async def test_view_serves_cached_body():
+    """Test the body is serialized once per update and validated by ETag."""
+    coordinator = Mock()
+    coordinator.data = [make_alert(areas=AREAS)]
+    coordinator.data_version = 1
+    coordinator.language_filter = None
+    hass = Mock()
+    hass.data = {DOMAIN: {"entry": coordinator}}
+    view = CHMIAlertsGeoJSONView(hass)
+
+    response = await view.get(make_request(), "entry")
+    assert response.status == HTTPStatus.OK
+    assert response.content_type == "application/geo+json"
+    assert len(json.loads(response.body)["features"]) == 2
+    etag = response.headers["ETag"]
+
+    # Unchanged body is not sent again
+    response = await view.get(make_request({"If-None-Match": etag}), "entry")
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    # Update without changes keeps the ETag
+    coordinator.data_version = 2
+    response = await view.get(make_request({"If-None-Match": etag}), "entry")
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    coordinator.data_version = 3
+    coordinator.data = []
+    response = await view.get(make_request({"If-None-Match": etag}), "entry")
+    assert response.status == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert json.loads(response.body)["features"] == []
+
+    # Coordinator of the reloaded entry counts versions again
+    reloaded = Mock()
+    reloaded.data = [make_alert(areas=AREAS)]
+    reloaded.data_version = 3
+    reloaded.language_filter = None
+    hass.data[DOMAIN]["entry"] = reloaded
+    response = await view.get(make_request(), "entry")
+    assert len(json.loads(response.body)["features"]) == 2
+
+    response = await view.get(make_request(), "missing")
+    assert response.status == HTTPStatus.NOT_FOUND
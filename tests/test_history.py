@@ -0,0 +1,168 @@
+"""Tests for the archived alert history index."""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from custom_components.chmi_alerts.archive import AlertArchive
+from custom_components.chmi_alerts.cap_parser import CAPAlert
+from custom_components.chmi_alerts.history import HistoryIndex, summarize
+
+from . import SENDER, make_alert
+
+
+def make_warning(
+    identifier: str, onset: str, awareness_type: str = "1; wind", **kwargs: Any
+) -> CAPAlert:
+    """Create warning starting at onset in Czech and English."""
+    return make_alert(
+        identifier,
+        sent=onset,
+        languages=("cs", "en"),
+        onset=onset,
+        expires="2026-12-31T00:00:00+01:00",
+        urgency="Future",
+        parameters={"awareness_type": awareness_type},
+        **kwargs,
+    )
+
+
+def record(alert: CAPAlert, received: str = "2026-01-01T00:00:00+00:00") -> dict:
+    """Create archive record of an alert."""
+    return {
+        "received": received,
+        "identifier": alert.identifier,
+        "hash": alert.identifier,
+        "data": alert.data,
+    }
+
+
+def build_index(*alerts: CAPAlert) -> HistoryIndex:
+    """Create index of alerts."""
+    index = HistoryIndex()
+    for alert in alerts:
+        index.add(record(alert), "2026-01")
+    return index
+
+
+def identifiers(entries) -> list[str]:
+    """Return identifiers of entries."""
+    return [entry.identifier for entry in entries]
+
+
+def test_languages_counted_once():
+    """Test translations of a warning are indexed as one entry."""
+    index = build_index(make_warning("ALERT-1", "2026-01-05T10:00:00+01:00"))
+
+    assert len(index) == 1
+    entry = index.query()[0]
+    assert entry.event_type == "1; Wind"
+    assert entry.level == "orange"
+    assert entry.geocodes == {"2101"}
+
+
+def test_query_filters():
+    """Test filtering by time, geocode, event type and level."""
+    index = build_index(
+        make_warning("ALERT-3", "2026-03-01T10:00:00+01:00"),
+        make_warning("ALERT-1", "2026-01-05T10:00:00+01:00"),
+        make_warning("ALERT-2", "2026-02-01T10:00:00+01:00", severity="Minor"),
+        make_warning("ALERT-4", "2026-02-10T10:00:00+01:00", geocodes=("6203",)),
+        make_warning(
+            "ALERT-5", "2026-02-15T10:00:00+01:00", awareness_type="6; low-temperature"
+        ),
+    )
+
+    # Sorted by start time
+    assert identifiers(index.query()) == [
+        "ALERT-1",
+        "ALERT-2",
+        "ALERT-4",
+        "ALERT-5",
+        "ALERT-3",
+    ]
+    assert identifiers(
+        index.query(
+            start=datetime(2026, 2, 1, tzinfo=UTC), end=datetime(2026, 3, 1, tzinfo=UTC)
+        )
+    ) == ["ALERT-2", "ALERT-4", "ALERT-5"]
+    assert identifiers(
+        index.query(geocode="2101", event_type="wind", level="orange")
+    ) == ["ALERT-1", "ALERT-3"]
+    assert identifiers(
+        index.query(start=datetime(2026, 2, 1, tzinfo=UTC), event_type="1; Wind")
+    ) == ["ALERT-2", "ALERT-4", "ALERT-3"]
+    assert index.query(geocode="9999") == []
+
+
+def test_update_replaces_referenced_alert():
+    """Test updated warnings are counted once."""
+    index = build_index(
+        make_warning("ALERT-1", "2026-01-05T10:00:00+01:00"),
+        make_warning(
+            "ALERT-2",
+            "2026-01-05T12:00:00+01:00",
+            severity="Extreme",
+            msg_type="Update",
+            references=f"{SENDER},ALERT-1,2026-01-05T10:00:00+01:00",
+        ),
+    )
+
+    entries = index.query()
+    assert identifiers(entries) == ["ALERT-2"]
+    assert entries[0].level == "red"
+
+
+def test_cancel_removes_referenced_alert():
+    """Test cancelled warnings are not counted."""
+    index = build_index(
+        make_warning("ALERT-1", "2026-01-05T10:00:00+01:00"),
+        make_warning("ALERT-2", "2026-01-05T11:00:00+01:00"),
+        make_warning(
+            "ALERT-3",
+            "2026-01-05T12:00:00+01:00",
+            msg_type="Cancel",
+            references=f"{SENDER},ALERT-1,2026-01-05T10:00:00+01:00",
+        ),
+    )
+
+    assert identifiers(index.query()) == ["ALERT-2"]
+    assert summarize(index.query())["total"] == 1
+
+
+def test_summarize():
+    """Test aggregation of entries."""
+    index = build_index(
+        make_warning("ALERT-1", "2026-01-05T10:00:00+01:00"),
+        make_warning("ALERT-2", "2026-02-01T10:00:00+01:00", severity="Minor"),
+        make_warning("ALERT-3", "2026-02-02T10:00:00+01:00"),
+    )
+
+    assert summarize(index.query()) == {
+        "total": 3,
+        "by_level": {"orange": 2, "yellow": 1},
+        "by_event_type": {"1; Wind": 3},
+        "by_month": {"2026-01": 1, "2026-02": 2},
+    }
+
+
+def test_archive_maintains_index(tmp_path):
+    """Test the archive keeps the index in sync with stored records."""
+    archive = AlertArchive(tmp_path, retention_days=30)
+    archive.append(
+        [make_warning("ALERT-1", "2026-01-05T10:00:00+01:00")],
+        datetime(2026, 1, 5, 12, 0, tzinfo=UTC),
+    )
+    archive.append(
+        [make_warning("ALERT-2", "2026-02-10T10:00:00+01:00")],
+        datetime(2026, 2, 10, 12, 0, tzinfo=UTC),
+    )
+    assert identifiers(archive.query()) == ["ALERT-1", "ALERT-2"]
+
+    # Index is rebuilt on load
+    restored = AlertArchive(tmp_path, retention_days=30)
+    restored.load(datetime(2026, 2, 10, 12, 0, tzinfo=UTC))
+    assert identifiers(restored.query(level="orange")) == ["ALERT-1", "ALERT-2"]
+
+    # Retention removes the entries of deleted months
+    restored.append([], datetime(2026, 3, 5, 12, 0, tzinfo=UTC))
+    assert identifiers(restored.query()) == ["ALERT-2"]
@@ -0,0 +1,53 @@
+"""Test setup and unloading of CHMI Alerts config entries."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from custom_components.chmi_alerts import async_unload_entry
+from custom_components.chmi_alerts.alert_triggers import (
+    AlertTriggerFilter,
+    AlertTriggers,
+)
+from custom_components.chmi_alerts.const import (
+    DATA_GEOJSON_VIEW,
+    DATA_TRIGGERS,
+    DOMAIN,
+)
+from custom_components.chmi_alerts.geojson import CHMIAlertsGeoJSONView
+
+from . import make_alert
+
+# Enable asyncio for all tests in this module
+pytestmark = pytest.mark.asyncio
+
+
+async def test_unload_entry_drops_entry_data():
+    """Test unloading drops the GeoJSON body and unused trigger registry."""
+    hass = Mock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    view = CHMIAlertsGeoJSONView(hass)
+    view._cache.update(unused=Mock(), attached=Mock())  # noqa: SLF001
+    attached = AlertTriggers()
+    attached.async_add(AlertTriggerFilter(), Mock())
+    attached.process([])
+    hass.data = {
+        DOMAIN: {"unused": Mock(), "attached": Mock()},
+        DATA_TRIGGERS: {"unused": AlertTriggers(), "attached": attached},
+        DATA_GEOJSON_VIEW: view,
+    }
+
+    assert await async_unload_entry(hass, Mock(entry_id="unused"))
+    assert list(hass.data[DATA_TRIGGERS]) == ["attached"]
+    assert list(view._cache) == ["attached"]  # noqa: SLF001
+    hass.services.async_remove.assert_not_called()
+
+    # Triggers of automations are kept for the reloaded entry, which sets
+    # the baseline again
+    assert await async_unload_entry(hass, Mock(entry_id="attached"))
+    assert hass.data[DATA_TRIGGERS] == {"attached": attached}
+    assert view._cache == {}  # noqa: SLF001
+    assert attached.changes([make_alert()]) == []
+    hass.services.async_remove.assert_called_once()
@@ -0,0 +1,169 @@
+"""Tests for CAP alert lifecycle tracking."""
+
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.chmi_alerts.cap_parser import CAPAlert, parse_cap_xml
+from custom_components.chmi_alerts.lifecycle import AlertLifecycleStore
+
+from . import SENDER, make_alert
+
+
+def identifiers(alerts: list[CAPAlert]) -> list[str]:
+    """Return identifiers of alerts."""
+    return [alert.identifier for alert in alerts]
+
+
+def test_references_parsing():
+    """Test parsing of CAP references."""
+    alert = make_alert(
+        "ALERT-3",
+        sent="2026-01-05T12:00:00+01:00",
+        msg_type="Update",
+        references=f"{SENDER},ALERT-1,2026-01-05T10:00:00+01:00 "
+        f"{SENDER},ALERT-2,2026-01-05T11:00:00+01:00 malformed",
+    )
+
+    assert alert.key == (SENDER, "ALERT-3", "2026-01-05T12:00:00+01:00")
+    assert alert.references == [
+        (SENDER, "ALERT-1", "2026-01-05T10:00:00+01:00"),
+        (SENDER, "ALERT-2", "2026-01-05T11:00:00+01:00"),
+    ]
+    assert make_alert("ALERT-1", sent="2026-01-05T10:00:00+01:00").references == []
+
+
+def test_update_replaces_referenced_alert():
+    """Test Update message supersedes the referenced alert in the same feed."""
+    original = make_alert("ALERT-1", sent="2026-01-05T10:00:00+01:00")
+    update = make_alert(
+        "ALERT-2",
+        sent="2026-01-05T11:00:00+01:00",
+        msg_type="Update",
+        references=f"{SENDER},ALERT-1,2026-01-05T10:00:00+01:00",
+    )
+    store = AlertLifecycleStore()
+
+    # Feed order does not matter, messages are applied by sent time
+    assert identifiers(store.update([update, original])) == ["ALERT-2"]
+    # Original stays superseded while it is in the feed
+    assert store.update([update, original]) == [update]
+
+
+def test_cancel_removes_referenced_alert():
+    """Test Cancel message removes the referenced alert across updates."""
+    original = make_alert("ALERT-1", sent="2026-01-05T10:00:00+01:00")
+    other = make_alert("ALERT-2", sent="2026-01-05T10:30:00+01:00")
+    cancel = make_alert(
+        "ALERT-3",
+        sent="2026-01-05T11:00:00+01:00",
+        msg_type="Cancel",
+        references=f"{SENDER},ALERT-1,2026-01-05T10:00:00+01:00",
+    )
+    store = AlertLifecycleStore()
+
+    assert identifiers(store.update([original, other])) == ["ALERT-1", "ALERT-2"]
+
+    # Cancel arrives while the original is still in the feed
+    assert identifiers(store.update([original, other, cancel])) == ["ALERT-2"]
+
+    # Original stays superseded in following updates
+    assert identifiers(store.update([original, other, cancel])) == ["ALERT-2"]
+
+
+def test_alerts_removed_from_feed():
+    """Test alerts disappearing from the feed are no longer active."""
+    first = make_alert("ALERT-1", sent="2026-01-05T10:00:00+01:00")
+    second = make_alert("ALERT-2", sent="2026-01-05T11:00:00+01:00")
+    store = AlertLifecycleStore()
+
+    assert identifiers(store.update([first, second])) == ["ALERT-1", "ALERT-2"]
+    assert identifiers(store.update([second])) == ["ALERT-2"]
+    assert identifiers(store.update([])) == []
+
+
+def test_messages_applied_by_sent_time_across_offsets():
+    """Test messages are ordered by time, not by the text of the timestamp."""
+    original = make_alert("ALERT-1", sent="2026-01-05T09:30:00+01:00")
+    update = make_alert(
+        "ALERT-2",
+        sent="2026-01-05T08:45:00Z",
+        msg_type="Update",
+        references=f"{SENDER},ALERT-1,2026-01-05T09:30:00+01:00",
+    )
+    invalid = make_alert("ALERT-3", sent="yesterday")
+    store = AlertLifecycleStore()
+
+    with patch.object(
+        AlertLifecycleStore,
+        "_apply",
+        autospec=True,
+        side_effect=AlertLifecycleStore._apply,  # noqa: SLF001
+    ) as apply:
+        store.update([update, original, invalid])
+
+    assert [call.args[1].identifier for call in apply.call_args_list] == [
+        "ALERT-3",
+        "ALERT-1",
+        "ALERT-2",
+    ]
+    assert identifiers(store.active) == ["ALERT-3", "ALERT-2"]
+
+
+def cap_message(
+    identifier: str, msg_type: str, references: str = "", info: str = ""
+) -> str:
+    """Return CAP XML of a message sent at the hour of its identifier."""
+    return f"""
+    <alert xmlns="urn:oasis:names:tc:emergency:cap:1.2">
+        <identifier>{identifier}</identifier>
+        <sender>{SENDER}</sender>
+        <sent>2026-01-05T1{identifier[-1]}:00:00+01:00</sent>
+        <status>Actual</status>
+        <msgType>{msg_type}</msgType>
+        <scope>Public</scope>
+        <references>{references}</references>
+        {info}
+    </alert>"""
+
+
+def cap_info(language: str, geocode: str) -> str:
+    """Return CAP XML of an info block covering the geocode."""
+    return f"""
+        <info>
+            <language>{language}</language>
+            <event>Silný vítr</event>
+            <severity>Moderate</severity>
+            <certainty>Likely</certainty>
+            <area>
+                <areaDesc>Area {geocode}</areaDesc>
+                <geocode><valueName>CISORP</valueName><value>{geocode}</value></geocode>
+            </area>
+        </info>"""
+
+
+@pytest.mark.parametrize(
+    ("area_filter", "language_filter"), [(None, None), ("2101", None), (None, "cs")]
+)
+def test_filtered_feed_applies_cancel_and_update(area_filter, language_filter):
+    """Test Cancel and Update messages outside the filters are still applied."""
+    messages = [
+        cap_message("ALERT-1", "Alert", info=cap_info("cs", "2101")),
+        cap_message("ALERT-2", "Alert", info=cap_info("cs", "2101")),
+        cap_message("ALERT-3", "Cancel", f"{SENDER},ALERT-1,2026-01-05T11:00:00+01:00"),
+        cap_message(
+            "ALERT-4",
+            "Update",
+            f"{SENDER},ALERT-2,2026-01-05T12:00:00+01:00",
+            cap_info("en", "1000"),
+        ),
+    ]
+    feed = f"<feed>{''.join(messages)}</feed>"
+    alerts = parse_cap_xml(feed, area_filter, language_filter)
+    assert len(alerts) == 4
+
+    (update,) = AlertLifecycleStore().update(alerts)
+
+    assert update.identifier == "ALERT-4"
+    # Info blocks outside the filters are left out
+    assert len(update.info) == (0 if area_filter or language_filter else 1)
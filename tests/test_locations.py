@@ -0,0 +1,78 @@
+"""Tests for the location search index."""
+
+from custom_components.chmi_alerts.cap_parser import normalize_text
+from custom_components.chmi_alerts.const import (
+    CISORP_CODE_TO_NAME,
+    REGION_CODE_TO_NAME,
+)
+from custom_components.chmi_alerts.locations import (
+    LOCATION_INDEX,
+    LOCATION_REGION,
+    REGION_LOCATIONS,
+    LocationIndex,
+)
+
+
+def names(codes: list[str]) -> list[str]:
+    """Return location names of codes."""
+    return [CISORP_CODE_TO_NAME[code] for code in codes]
+
+
+def test_normalize_text():
+    """Test case and diacritics folding."""
+    assert normalize_text("Benešov") == "benesov"
+    assert normalize_text("ŽĎÁR nad Sázavou") == "zdar nad sazavou"
+    assert normalize_text("Ústí nad Orlicí") == "usti nad orlici"
+
+
+def test_search_ignores_diacritics_and_case():
+    """Test searching without diacritics finds locations with them."""
+    assert names(LOCATION_INDEX.search("benesov")) == ["Benešov"]
+    assert names(LOCATION_INDEX.search("BENEŠOV")) == ["Benešov"]
+    assert "Žďár nad Sázavou" in names(LOCATION_INDEX.search("zdar"))
+
+
+def test_search_word_prefix_before_substring():
+    """Test locations with a word starting with the query come first."""
+    index = LocationIndex(
+        {
+            "1": "Horní Benešov",
+            "2": "Benešov",
+            "3": "Nebenešov",
+            "4": "Brno",
+        }
+    )
+
+    # Mapping order is kept within each group
+    assert index.search("benes") == ["1", "2", "3"]
+    assert index.search("stará boleslav") == []
+    assert index.search("4") == ["4"]
+    assert index.search("") == ["1", "2", "3", "4"]
+
+
+def test_search_by_code_and_hyphenated_words():
+    """Test searching by code and by words after a hyphen."""
+    assert names(LOCATION_INDEX.search("2101")) == ["Benešov"]
+    assert names(LOCATION_INDEX.search("stara bol")) == [
+        "Brandýs nad Labem-Stará Boleslav"
+    ]
+
+
+def test_region_hierarchy():
+    """Test every location belongs to exactly one region."""
+    assert LOCATION_REGION["2101"] == "21"
+    assert LOCATION_REGION["7213"] == "72"
+    assert "1000" in REGION_LOCATIONS["10"]
+    assert sorted(names(list(REGION_LOCATIONS["41"]))) == [
+        "Aš",
+        "Cheb",
+        "Karlovy Vary",
+        "Kraslice",
+        "Mariánské Lázně",
+        "Ostrov",
+        "Sokolov",
+    ]
+    assert set(REGION_LOCATIONS) == set(REGION_CODE_TO_NAME)
+    assert sum(len(codes) for codes in REGION_LOCATIONS.values()) == len(
+        CISORP_CODE_TO_NAME
+    )
@@ -0,0 +1,116 @@
+"""Test the CHMI Alerts sensors."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+
+from custom_components.chmi_alerts.awareness import location_levels
+from custom_components.chmi_alerts.sensor import (
+    CAPActiveUntilSensor,
+    CAPAlertsForecastTracker,
+    CAPLocationLevelsSensor,
+    CAPNextOnsetSensor,
+    CAPUpcomingLevelSensor,
+)
+from custom_components.chmi_alerts.timeline import AlertTimeline
+
+from . import make_alert
+
+# Enable asyncio for all tests in this module
+pytestmark = pytest.mark.asyncio
+
+
+async def test_location_levels():
+    """Test the highest level of each location is kept."""
+    levels = location_levels(
+        [
+            make_alert("ALERT-Extreme", severity="Extreme", geocodes=("2101",)),
+            make_alert(
+                "ALERT-Minor", severity="Minor", geocodes=("2101", "2102", "CZ02102")
+            ),
+        ]
+    )
+
+    assert levels["2101"] == "red"
+    assert levels["2102"] == "yellow"
+    assert levels["6203"] == "green"
+    # Only locations are included
+    assert "CZ02102" not in levels
+
+
+async def test_location_levels_sensor():
+    """Test the sensor exposes the location levels."""
+    coordinator = Mock()
+    coordinator.location_levels = {"2101": "red", "2102": "yellow", "6203": "green"}
+    entry = Mock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+
+    sensor = CAPLocationLevelsSensor(coordinator, entry)
+
+    assert sensor.unique_id == "test_entry_id_chmi_alerts_location_levels"
+    assert sensor.native_value == 2
+    assert sensor.extra_state_attributes == {
+        "locations": {"2101": "red", "2102": "yellow", "6203": "green"}
+    }
+
+
+async def test_forecast_sensors():
+    """Test forecast sensors are refreshed by a timer at the next change."""
+    alert = make_alert(
+        onset="2026-01-02T00:00:00+00:00", expires="2026-01-03T00:00:00+00:00"
+    )
+    coordinator = Mock()
+    coordinator.timeline = AlertTimeline.from_alerts([alert])
+    entry = Mock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    unsub_timer = Mock()
+
+    with (
+        patch(
+            "custom_components.chmi_alerts.sensor.dt_util.utcnow",
+            return_value=datetime(2026, 1, 1, tzinfo=UTC),
+        ),
+        patch(
+            "custom_components.chmi_alerts.sensor.async_track_point_in_utc_time",
+            return_value=unsub_timer,
+        ) as track_time,
+    ):
+        tracker = CAPAlertsForecastTracker(Mock(), coordinator)
+        tracker.async_refresh()
+
+    next_onset = CAPNextOnsetSensor(tracker, entry)
+    active_until = CAPActiveUntilSensor(tracker, entry)
+    upcoming_level = CAPUpcomingLevelSensor(tracker, entry)
+    listener = Mock()
+    tracker.async_add_listener(listener)
+
+    assert next_onset.unique_id == "test_entry_id_chmi_alerts_next_onset"
+    assert next_onset.native_value == datetime(2026, 1, 2, tzinfo=UTC)
+    assert active_until.native_value is None
+    assert upcoming_level.native_value == "orange"
+    assert track_time.call_args.args[2] == datetime(2026, 1, 2, tzinfo=UTC)
+
+    # The timer fires at the onset
+    with (
+        patch(
+            "custom_components.chmi_alerts.sensor.dt_util.utcnow",
+            return_value=datetime(2026, 1, 2, tzinfo=UTC),
+        ),
+        patch(
+            "custom_components.chmi_alerts.sensor.async_track_point_in_utc_time",
+            return_value=unsub_timer,
+        ) as track_time,
+    ):
+        tracker.async_refresh(datetime(2026, 1, 2, tzinfo=UTC))
+
+    listener.assert_called_once()
+    assert next_onset.native_value is None
+    assert active_until.native_value == datetime(2026, 1, 3, tzinfo=UTC)
+    assert track_time.call_args.args[2] == datetime(2026, 1, 3, tzinfo=UTC)
+
+    tracker.async_shutdown()
+    assert unsub_timer.call_count == 2
@@ -0,0 +1,143 @@
+"""Tests for the alert validity index."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.chmi_alerts.timeline import (
+    OPEN_ENDED_DURATION,
+    AlertTimeline,
+    parse_time,
+)
+
+from . import make_alert
+
+
+def identifiers(entries) -> list[str]:
+    """Return alert identifiers of entries."""
+    return [entry.alert.identifier for entry in entries]
+
+
+def at(day: int, hour: int = 0) -> datetime:
+    """Return UTC time in January 2026."""
+    return datetime(2026, 1, day, hour, tzinfo=UTC)
+
+
+def test_parse_time():
+    """Test CAP timestamps parsing."""
+    assert parse_time("2026-01-05T10:00:00+01:00") == at(5, 9)
+    assert parse_time("2026-01-05T10:00:00") == at(5, 10)
+    assert parse_time("invalid") is None
+    assert parse_time(None) is None
+
+
+def test_overlapping():
+    """Test range queries return entries overlapping the range."""
+    timeline = AlertTimeline.from_alerts(
+        [
+            make_alert(
+                "LONG", onset="2026-01-01T00:00:00Z", expires="2026-01-10T00:00:00Z"
+            ),
+            make_alert(
+                "SHORT", onset="2026-01-05T00:00:00Z", expires="2026-01-05T06:00:00Z"
+            ),
+            make_alert(
+                "LATE", onset="2026-01-08T00:00:00Z", expires="2026-01-09T00:00:00Z"
+            ),
+            make_alert(
+                "SENT", sent="2026-01-01T00:00:00Z", expires="2026-01-02T00:00:00Z"
+            ),
+        ]
+    )
+
+    assert identifiers(timeline.overlapping(at(5, 3), at(5, 4))) == ["LONG", "SHORT"]
+    assert identifiers(timeline.overlapping(at(6), at(9))) == ["LONG", "LATE"]
+    # Entries starting at the end or ending at the start do not overlap
+    assert identifiers(timeline.overlapping(at(2), at(5))) == ["LONG"]
+    assert identifiers(timeline.overlapping(at(10), at(20))) == []
+
+    # Same results as checking every entry
+    for start_day in range(1, 12):
+        for end_day in range(start_day + 1, 13):
+            assert timeline.overlapping(at(start_day), at(end_day)) == [
+                entry
+                for entry in timeline.entries
+                if entry.start < at(end_day) and entry.end > at(start_day)
+            ]
+
+
+def test_active_or_next():
+    """Test lookup of the current or upcoming entry."""
+    timeline = AlertTimeline.from_alerts(
+        [
+            make_alert(
+                "FIRST", onset="2026-01-02T00:00:00Z", expires="2026-01-03T00:00:00Z"
+            ),
+            make_alert("SECOND", onset="2026-01-05T00:00:00Z"),
+        ]
+    )
+
+    assert timeline.active_or_next(at(1)).alert.identifier == "FIRST"
+    assert timeline.active_or_next(at(2, 12)).alert.identifier == "FIRST"
+    assert timeline.active_or_next(at(4)).alert.identifier == "SECOND"
+    # Warnings without expiry last a fixed duration
+    assert timeline.entries[1].end == at(5) + OPEN_ENDED_DURATION
+    assert timeline.active_or_next(at(5) + timedelta(days=2)) is None
+
+
+def test_forecast():
+    """Test summary of active and upcoming warnings."""
+    minor = make_alert(
+        "MINOR", onset="2026-01-02T00:00:00Z", expires="2026-01-04T00:00:00Z"
+    )
+    minor.data["info"][0]["severity"] = "Minor"
+    timeline = AlertTimeline.from_alerts(
+        [
+            minor,
+            make_alert(
+                "MODERATE", onset="2026-01-03T00:00:00Z", expires="2026-01-03T12:00:00Z"
+            ),
+        ]
+    )
+
+    forecast = timeline.forecast(at(1))
+    assert forecast.next_onset == at(2)
+    assert forecast.active_until is None
+    assert forecast.upcoming_level == "orange"
+    assert forecast.next_change == at(2)
+
+    forecast = timeline.forecast(at(2))
+    assert forecast.next_onset == at(3)
+    assert forecast.active_until == at(4)
+    assert forecast.upcoming_level == "orange"
+    assert forecast.next_change == at(3)
+
+    forecast = timeline.forecast(at(3, 6))
+    assert forecast.next_onset is None
+    assert forecast.active_until == at(4)
+    assert forecast.next_change == at(3, 12)
+
+    forecast = timeline.forecast(at(3, 12))
+    assert forecast.upcoming_level == "yellow"
+    assert forecast.next_change == at(4)
+
+    forecast = timeline.forecast(at(4))
+    assert forecast.upcoming_level == "green"
+    assert forecast.next_change is None
+
+
+def test_forecast_open_ended():
+    """Test estimated end of warnings without expiry is not reported."""
+    timeline = AlertTimeline.from_alerts(
+        [
+            make_alert(
+                "FIXED", onset="2026-01-02T00:00:00Z", expires="2026-01-04T00:00:00Z"
+            ),
+            make_alert("OPEN", onset="2026-01-03T00:00:00Z"),
+        ]
+    )
+
+    assert timeline.forecast(at(2)).active_until == at(4)
+
+    forecast = timeline.forecast(at(3, 12))
+    assert forecast.active_until is None
+    # The estimated end still schedules the refresh
+    assert forecast.next_change == at(4)
@@ -0,0 +1,269 @@
+"""Test the CHMI Alerts automation triggers."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+import voluptuous as vol
+from homeassistant import loader
+from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.helpers.trigger import (
+    async_initialize_triggers,
+    async_validate_trigger_config,
+)
+
+from custom_components.chmi_alerts.alert_triggers import (
+    AlertTriggerFilter,
+    AlertTriggers,
+)
+from custom_components.chmi_alerts.const import DATA_TRIGGERS
+from custom_components.chmi_alerts.trigger import (
+    TRIGGER_SCHEMA,
+    async_attach_trigger,
+)
+
+from . import make_alert
+
+
+def test_schema_normalizes_filters():
+    """Test hazards are given by name and regions expand to locations."""
+    config = TRIGGER_SCHEMA(
+        {
+            "platform": "chmi_alerts",
+            "config_entry_id": "entry",
+            "hazard": ["Wind", "3; Thunderstorm", "6"],
+            "location": ["2101", "10"],
+        }
+    )
+
+    assert config["event"] == "new"
+    assert config["hazard"] == ["1", "3", "6"]
+    assert config["location"] == [["2101"], ["1000"]]
+
+    with pytest.raises(vol.Invalid):
+        TRIGGER_SCHEMA(
+            {"platform": "chmi_alerts", "config_entry_id": "entry", "hazard": "x"}
+        )
+    with pytest.raises(vol.Invalid):
+        TRIGGER_SCHEMA(
+            {"platform": "chmi_alerts", "config_entry_id": "entry", "location": "9"}
+        )
+
+
+def test_changes_since_previous_data():
+    """Test first data sets the baseline and later data fires changes."""
+    triggers = AlertTriggers()
+    new_action = Mock()
+    ended_action = Mock()
+    triggers.async_add(AlertTriggerFilter(), new_action)
+    triggers.async_add(AlertTriggerFilter(event="ended"), ended_action)
+
+    triggers.process([make_alert("ALERT-1"), make_alert("ALERT-2")])
+    new_action.assert_not_called()
+
+    triggers.process([make_alert("ALERT-2"), make_alert("ALERT-3")])
+
+    assert [change.alert.identifier for (change,), _ in new_action.call_args_list] == [
+        "ALERT-3"
+    ]
+    assert [
+        change.alert.identifier for (change,), _ in ended_action.call_args_list
+    ] == ["ALERT-1"]
+
+
+def test_update_replaces_referenced_alert():
+    """Test an Update with a new identifier is not reported as ended and new."""
+    triggers = AlertTriggers()
+    actions = {event: Mock() for event in ("new", "updated", "ended")}
+    for event, action in actions.items():
+        triggers.async_add(AlertTriggerFilter(event=event), action)
+    reference = "sender,ALERT-1,2026-01-01T00:00:00+01:00"
+
+    triggers.process([make_alert("ALERT-1")])
+    # Unchanged level, type and area is not reported at all
+    triggers.process([make_alert("ALERT-2", msg_type="Update", references=reference)])
+    for action in actions.values():
+        action.assert_not_called()
+
+    triggers.process(
+        [
+            make_alert(
+                "ALERT-3",
+                msg_type="Update",
+                references="sender,ALERT-2,2026-01-01T06:00:00+01:00",
+                severity="Extreme",
+            )
+        ]
+    )
+    actions["new"].assert_not_called()
+    actions["ended"].assert_not_called()
+    (change,), _ = actions["updated"].call_args
+    assert change.alert.identifier == "ALERT-3"
+    assert change.previous.alert.identifier == "ALERT-2"
+    assert change.previous.level == "orange"
+
+    # Update of an alert which is not tracked is new
+    triggers.process(
+        [
+            make_alert("ALERT-3", severity="Extreme"),
+            make_alert("ALERT-4", msg_type="Update", references=reference),
+        ]
+    )
+    (change,), _ = actions["new"].call_args
+    assert change.alert.identifier == "ALERT-4"
+
+
+def test_filters_evaluated_per_change():
+    """Test only actions of matching triggers are called."""
+    triggers = AlertTriggers()
+    actions = {
+        "red": Mock(),
+        "wind": Mock(),
+        "prague": Mock(),
+        "keyword": Mock(),
+    }
+    triggers.async_add(AlertTriggerFilter(level="red"), actions["red"])
+    triggers.async_add(AlertTriggerFilter(hazards=frozenset({"1"})), actions["wind"])
+    triggers.async_add(
+        AlertTriggerFilter(locations=frozenset({"1000"})), actions["prague"]
+    )
+    remove = triggers.async_add(
+        AlertTriggerFilter(keyword="thunder"), actions["keyword"]
+    )
+    triggers.process([])
+
+    triggers.process(
+        [
+            make_alert("ALERT-1", severity="Extreme"),
+            make_alert("ALERT-2", event="Thunderstorms", geocodes=("1000",)),
+            # Unknown events are not attributed to wind
+            make_alert("ALERT-4", event="Zvláštní upozornění", geocodes=("1000",)),
+        ]
+    )
+
+    def fired(name: str) -> list[str]:
+        return [
+            change.alert.identifier for (change,), _ in actions[name].call_args_list
+        ]
+
+    assert fired("red") == ["ALERT-1"]
+    assert fired("wind") == ["ALERT-1"]
+    assert fired("prague") == ["ALERT-2", "ALERT-4"]
+    assert fired("keyword") == ["ALERT-2"]
+
+    remove()
+    triggers.process([make_alert("ALERT-3", event="Thunderstorms")])
+    assert fired("keyword") == ["ALERT-2"]
+    assert len(triggers) == 3
+
+
+@pytest.mark.asyncio
+async def test_attach_trigger_runs_action():
+    """Test the automation gets variables of the matching alert."""
+    hass = Mock()
+    hass.data = {}
+    config = TRIGGER_SCHEMA(
+        {
+            "platform": "chmi_alerts",
+            "config_entry_id": "entry",
+            "awareness_level": "yellow",
+            "hazard": "wind",
+        }
+    )
+
+    remove = await async_attach_trigger(
+        hass, config, Mock(), {"trigger_data": {"id": "0", "idx": "0"}}
+    )
+    triggers = hass.data[DATA_TRIGGERS]["entry"]
+    triggers.process([])
+    triggers.process([make_alert("ALERT-1"), make_alert("ALERT-2", event="Fog")])
+
+    hass.async_run_hass_job.assert_called_once()
+    variables = hass.async_run_hass_job.call_args.args[1]["trigger"]
+    assert variables["id"] == "0"
+    assert variables["platform"] == "chmi_alerts"
+    assert variables["event"] == "new"
+    assert variables["identifier"] == "ALERT-1"
+    assert variables["headline"] == "ALERT-1 cs"
+    assert variables["awareness_level"] == "3; Orange"
+    assert variables["geocodes"] == ["2101"]
+    assert variables["msg_type"] == "Alert"
+    assert variables["references"] == []
+    assert variables["previous_identifier"] == ""
+
+    remove()
+    assert len(triggers) == 0
+    # Registry of an entry which is not loaded goes with its last trigger
+    assert hass.data[DATA_TRIGGERS] == {}
+
+
+@pytest.mark.asyncio
+async def test_automation_config_runs_action(tmp_path):
+    """Test triggers set up from an automation config run its action."""
+    hass = HomeAssistant(str(tmp_path))
+    loader.async_setup(hass)
+    runs: list[dict[str, Any]] = []
+
+    @callback
+    def action(run_variables: dict[str, Any], context: Context | None = None) -> None:
+        runs.append(run_variables["trigger"])
+
+    try:
+        with pytest.raises(vol.Invalid):
+            await async_validate_trigger_config(
+                hass,
+                [
+                    {
+                        "platform": "chmi_alerts",
+                        "config_entry_id": "entry",
+                        "hazard": "x",
+                    }
+                ],
+            )
+        config = await async_validate_trigger_config(
+            hass,
+            [
+                {
+                    "platform": "chmi_alerts",
+                    "config_entry_id": "entry",
+                    "event": "updated",
+                    "hazard": "Vítr",
+                }
+            ],
+        )
+        remove = await async_initialize_triggers(
+            hass, config, action, "automation", "CHMI test", Mock()
+        )
+        triggers = hass.data[DATA_TRIGGERS]["entry"]
+        reference = "sender,ALERT-1,2026-01-01T00:00:00+01:00"
+
+        triggers.process([make_alert("ALERT-1")])
+        triggers.process(
+            [
+                make_alert(
+                    "ALERT-2",
+                    msg_type="Update",
+                    references=reference,
+                    severity="Extreme",
+                )
+            ]
+        )
+        await hass.async_block_till_done()
+
+        (variables,) = runs
+        assert variables["idx"] == "0"
+        assert variables["platform"] == "chmi_alerts"
+        assert variables["event"] == "updated"
+        assert variables["identifier"] == "ALERT-2"
+        assert variables["msg_type"] == "Update"
+        assert variables["references"] == [reference]
+        assert variables["awareness_level"] == "4; Red"
+        assert variables["previous_identifier"] == "ALERT-1"
+        assert variables["previous_awareness_level"] == "3; Orange"
+
+        remove()
+        assert len(triggers) == 0
+    finally:
+        await hass.async_stop(force=True)